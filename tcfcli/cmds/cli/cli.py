@@ -18,6 +18,7 @@ os.chdir(work_dir)
 
 from tcfcli.cmds.cli import __version__
 from tcfcli.cmds.deploy.cli import deploy
+from tcfcli.cmds.package.cli import package
 from tcfcli.cmds.local.cli import local
 from tcfcli.cmds.init.cli import init
 from tcfcli.cmds.validate.cli import validate
@@ -50,6 +51,7 @@ Register commands into cli group"
 
 cli.add_command(configure)
 cli.add_command(init)
+cli.add_command(package)
 cli.add_command(deploy)
 cli.add_command(native)
 cli.add_command(validate)
@@ -1,11 +1,17 @@
 # -*- coding: utf-8 -*-
 
+import sys
+import fnmatch
 from tcfcli.common.user_config import UserConfig
 from tcfcli.common.operation_msg import Operation
 from tcfcli.common.user_exceptions import *
 import tcfcli.common.base_infor as infor
 from tcfcli.help.message import DeleteHelp as help
 from tcfcli.libs.utils.scf_client import ScfClient
+from tcfcli.libs.utils.inventory import FunctionInventory
+from tcfcli.libs.utils.function_lister import FunctionLister
+from tcfcli.common.rate_limiter import RateLimiter
+from tencentcloud.common.exception.tencent_cloud_sdk_exception import TencentCloudSDKException
 
 REGIONS = infor.REGIONS
 
@@ -13,23 +19,105 @@ REGIONS = infor.REGIONS
 class Delete(object):
     @staticmethod
     def do_cli(region, namespace, name):
+        inventory = FunctionInventory()
+        try:
+            client = ScfClient(region)
+            # a function known by the fresh inventory is deleted at once, otherwise check it on the cloud
+            if not inventory.exists(region, namespace, name):
+                rep = client.get_ns(namespace)
+                if not rep:
+                    raise DeleteException("Namespace {ns} not exists".format(ns=namespace))
+                    # return
+
+                rep = client.get_function(function_name=name, namespace=namespace)
+                if not rep:
+                    raise DeleteException("Function {function} not exists".format(function=name))
+                    # return
+
+            rep = client.delete_function(function_name=name, namespace=namespace)
+            if not rep:
+                inventory.invalidate(region, namespace)
+                raise DeleteException("Function {function} delete failed".format(function=name))
+                # return
+
+            inventory.remove(region, namespace, name)
+        finally:
+            inventory.close()
 
-        rep = ScfClient(region).get_ns(namespace)
-        if not rep:
-            raise DeleteException("Namespace {ns} not exists".format(ns=namespace))
-            # return
+        Operation("Function {function} delete success".format(function=name)).success()
 
-        rep = ScfClient(region).get_function(function_name=name, namespace=namespace)
-        if not rep:
-            raise DeleteException("Function {function} not exists".format(function=name))
-            # return
 
-        rep = ScfClient(region).delete_function(function_name=name, namespace=namespace)
-        if not rep:
-            raise DeleteException("Function {function} delete failed".format(function=name))
-            # return
+class BulkDelete(object):
+    '''
+        Delete all the functions whose names match a shell-style pattern, such as 'pr-123-*'.
+        The targets come from one listing, the deletions run in a thread pool throttled by a shared rate limiter.
+    '''
+    POOL_SIZE = 8
+    RATE = 10
+    RETRIES = 3
 
-        Operation("Function {function} delete success".format(function=name)).success()
+    @staticmethod
+    def do_cli(regions, namespace, pattern, force):
+        lister = FunctionLister(BulkDelete.POOL_SIZE)
+        inventory = FunctionInventory()
+        try:
+            targets = []
+            # always list again, the functions to delete must not come from an expired inventory
+            for region, ns, functions in inventory.sync(lister, regions, None if namespace == 'all' else namespace,
+                                                        refresh=True):
+                targets.extend((region, ns, f.FunctionName) for f in functions
+                               if fnmatch.fnmatchcase(f.FunctionName, pattern))
+            if not targets:
+                Operation("No function matches '{}'".format(pattern)).warning()
+                return
+
+            targets.sort()
+            Operation("{} functions match '{}':".format(len(targets), pattern)).process()
+            for region, ns, name in targets:
+                Operation("  Region: %s  Namespace: %s  Function Name: %s" % (region, ns, name)).process()
+            if not force:
+                Operation("These functions' triggers will be deleted too").warning()
+                result = click.prompt(click.style('[!] Are you sure delete these %d remote functions? (y/n)'
+                                                  % len(targets), fg="magenta"))
+                if result not in ["y", "Y"]:
+                    Operation("Delete operation has been canceled").warning()
+                    return
+
+            limiter = RateLimiter(BulkDelete.RATE)
+            failed = []
+            for (region, ns, name), err in lister.imap_unordered(
+                    lambda t: (t, BulkDelete._delete(lister.client(t[0]), limiter, t[1], t[2])), targets):
+                if err is None:
+                    inventory.remove(region, ns, name)
+                    Operation("Function {r} {ns} {name} delete success".format(r=region, ns=ns, name=name)).success()
+                else:
+                    failed.append(name)
+                    Operation("Function {r} {ns} {name} delete failure. Error: {e}.".format(
+                        r=region, ns=ns, name=name, e=err)).warning()
+        finally:
+            lister.close()
+            inventory.close()
+
+        Operation("Delete finished: {} deleted, {} failed.".format(len(targets) - len(failed),
+                                                                   len(failed))).information()
+        if failed:
+            raise DeleteException("Function {} delete failed".format(", ".join(failed)))
+
+    @staticmethod
+    def _delete(client, limiter, namespace, name):
+        for i in range(BulkDelete.RETRIES):
+            limiter.acquire()
+            try:
+                client.remove_function(name, namespace)
+                return None
+            except TencentCloudSDKException as err:
+                s = err.get_message()
+                if sys.version_info[0] == 2 and isinstance(s, str):
+                    s = s.encode("utf8")
+                if not str(err.get_code()).startswith("RequestLimitExceeded"):
+                    return s
+                limiter.backoff(2 ** i)
+        return s
 
 
 def abort_if_false(ctx, param, value):
@@ -42,7 +130,9 @@ def abort_if_false(ctx, param, value):
 @click.option('-ns', '--namespace', default="default", help=help.NAMESPACE)
 @click.option('-n', '--name', help=help.NAME)
 @click.option('-f', '--force', is_flag=True, help=help.FORCED)
-def delete(region, namespace, name, force):
+@click.option('--match', help=help.MATCH)
+@click.option('--all-regions', is_flag=True, default=False, help=help.ALL_REGIONS)
+def delete(region, namespace, name, force, match, all_regions):
     '''
         \b
         Delete a SCF function.
@@ -51,8 +141,18 @@ def delete(region, namespace, name, force):
         \b
             * Delete a SCF function
               $ scf delete --name functionname --region ap-guangzhou --namespace default
+        \b
+            * Delete all the functions of a preview environment in every region
+              $ scf delete --match 'pr-123-*' --all-regions
     '''
-    if name:
+    if name and match:
+        raise ArgsException("--name is conflict with --match")
+    elif match:
+        if region and region not in REGIONS:
+            raise ArgsException("The region must in %s." % (", ".join(REGIONS)))
+        regions = REGIONS if all_regions else [region if region else UserConfig().region]
+        BulkDelete.do_cli(regions, namespace, match, force)
+    elif name:
 
         if not region:
             region = UserConfig().region
@@ -75,4 +175,4 @@ def delete(region, namespace, name, force):
             else:
                 Operation("Delete operation has been canceled").warning()
     else:
-        raise ArgsException("You must give a name, like: scf delete --name YourFunctionName! ")
+        raise ArgsException("You must give a name or a pattern, like: scf delete --name YourFunctionName! ")
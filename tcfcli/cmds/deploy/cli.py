@@ -16,11 +16,17 @@ from tcfcli.common.operation_msg import Operation
 from tcfcli.common.template import Template
 from tcfcli.common.user_exceptions import *
 from tcfcli.libs.utils.scf_client import ScfClient
+from tcfcli.libs.utils.inventory import FunctionInventory
 from tcfcli.common import tcsam
 from tcfcli.common.user_config import UserConfig
 from tcfcli.common.tcsam.tcsam_macro import TcSamMacro as tsmacro
 from zipfile import ZipFile, ZIP_DEFLATED
 from tcfcli.libs.utils.cos_client import CosClient
+from tcfcli.libs.utils.upload_strategy import UploadStrategy, UploadStats, UploadProgress
+from tcfcli.cmds.package.manifest import Manifest
+from tcfcli.cmds.deploy.journal import DeployJournal
+from tcfcli.cmds.deploy.watcher import CodeWatcher
+from tencentcloud.common.exception.tencent_cloud_sdk_exception import TencentCloudSDKException
 
 _CURRENT_DIR = '.'
 _BUILD_DIR = os.path.join(os.getcwd(), '.tcf_build')
@@ -31,7 +37,7 @@ SERVICE_RUNTIME = infor.SERVICE_RUNTIME
 
 
 @click.command(short_help=help.SHORT_HELP)
-@click.option('--template-file', '-t', default=DEF_TMP_FILENAME, type=click.Path(exists=True), help=help.TEMPLATE_FILE)
+@click.option('--template-file', '-t', default=DEF_TMP_FILENAME, type=click.Path(), help=help.TEMPLATE_FILE)
 @click.option('--cos-bucket', '-c', type=str, help=help.COS_BUCKET)
 @click.option('--name', '-n', type=str, help=help.NAME)
 @click.option('--namespace', '-ns', type=str, help=help.NAMESPACE)
@@ -40,7 +46,11 @@ SERVICE_RUNTIME = infor.SERVICE_RUNTIME
 @click.option('--skip-event', is_flag=True, default=False, help=help.SKIP_EVENT)
 @click.option('--without-cos', is_flag=True, default=False, help=help.WITHOUT_COS)
 @click.option('--history', is_flag=True, default=False, help=help.HISTORY)
-def deploy(template_file, cos_bucket, name, namespace, region, forced, skip_event, without_cos, history):
+@click.option('--from-manifest', type=click.Path(exists=True), help=help.FROM_MANIFEST)
+@click.option('--resume', is_flag=True, default=False, help=help.RESUME)
+@click.option('--watch', is_flag=True, default=False, help=help.WATCH)
+def deploy(template_file, cos_bucket, name, namespace, region, forced, skip_event, without_cos, history,
+           from_manifest, resume, watch):
     '''
         \b
         Scf cli completes the function package deployment through the deploy subcommand. The scf command line tool deploys the code package, function configuration, and other information specified in the configuration file to the cloud or updates the functions of the cloud according to the specified function template configuration file.
@@ -55,32 +65,165 @@ def deploy(template_file, cos_bucket, name, namespace, region, forced, skip_even
             \b
             * Package the configuration file, and specify the COS bucket as "temp-code-1253970226"
               $ scf deploy --cos-bucket temp-code-1253970226
+            \b
+            * Deploy the artifacts produced by "scf package" without packaging again
+              $ scf deploy --from-manifest .tcf_package/manifest.json
+            \b
+            * Continue the last failed deployment from the first unfinished step
+              $ scf deploy --resume
+            \b
+            * Deploy, then redeploy the code of the changed functions every time the files are saved
+              $ scf deploy --watch
     '''
 
     if region and region not in REGIONS:
         raise ArgsException("The region must in %s." % (", ".join(REGIONS)))
+    elif watch and (from_manifest or history):
+        raise ArgsException("--watch can't be used with --from-manifest or --history.")
+    elif resume and from_manifest:
+        raise ArgsException("--resume can't be used with --from-manifest, the manifest is deployed as a whole.")
+    elif from_manifest:
+        deploy_from_manifest(from_manifest, name, namespace, region, forced, skip_event)
     else:
         region = region if region else UserConfig().region
+        journal = DeployJournal(_BUILD_DIR, template_file, region, namespace, name, cos_bucket, without_cos,
+                                UserConfig().using_cos.startswith("True"))
+        if not resume:
+            journal.reset()
+        elif journal.load():
+            Operation("Resume the last unfinished deployment, %d steps have been finished."
+                      % journal.finished_steps).information()
+        else:
+            Operation("There is no unfinished deployment of this template and arguments, deploy from the beginning.") \
+                .warning()
+
         if history:
-            package = Package(template_file, cos_bucket, name, region, namespace, without_cos, history)
+            package = Package(template_file, cos_bucket, name, region, namespace, without_cos, history,
+                              journal=journal)
             resource = package.do_package()
         else:
-            package = Package(template_file, cos_bucket, name, region, namespace, without_cos)
+            package = Package(template_file, cos_bucket, name, region, namespace, without_cos, journal=journal)
             resource = package.do_package()
         if resource == None:
             return
         if name and "'%s'" % str(name) not in str(resource):
             raise DeployException("Couldn't find the function in YAML, please add this function in YAML.")
         else:
-            deploy = Deploy(resource, namespace, region, forced, skip_event)
+            deploy = Deploy(resource, namespace, region, forced, skip_event, journal=journal)
             deploy.do_deploy()
             Operation("Deploy success").success()
 
+        # the journal is kept in the build directory, it is removed together with the packages
         try:
             shutil.rmtree(_BUILD_DIR)
         except Exception as e:
             pass
 
+        if watch:
+            watch_deploy(template_file, cos_bucket, name, namespace, region, forced, skip_event, without_cos)
+
+
+def watch_deploy(template_file, cos_bucket, name, namespace, region, forced, skip_event, without_cos):
+    '''
+        Redeploy continuously. A change of the template redeploys everything, otherwise only the code of the
+        functions whose CodeUri contains the changed files is packaged and updated, the configuration and
+        triggers are left untouched. One client is kept for all the code updates.
+    '''
+    template_file = os.path.abspath(template_file)
+    client = ScfClient(region)
+    code_paths = _function_code_paths(template_file, name)
+    watcher = CodeWatcher([template_file] + list(code_paths.values()))
+    Operation("Watching the template and the CodeUri of {} functions, press Ctrl+C to stop.".format(
+        len(code_paths))).information()
+
+    while True:
+        try:
+            changes = watcher.wait()
+        except KeyboardInterrupt:
+            Operation("Stop watching.").information()
+            return
+
+        try:
+            if template_file in changes:
+                Operation("Template changed, redeploy all the functions.").process()
+                package = Package(template_file, cos_bucket, name, region, namespace, without_cos)
+                Deploy(package.do_package(), namespace, region, forced, skip_event).do_deploy()
+                code_paths = _function_code_paths(template_file, name)
+                watcher.watch([template_file] + list(code_paths.values()))
+            else:
+                affected = [f for f in code_paths if any(_is_under(c, code_paths[f]) for c in changes)]
+                if not affected:
+                    continue
+                Operation("{} files changed, update the code of {}.".format(
+                    len(changes), ", ".join("'%s'" % func for ns, func in affected))).process()
+                package = Package(template_file, cos_bucket, name, region, namespace, without_cos)
+                package.select(affected)
+                resource = package.do_package()
+                for ns, func in affected:
+                    _update_code(client, resource[ns][func], func, namespace if namespace else ns)
+            Operation("Redeploy success, watching for changes.").success()
+        except (UserException, TencentCloudSDKException) as e:
+            # a broken edit must not stop watching, the next save tries again
+            Operation("Redeploy failure. Error: {}".format(e)).warning()
+        finally:
+            try:
+                shutil.rmtree(_BUILD_DIR)
+            except Exception as e:
+                pass
+
+
+def _function_code_paths(template_file, name):
+    template_file_dir = os.path.dirname(template_file)
+    template_data = tcsam.tcsam_validate(Template.get_template_data(template_file))
+    code_paths = {}
+    resource = template_data.get(tsmacro.Resources, {})
+    for ns in resource:
+        for func in resource[ns]:
+            if func == tsmacro.Type or (name and func != name):
+                continue
+            code_uri = resource[ns][func][tsmacro.Properties].get(tsmacro.CodeUri, "")
+            code_paths[(ns, func)] = os.path.abspath(os.path.join(template_file_dir, code_uri))
+    return code_paths
+
+
+def _is_under(path, code_path):
+    return path == code_path or path.startswith(code_path.rstrip(os.sep) + os.sep)
+
+
+def _update_code(client, func, func_name, func_ns):
+    try:
+        client.update_func_code(func, func_name, func_ns)
+    except TencentCloudSDKException as err:
+        s = err.get_message()
+        if sys.version_info[0] == 2 and isinstance(s, str):
+            s = s.encode("utf8")
+        raise CloudAPIException(u"Update the code of function '{name}' failure, {e}.".format(name=func_name, e=s))
+    Operation("Update the code of function '{name}' success".format(name=func_name)).success()
+
+
+def deploy_from_manifest(manifest_file, name, namespace, region, forced, skip_event):
+    manifest = Manifest.load(manifest_file)
+    Operation("Load manifest '{}' success, created at {}".format(manifest_file, manifest.create_time)).success()
+
+    region = region if region else manifest.region
+    uses_cos = [a for a in manifest.artifacts if a.get("cos_bucket_name")]
+    if uses_cos and region != manifest.region:
+        raise DeployException("The packages in manifest are stored on COS in region '{}', "
+                              "they can't be deployed to region '{}'.".format(manifest.region, region))
+    namespace = namespace if namespace else manifest.namespace
+
+    resource = manifest.resources
+    if name:
+        for ns in resource:
+            for func in list(resource[ns]):
+                if func != tsmacro.Type and func != name:
+                    resource[ns].pop(func)
+        if "'%s'" % str(name) not in str(resource):
+            raise DeployException("Couldn't find the function in manifest, please package this function first.")
+
+    Deploy(resource, namespace, region, forced, skip_event).do_deploy()
+    Operation("Deploy success").success()
+
 
 class Function(object):
     def __init__(self, region, namespace, function, resources):
@@ -153,8 +296,11 @@ class Function(object):
 
 
 class Package(object):
+    # directories starting with these prefixes are not packaged
+    IGNORE_PREFIXES = ("./.", r".\.")
 
-    def __init__(self, template_file, cos_bucket, function, region, deploy_namespace, without_cos, history=None):
+    def __init__(self, template_file, cos_bucket, function, region, deploy_namespace, without_cos, history=None,
+                 build_dir=None, journal=None):
         self.template_file = template_file
         self.template_file_dir = ""
         self.cos_bucket = cos_bucket
@@ -166,6 +312,17 @@ class Package(object):
         self.region = region
         self.without_cos = without_cos
         self.history = history
+        self.build_dir = build_dir if build_dir else _BUILD_DIR
+        self.artifacts = []
+        self._shared_packages = {}
+        # functions of the template by package key, in template order, before --name filters them
+        self._package_users = {}
+        for ns in self.resource:
+            for func in self.resource[ns]:
+                if func != tsmacro.Type:
+                    key = self._package_key(self.resource[ns][func][tsmacro.Properties].get(tsmacro.CodeUri, ""))
+                    self._package_users.setdefault(key, []).append((ns, func))
+        self.journal = journal
 
     def do_package(self):
         region = self.region
@@ -178,55 +335,25 @@ class Package(object):
                     self.resource[ns].pop(func)
                     continue
 
-                if self.history:
-                    function_list = CosClient(self.region).get_object_list(
-                        bucket="scf-deploy-" + region,
-                        prefix=str(ns) + "-" + str(func)
-                    )
+                code_url = self._resume_code_url(ns, func)
+                if code_url:
+                    Operation("Function '{}' has been uploaded by the last deployment, skip packaging.".format(
+                        func)).process()
 
-                    if isinstance(function_list, dict) and 'Contents' in function_list:
-                        rollback_dict = {}
-                        function_list_data = function_list['Contents']
-                        if function_list_data:
-                            click.secho(
-                                "[+] Please select a historical deployment Number for the historical version deployment.",
-                                fg="cyan")
-                            i = 0
-                            for eve_obj in reversed(function_list_data):
-                                i = i + 1
-                                if i > 15:
-                                    break
-                                click.secho("  [%s] %s" % (
-                                    i, text(eve_obj["LastModified"].replace(".000Z", "").replace("T", " "))), fg="cyan")
-                                rollback_dict[str(i)] = eve_obj["Key"]
-                            number = click.prompt(click.style("Please input number(Like: 1)", fg="cyan"))
-                            if number not in rollback_dict:
-                                raise RollbackException(
-                                    "Please enter the version number correctly, for example the number 1.")
-                            else:
-                                code_url = {
-                                    'cos_bucket_name': "scf-deploy-" + region,
-                                    'cos_object_name': rollback_dict[number]
-                                }
-                                msg = "Select function zip file '{}' on COS bucket '{}' success.".format(
-                                    os.path.basename( \
-                                        code_url["cos_object_name"]), code_url["cos_bucket_name"])
-                                Operation(msg).success()
-                        else:
-                            raise RollbackException(
-                                "The historical version is not queried. The deployment history version code only takes effect when you use using-cos.")
-                    else:
-                        raise RollbackException(
-                            "The historical version is not queried. The deployment history version code only takes effect when you use using-cos.")
+                elif self.history:
+                    code_url = self._select_history(ns, func)
 
                 else:
-                    code_url = self._do_package_core(
+                    code_url = self._do_package_shared(
                         self.resource[ns][func][tsmacro.Properties].get(tsmacro.CodeUri, ""),
                         ns,
                         func,
                         self.region
                     )
 
+                if self.journal:
+                    self.journal.mark(ns, func, DeployJournal.UPLOADED, code_url)
+
                 if "cos_bucket_name" in code_url:
                     self.resource[ns][func][tsmacro.Properties]["CosBucketName"] = code_url["cos_bucket_name"]
                     self.resource[ns][func][tsmacro.Properties]["CosObjectName"] = code_url["cos_object_name"]
@@ -239,6 +366,32 @@ class Package(object):
         # click.secho("Generate resource '{}' success".format(self.resource), fg="green")
         return self.resource
 
+    def select(self, functions):
+        '''
+            Keep only the given (namespace, function) pairs in the resource to package.
+        '''
+        for ns in self.resource:
+            for func in list(self.resource[ns]):
+                if func != tsmacro.Type and (ns, func) not in functions:
+                    self.resource[ns].pop(func)
+
+    def _resume_code_url(self, namespace, func_name):
+        if not self.journal:
+            return None
+        code_url = self.journal.get(namespace, func_name, DeployJournal.UPLOADED)
+        if code_url and "zip_file" in code_url:
+            packaged = self.journal.get(namespace, func_name, DeployJournal.PACKAGED) or {}
+            if not self._is_package_intact(code_url["zip_file"], packaged.get("md5")):
+                return None
+        return code_url
+
+    @staticmethod
+    def _is_package_intact(zip_file_path, md5):
+        if not md5 or not os.path.isfile(zip_file_path):
+            return False
+        with open(zip_file_path, "rb") as f:
+            return hashlib.md5(f.read()).hexdigest() == md5
+
     def check_params(self):
         if not self.template_file:
             # click.secho("FAM Template Not Found", fg="red")
@@ -256,21 +409,112 @@ class Package(object):
 
     def file_size_infor(self, size):
         # click.secho(str(size))
-        if size >= 20 * 1024 * 1024:
+        if size >= UploadStrategy.INLINE_LIMIT:
             Operation('Your package is too large and needs to be uploaded via COS.').warning()
             Operation(
                 'You can use --cos-bucket BucketName to specify the bucket, or you can use the "scf configure set" to set the default to open the cos upload.').warning()
             raise UploadFailed("Upload faild")
-        elif size >= 8 * 1024 * 1024:
+        elif size >= UploadStrategy.INLINE_RECOMMEND_LIMIT:
             Operation("Package size is over 8M, it is highly recommended that you upload using COS. ").information()
             return
 
+    def _package_key(self, func_path):
+        return os.path.normcase(os.path.abspath(os.path.join(self.template_file_dir, func_path)))
+
+    def _select_history(self, namespace, func_name):
+        '''
+            A function sharing its CodeUri may have no COS object of its own, its history is then
+            the one of the function which uploaded the shared package.
+        '''
+        region = self.region
+        package_key = self._package_key(
+            self.resource[namespace][func_name][tsmacro.Properties].get(tsmacro.CodeUri, ""))
+        if package_key in self._shared_packages:
+            owner_ns, owner, code_url, _ = self._shared_packages[package_key]
+            Operation("Function '{}' shares its CodeUri with function '{}', reuse the selected version.".format(
+                func_name, owner)).process()
+            return dict(code_url)
+
+        owners = [(namespace, func_name)] + [user for user in self._package_users.get(package_key, [])
+                                             if user != (namespace, func_name)]
+        function_list_data = None
+        for owner_ns, owner in owners:
+            function_list = CosClient(self.region).get_object_list(
+                bucket="scf-deploy-" + region,
+                prefix=str(owner_ns) + "-" + str(owner)
+            )
+            if isinstance(function_list, dict) and function_list.get('Contents'):
+                function_list_data = function_list['Contents']
+                break
+
+        if not function_list_data:
+            raise RollbackException(
+                "The historical version is not queried. The deployment history version code only takes effect when you use using-cos.")
+
+        click.secho(
+            "[+] Please select a historical deployment Number for the historical version deployment.",
+            fg="cyan")
+        rollback_dict = {}
+        i = 0
+        for eve_obj in reversed(function_list_data):
+            i = i + 1
+            if i > 15:
+                break
+            click.secho("  [%s] %s" % (
+                i, text(eve_obj["LastModified"].replace(".000Z", "").replace("T", " "))), fg="cyan")
+            rollback_dict[str(i)] = eve_obj["Key"]
+        number = click.prompt(click.style("Please input number(Like: 1)", fg="cyan"))
+        if number not in rollback_dict:
+            raise RollbackException(
+                "Please enter the version number correctly, for example the number 1.")
+
+        code_url = {
+            'cos_bucket_name': "scf-deploy-" + region,
+            'cos_object_name': rollback_dict[number]
+        }
+        msg = "Select function zip file '{}' on COS bucket '{}' success.".format(
+            os.path.basename(code_url["cos_object_name"]), code_url["cos_bucket_name"])
+        Operation(msg).success()
+        self._shared_packages[package_key] = (namespace, func_name, code_url, None)
+        return code_url
+
+    def _do_package_shared(self, func_path, namespace, func_name, region=None):
+        '''
+            Functions with the same CodeUri share one package, the code tree is zipped, hashed and
+            uploaded only for the first function and the same COS object or zip file is reused by the others.
+        '''
+        package_key = self._package_key(func_path)
+        if package_key not in self._shared_packages:
+            code_url = self._do_package_core(func_path, namespace, func_name, region)
+            self._shared_packages[package_key] = (namespace, func_name, code_url, self.artifacts[-1])
+            return code_url
+
+        owner_ns, owner, code_url, artifact = self._shared_packages[package_key]
+        if self.journal:
+            self.journal.mark(namespace, func_name, DeployJournal.PACKAGED,
+                              self.journal.get(owner_ns, owner, DeployJournal.PACKAGED))
+        Operation("Function '{}' shares CodeUri '{}' with function '{}', reuse its package.".format(
+            func_name, func_path, owner)).process()
+        artifact = dict(artifact)
+        artifact.update({"namespace": namespace, "function": func_name, "shared_with": owner})
+        self.artifacts.append(artifact)
+        return dict(code_url)
+
     def _do_package_core(self, func_path, namespace, func_name, region=None):
 
-        zipfile, zip_file_name, zip_file_name_cos = self._zip_func(func_path, namespace, func_name)
+        zipfile, zip_file_name, zip_file_name_cos = self._resume_zip_func(namespace, func_name) or \
+                                                    self._zip_func(func_path, namespace, func_name)
         code_url = dict()
 
-        file_size = os.path.getsize(os.path.join(os.getcwd(), _BUILD_DIR, zip_file_name))
+        zip_file_path = os.path.join(os.getcwd(), self.build_dir, zip_file_name)
+        if self.journal:
+            self.journal.mark(namespace, func_name, DeployJournal.PACKAGED, {
+                "zip_file": zip_file_path,
+                "zip_file_name": zip_file_name,
+                "zip_file_name_cos": zip_file_name_cos,
+                "md5": hashlib.md5(zipfile.getvalue()).hexdigest(),
+            })
+        file_size = os.path.getsize(zip_file_path)
         Operation("Package name: %s, package size: %s kb" % (zip_file_name, str(file_size / 1000))).process()
 
         default_bucket_name = ""
@@ -280,23 +524,35 @@ class Package(object):
         else:
             cos_bucket_status = False
 
-        if self.without_cos:
+        # COS needs a bucket, without one the package can only be uploaded inline
+        using_cos = not self.without_cos and bool(self.cos_bucket or cos_bucket_status)
+        strategy = UploadStrategy.choose(file_size, region, using_cos)
+
+        if strategy.mode == UploadStrategy.INLINE:
+            if not self.without_cos:
+                Operation( \
+                    "If you want to increase the upload speed, you can configure using-cos with command：scf configure set") \
+                    .information()
+
             self.file_size_infor(file_size)
-            Operation("Uploading this package without COS.").process()
-            code_url["zip_file"] = os.path.join(os.getcwd(), _BUILD_DIR, zip_file_name)
+
+            Operation("Upload strategy: %s" % strategy.describe()).information()
+            Operation("Uploading this package without COS." if self.without_cos else "Uploading this package.").process()
+            code_url["zip_file"] = zip_file_path
             Operation("Upload success").success()
 
         elif self.cos_bucket:
             bucket_name = self.cos_bucket + "-" + UserConfig().appid
             Operation("Uploading this package to COS, bucket_name: %s" % (bucket_name)).process()
-            CosClient(region).upload_file2cos(bucket=self.cos_bucket, file=zipfile.read(), key=zip_file_name_cos)
+            self._upload2cos(CosClient(region), self.cos_bucket, zipfile.read(), zip_file_path, zip_file_name_cos,
+                             region, strategy)
             Operation("Upload success").success()
             code_url["cos_bucket_name"] = self.cos_bucket
             code_url["cos_object_name"] = "/" + zip_file_name_cos
             msg = "Upload function zip file '{}' to COS bucket '{}' success.".format(os.path.basename( \
                 code_url["cos_object_name"]), code_url["cos_bucket_name"])
             Operation(msg).success()
-        elif cos_bucket_status:
+        else:
 
             Operation("By default, this package will be uploaded to COS.").information()
             Operation("Default COS-bucket: " + default_bucket_name).information()
@@ -329,8 +585,11 @@ class Package(object):
 
                 Operation("There are some exceptions and the process of uploading to COS is terminated!").warning()
                 Operation("This package will be uploaded by TencentCloud Cloud API.").information()
+                self.file_size_infor(file_size)
+                strategy = UploadStrategy.choose(file_size, region, using_cos=False)
+                Operation("Upload strategy: %s" % strategy.describe()).information()
                 Operation("Uploading this package.").process()
-                code_url["zip_file"] = os.path.join(os.getcwd(), _BUILD_DIR, zip_file_name)
+                code_url["zip_file"] = zip_file_path
                 Operation("Upload success").success()
 
             else:
@@ -359,17 +618,8 @@ class Package(object):
 
                 if is_have == 0:
                     Operation("Uploading to COS, bucket_name:" + default_bucket_name).process()
-                    cos_client.upload_file2cos(
-                        bucket=default_bucket_name,
-                        file=file_data,
-                        key=zip_file_name_cos
-                    )
-                    # cos_client.upload_file2cos2(
-                    #     bucket=default_bucket_name,
-                    #     file=os.path.join(os.getcwd(), _BUILD_DIR, zip_file_name),
-                    #     key=zip_file_name_cos,
-                    #     md5=md5,
-                    # )
+                    self._upload2cos(cos_client, default_bucket_name, file_data, zip_file_path, zip_file_name_cos,
+                                     region, strategy)
 
                 code_url["cos_bucket_name"] = default_bucket_name.replace("-" + UserConfig().appid, '') \
                     if default_bucket_name and default_bucket_name.endswith(
@@ -380,19 +630,47 @@ class Package(object):
                 code_url["cos_object_name"]), code_url["cos_bucket_name"])
             Operation(msg).success()
 
-        else:
-            Operation( \
-                "If you want to increase the upload speed, you can configure using-cos with command：scf configure set") \
-                .information()
-
-            self.file_size_infor(file_size)
-
-            Operation("Uploading this package.").process()
-            code_url["zip_file"] = os.path.join(os.getcwd(), _BUILD_DIR, zip_file_name)
-            Operation("Upload success").success()
-
+        self._record_artifact(namespace, func_name, func_path, zip_file_path, code_url)
         return code_url
 
+    def _upload2cos(self, cos_client, bucket, file_data, zip_file_path, key, region, strategy):
+        Operation("Upload strategy: %s" % strategy.describe()).information()
+        progress = UploadProgress(strategy.size)
+        if strategy.mode == UploadStrategy.MULTIPART:
+            cos_client.upload_file2cos2(bucket=bucket, file=zip_file_path, key=key, md5=False,
+                                        part_size=strategy.part_size, max_thread=strategy.threads, progress=progress)
+        else:
+            cos_client.upload_file2cos(bucket=bucket, file=file_data, key=key, progress=progress)
+        progress.finish()
+        UploadStats().record(region, strategy.size, progress.elapsed, strategy.threads)
+
+    def _record_artifact(self, namespace, func_name, func_path, zip_file_path, code_url):
+        with open(zip_file_path, "rb") as f:
+            md5 = hashlib.md5(f.read()).hexdigest()
+        self.artifacts.append({
+            "namespace": namespace,
+            "function": func_name,
+            "code_uri": func_path,
+            "zip_file": code_url.get("zip_file"),
+            "md5": md5,
+            "size": os.path.getsize(zip_file_path),
+            "cos_bucket_name": code_url.get("cos_bucket_name"),
+            "cos_object_name": code_url.get("cos_object_name"),
+        })
+
+    def _resume_zip_func(self, namespace, func_name):
+        # the package was built by the last deployment but failed to upload
+        packaged = self.journal.get(namespace, func_name, DeployJournal.PACKAGED) if self.journal else None
+        if not packaged or not self._is_package_intact(packaged["zip_file"], packaged["md5"]):
+            return None
+        buff = BytesIO()
+        with open(packaged["zip_file"], "rb") as f:
+            buff.write(f.read())
+        buff.seek(0)
+        buff.name = packaged["zip_file_name"]
+        Operation("Reuse zipfile '{}' of the last deployment".format(packaged["zip_file"])).success()
+        return buff, packaged["zip_file_name"], packaged["zip_file_name_cos"]
+
     def _zip_func(self, func_path, namespace, func_name):
 
         buff = BytesIO()
@@ -409,14 +687,14 @@ class Package(object):
         cwd = os.getcwd()
         os.chdir(self.template_file_dir)
 
-        zip_file_path = os.path.join(_BUILD_DIR, zip_file_name)
+        zip_file_path = os.path.join(self.build_dir, zip_file_name)
 
         if os.path.exists(zip_file_path):
             os.remove(zip_file_path)
 
         try:
             try:
-                os.mkdir(_BUILD_DIR)
+                os.makedirs(self.build_dir)
             except:
                 pass
 
@@ -425,7 +703,7 @@ class Package(object):
                 with ZipFile(buff, mode='w', compression=ZIP_DEFLATED) as zip_object:
                     for current_path, sub_folders, files_name in os.walk(_CURRENT_DIR):
                         # click.secho(str(current_path))
-                        if not str(current_path).startswith("./.") and not str(current_path).startswith(r".\."):
+                        if not str(current_path).startswith(self.IGNORE_PREFIXES):
                             for file in files_name:
                                 zip_object.write(os.path.join(current_path, file))
 
@@ -433,8 +711,8 @@ class Package(object):
                 buff.seek(0)
                 buff.name = zip_file_name
 
-                if not os.path.exists(_BUILD_DIR):
-                    os.mkdir(_BUILD_DIR)
+                if not os.path.exists(self.build_dir):
+                    os.makedirs(self.build_dir)
 
                 # a temporary support for upload func from local zipfile
                 with open(zip_file_path, 'wb') as f:
@@ -472,12 +750,13 @@ class Package(object):
 
 
 class Deploy(object):
-    def __init__(self, resource, namespace, region=None, forced=False, skip_event=False):
+    def __init__(self, resource, namespace, region=None, forced=False, skip_event=False, journal=None):
         self.resources = resource
         self.namespace = namespace
         self.region = region
         self.forced = forced
         self.skip_event = skip_event
+        self.journal = journal
 
     def do_deploy(self):
         for ns in self.resources:
@@ -496,10 +775,18 @@ class Deploy(object):
             Operation("Deploy namespace '{ns}' end".format(ns=ns_this)).success()
 
     def _do_deploy_core(self, func, func_name, func_ns, region, forced, skip_event=False):
+        template_ns = func_ns
         # check namespace exit, create namespace
         if self.namespace and self.namespace != func_ns:
             func_ns = self.namespace
 
+        if self.journal and self.journal.get(template_ns, func_name, DeployJournal.FUNCTION_UPDATED):
+            Operation("Function '{name}' has been deployed by the last deployment, skip it".format(
+                name=func_name)).process()
+            if not skip_event and not self.journal.get(template_ns, func_name, DeployJournal.TRIGGERS_CREATED):
+                self._do_deploy_trigger(func, func_name, func_ns, region, template_ns)
+            return
+
         rep = ScfClient(region).get_ns(func_ns)
         if not rep:
             Operation("{ns} not exists, create it now".format(ns=func_ns)).process()
@@ -526,14 +813,32 @@ class Deploy(object):
             raise CloudAPIException(err_msg)
 
         Operation("Deploy function '{name}' success".format(name=func_name)).success()
+        self._invalidate_inventory(region, func_ns)
+        if self.journal:
+            self.journal.mark(template_ns, func_name, DeployJournal.FUNCTION_UPDATED)
         if not skip_event:
-            self._do_deploy_trigger(func, func_name, func_ns, region)
+            self._do_deploy_trigger(func, func_name, func_ns, region, template_ns)
+
+    @staticmethod
+    def _invalidate_inventory(region, func_ns):
+        inventory = FunctionInventory()
+        try:
+            inventory.invalidate(region if region else UserConfig().region, func_ns)
+        finally:
+            inventory.close()
 
-    def _do_deploy_trigger(self, func, func_name, func_ns, region=None):
+    def _do_deploy_trigger(self, func, func_name, func_ns, region=None, template_ns=None):
         proper = func.get(tsmacro.Properties, {})
         events = proper.get(tsmacro.Events, {})
         hasError = None
+        deployed = []
+        if self.journal:
+            deployed = self.journal.get(template_ns, func_name, DeployJournal.TRIGGERS) or []
         for trigger in events:
+            if trigger in deployed:
+                Operation("Trigger '{name}' has been deployed by the last deployment, skip it".format(
+                    name=trigger)).process()
+                continue
             err = ScfClient(region).deploy_trigger(events[trigger], trigger, func_name, func_ns)
             if err is not None:
                 hasError = err
@@ -549,5 +854,10 @@ class Deploy(object):
                         Operation("Deploy trigger '{name}' failure. Error: {e}.".format(name=trigger, e=s, )).warning()
                 continue
             Operation("Deploy trigger '{name}' success".format(name=trigger)).success()
+            if self.journal:
+                self.journal.add_trigger(template_ns, func_name, trigger)
+        # failed triggers are tried again by the next --resume
+        if self.journal and hasError is None:
+            self.journal.mark(template_ns, func_name, DeployJournal.TRIGGERS_CREATED)
         # if hasError is not None:
         #     sys.exit(1)
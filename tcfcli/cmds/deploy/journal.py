@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+
+import io
+import os
+import json
+import time
+import hashlib
+
+
+class DeployJournal(object):
+    '''
+        Checkpoint journal of a multi-function deployment.
+        Every finished step of a function is written to the journal at once, so `scf deploy --resume`
+        continues from the first unfinished step and reuses the packages which are already uploaded.
+    '''
+    NAME = "deploy_journal.json"
+
+    PACKAGED = "packaged"
+    UPLOADED = "uploaded"
+    FUNCTION_UPDATED = "function_updated"
+    TRIGGERS = "triggers"
+    TRIGGERS_CREATED = "triggers_created"
+
+    def __init__(self, build_dir, template_file, region, namespace, function, cos_bucket=None, without_cos=False,
+                 using_cos=False):
+        self._journal_file = os.path.join(build_dir, self.NAME)
+        # the uploaded packages are only reused when they would be uploaded the same way again
+        self._header = {
+            "template_file": os.path.abspath(template_file),
+            "template_md5": self._file_md5(template_file),
+            "region": region,
+            "namespace": namespace,
+            "function": function,
+            "cos_bucket": cos_bucket,
+            "without_cos": bool(without_cos),
+            "using_cos": bool(using_cos),
+        }
+        self._functions = {}
+
+    def load(self):
+        '''
+            Load the journal of the last unfinished deployment,
+            return False if there is none or it was written for another template or arguments, which is removed.
+        '''
+        try:
+            with io.open(self._journal_file, mode="r", encoding="utf-8") as f:
+                data = json.load(f)
+        except Exception:
+            return False
+
+        for k, v in self._header.items():
+            if data.get(k) != v:
+                self.reset()
+                return False
+        self._functions = data.get("functions", {})
+        return True
+
+    def reset(self):
+        self._functions = {}
+        if os.path.exists(self._journal_file):
+            os.remove(self._journal_file)
+
+    def get(self, namespace, function, step):
+        return self._functions.get(self._key(namespace, function), {}).get(step)
+
+    def mark(self, namespace, function, step, value=True):
+        self._functions.setdefault(self._key(namespace, function), {})[step] = value
+        self._flush()
+
+    def add_trigger(self, namespace, function, trigger):
+        triggers = self.get(namespace, function, self.TRIGGERS) or []
+        if trigger not in triggers:
+            triggers.append(trigger)
+        self.mark(namespace, function, self.TRIGGERS, triggers)
+
+    @property
+    def finished_steps(self):
+        return sum(len(steps) for steps in self._functions.values())
+
+    def _flush(self):
+        journal_dir = os.path.dirname(self._journal_file)
+        if not os.path.exists(journal_dir):
+            os.makedirs(journal_dir)
+
+        data = dict(self._header)
+        data["update_time"] = time.strftime("%Y-%m-%d %H:%M:%S")
+        data["functions"] = self._functions
+        # write to a temporary file first, a broken journal must never be left behind
+        tmp_file = self._journal_file + ".tmp"
+        with open(tmp_file, "w") as f:
+            f.write(json.dumps(data, indent=2))
+        if os.path.exists(self._journal_file):
+            os.remove(self._journal_file)
+        os.rename(tmp_file, self._journal_file)
+
+    @staticmethod
+    def _key(namespace, function):
+        return "%s/%s" % (namespace, function)
+
+    @staticmethod
+    def _file_md5(file_path):
+        try:
+            with open(file_path, "rb") as f:
+                return hashlib.md5(f.read()).hexdigest()
+        except (IOError, OSError):
+            return None
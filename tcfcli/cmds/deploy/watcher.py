@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+
+import os
+import time
+
+
+class CodeWatcher(object):
+    '''
+        Polling file watcher used by `scf deploy --watch`.
+        The watched trees are compared by the (mtime, size) snapshot of every file, hidden files and
+        directories are skipped the same way they are skipped when packaging. A change is reported only
+        after the trees have been quiet for `debounce` seconds, so saving many files at once triggers one deploy.
+    '''
+
+    def __init__(self, paths, interval=0.5, debounce=1.0):
+        self.interval = interval
+        self.debounce = debounce
+        self.watch(paths)
+
+    def watch(self, paths):
+        self._paths = sorted(set(os.path.abspath(p) for p in paths))
+        self._snapshot = self.snapshot()
+
+    def snapshot(self):
+        files = {}
+        for path in self._paths:
+            if os.path.isfile(path):
+                self._stat(path, files)
+                continue
+            for current_path, sub_folders, files_name in os.walk(path):
+                sub_folders[:] = [d for d in sub_folders if not d.startswith(".")]
+                for file in files_name:
+                    if not file.startswith("."):
+                        self._stat(os.path.join(current_path, file), files)
+        return files
+
+    def wait(self):
+        '''
+            Block until some files are added, modified or removed, return the changed paths.
+        '''
+        changes = set()
+        last_change = None
+        while True:
+            time.sleep(self.interval)
+            snapshot = self.snapshot()
+            changed = self._diff(self._snapshot, snapshot)
+            self._snapshot = snapshot
+            if changed:
+                changes.update(changed)
+                last_change = time.time()
+            elif changes and time.time() - last_change >= self.debounce:
+                return changes
+
+    @staticmethod
+    def _diff(old, new):
+        changed = set(p for p in new if old.get(p) != new[p])
+        changed.update(p for p in old if p not in new)
+        return changed
+
+    @staticmethod
+    def _stat(path, files):
+        try:
+            st = os.stat(path)
+        except (IOError, OSError):
+            # removed while walking, it is reported by the next snapshot
+            return
+        files[path] = (st.st_mtime, st.st_size)
@@ -1,7 +1,8 @@
 # -*- coding: utf-8 -*-
 
 from tcfcli.common.operation_msg import Operation
-from tcfcli.libs.utils.scf_client import ScfClient
+from tcfcli.libs.utils.function_lister import FunctionLister
+from tcfcli.libs.utils.inventory import FunctionInventory
 from tcfcli.common.user_exceptions import *
 from tcfcli.help.message import ListHelp as help
 import tcfcli.common.base_infor as infor
@@ -10,57 +11,49 @@ REGIONS = infor.REGIONS
 
 
 class List(object):
+    # the expired namespaces are synced by a bounded pool and printed page by page as they arrive
+    POOL_SIZE = 8
+
     @staticmethod
-    def do_cli(region, namespace):
+    def do_cli(region, namespace, refresh=False):
         if region != 'all' and region not in REGIONS:
             raise ArgsException("! The region must in all, %s." % (", ".join(REGIONS)))
 
-        if region == 'all' and namespace == 'all':
-            for region in REGIONS:
-                namespaces = ScfClient(region).list_ns()
-                for namespace in namespaces:
-                    List.show(region, namespace['Name'])
+        regions = REGIONS if region == 'all' else [region]
+        lister = FunctionLister(List.POOL_SIZE)
+        inventory = FunctionInventory()
+        try:
+            found = False
+            for region_this, namespace_this, functions in inventory.sync(lister, regions,
+                                                                         None if namespace == 'all' else namespace,
+                                                                         refresh):
+                found = True
+                if not functions:
+                    continue
+                List.show_header(region_this, namespace_this)
+                List.show(functions)
+                click.secho("\n")
+        finally:
+            lister.close()
+            inventory.close()
 
-        elif region == 'all' and namespace != 'all':
-            tag = False
-            for region in REGIONS:
-                if List.show(region, namespace) is not False:
-                    tag = True
-            if tag is False:
+        if namespace != 'all' and not found:
+            if region == 'all':
                 raise NamespaceException("namespace {ns} not exists in all region".format(ns=namespace))
-
-        elif region != 'all' and namespace == 'all':
-            namespaces = ScfClient(region).list_ns()
-            for namespace in namespaces:
-                List.show(region, namespace['Name'])
-
-        elif region != 'all' and namespace != 'all':
-            if List.show(region, namespace) == False:
-                raise NamespaceException("namespace {ns} not exists".format(ns=namespace))
+            raise NamespaceException("namespace {ns} not exists".format(ns=namespace))
 
     @staticmethod
-    def show(region, namespace):
-        if region and region not in REGIONS:
-            raise ArgsException("region {r} not exists ,please select from{R}".format(r=region, R=REGIONS))
-            # return
-        rep = ScfClient(region).get_ns(namespace)
-        if not rep:
-            return False
-
-        functions = ScfClient(region).list_function(namespace)
-        if not functions:
-            # click.secho("Region:%s \nNamespace:%s " % (region, namespace), fg="green")
-            # click.secho("no function exists\n", fg="red")
-            return
-
+    def show_header(region, namespace):
         Operation("Region:%s" % (region)).process()
         Operation("Namespace:%s " % (namespace)).process()
         click.secho("%-20s %-15s %-20s %-20s %-60s" % ("Runtime", "Status", "AddTime", "ModTime", "FunctionName"))
+
+    @staticmethod
+    def show(functions):
         for function in functions:
             click.secho("%-20s %-24s %-20s %-20s %-60s" % (function.Runtime, List.status(function.Status),
                                                            function.AddTime, function.ModTime,
                                                            function.FunctionName))
-        click.secho("\n")
 
     @staticmethod
     def status(status_name):
@@ -75,7 +68,8 @@ class List(object):
 @click.command(short_help=help.SHORT_HELP)
 @click.option('--region', default="all", help=help.REGION)
 @click.option('-ns', '--namespace', default="all", help=help.NAMESPACE)
-def list(region, namespace):
+@click.option('--refresh', is_flag=True, default=False, help=help.REFRESH)
+def list(region, namespace, refresh):
     """
         \b
         Show the SCF function list.
@@ -84,5 +78,8 @@ def list(region, namespace):
         \b
             * All function in ap-guangzhou
               $ scf list --region ap-guangzhou
+        \b
+            * Sync the local function inventory with the cloud before listing
+              $ scf list --refresh
     """
-    List.do_cli(region, namespace)
+    List.do_cli(region, namespace, refresh)
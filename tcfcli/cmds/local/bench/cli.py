@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+
+import io
+import json
+import time
+import click
+from tcfcli.common.operation_msg import Operation
+from tcfcli.common.rate_limiter import RateLimiter
+from tcfcli.common.user_exceptions import UserException
+from tcfcli.cmds.local.common.invoke_context import InvokeContext
+from tcfcli.cmds.local.common.options import template_click_option
+from tcfcli.cmds.local.invoke.batch import BatchInvoker, BatchStats
+from tcfcli.help.message import LocalHelp as help
+from tcfcli.help.message import CommonHelp
+
+
+@click.command(short_help=help.BENCH_SHORT_HELP)
+@template_click_option()
+@click.option('--event', '-e', type=click.Path(exists=True), help=help.BENCH_EVENT)
+@click.option('--requests', '-n', type=int, default=100, show_default=True, help=help.BENCH_REQUESTS)
+@click.option('--concurrency', '-c', type=int, default=10, show_default=True, help=help.BENCH_CONCURRENCY)
+@click.option('--rate', type=float, help=help.BENCH_RATE)
+@click.option('--output', '-o', type=click.Path(), help=help.BENCH_OUTPUT)
+@click.option('--compare', type=click.Path(exists=True), help=help.BENCH_COMPARE)
+@click.option('--env-vars', help=help.BENCH_ENV_VARS, type=click.Path(exists=True))
+@click.option('--docker-network', help=CommonHelp.INVOKE_DOCKER_NETWORK, envvar="TCF_DOCKER_NETWORK")
+@click.option('--skip-pull-image', is_flag=True, help=CommonHelp.INVOKE_SKIP_PULL_IMAGE, envvar="TCF_SKIP_PULL_IMAGE")
+@click.argument('namespace_identifier', required=False)
+@click.argument('function_identifier', required=False)
+def bench(template, event, requests, concurrency, rate, output, compare, env_vars, docker_network, skip_pull_image,
+          namespace_identifier, function_identifier):
+    '''
+    \b
+    Invoke a function locally many times at a target concurrency or rate and report
+    its throughput, latency percentiles of the cold and warm starts, errors and memory.
+    \b
+    Common usage:
+        \b
+        * 1000 invocations, 20 at a time
+          $ scf local bench -n 1000 -c 20 --event event.json
+        \b
+        * Save the results and compare the next run with them
+          $ scf local bench -n 1000 -c 20 --event event.json -o before.json
+          $ scf local bench -n 1000 -c 20 --event event.json --compare before.json
+    '''
+    Bench.do_cli(template, namespace_identifier, function_identifier, event, requests, concurrency, rate, output,
+                 compare, env_vars, docker_network, skip_pull_image)
+
+
+class Bench(object):
+    # figures compared between two runs, (title, path in the summary, unit, whether higher is better)
+    COMPARED = [
+        ("Throughput", ("throughput",), "/s", True),
+        ("Error rate", ("error_rate",), "", False),
+        ("Latency p50", ("latency", "p50"), "ms", False),
+        ("Latency p95", ("latency", "p95"), "ms", False),
+        ("Latency p99", ("latency", "p99"), "ms", False),
+        ("Cold p50", ("cold", "p50"), "ms", False),
+        ("Warm p50", ("warm", "p50"), "ms", False),
+        ("Warm p99", ("warm", "p99"), "ms", False),
+        ("Memory max", ("memory", "max"), "MB", False),
+    ]
+
+    @staticmethod
+    def do_cli(template, namespace, function, event, requests, concurrency, rate, output, compare, env_vars,
+               docker_network, skip_pull_image):
+        if requests <= 0 or concurrency <= 0:
+            raise UserException("The requests and the concurrency must be positive")
+        if rate is not None and rate <= 0:
+            raise UserException("The rate must be positive")
+
+        event_data = '{}'
+        if event:
+            with io.open(event, mode="r", encoding="utf-8") as f:
+                event_data = f.read()
+        baseline = Bench._load(compare) if compare else None
+
+        with InvokeContext(template_file=template,
+                           function_identifier=function,
+                           env_vars_file=env_vars,
+                           docker_network=docker_network,
+                           skip_pull_image=skip_pull_image,
+                           namespace=namespace,
+                           warm_containers=concurrency,
+                           show_start=False) as context:
+            func_name = context.functions_name
+            limiter = RateLimiter(rate, burst=1) if rate else None
+            invoker = BatchInvoker(context.local_runtime_manager, func_name, concurrency, limiter)
+
+            Operation("Benchmarking %s: %d requests, concurrency %d%s" % (
+                func_name, requests, concurrency, ", rate %.1f/s" % rate if rate else "")).process()
+            stats = BatchStats()
+            errors = {}
+            for result in invoker.run([(i, event_data) for i in range(requests)]):
+                stats.add(result)
+                if not result.Success:
+                    errors[result.Error] = errors.get(result.Error, 0) + 1
+
+        summary = stats.summary()
+        summary.update(function=func_name, requests=requests, concurrency=concurrency, rate=rate,
+                       time=time.strftime("%Y-%m-%d %H:%M:%S"))
+        Bench._show(summary, errors)
+        if baseline:
+            Bench._compare(baseline, summary)
+        if output:
+            with open(output, "w") as f:
+                f.write(json.dumps(summary, indent=2, sort_keys=True))
+            Operation("Results are written to %s" % output).success()
+
+    @staticmethod
+    def _load(path):
+        try:
+            with io.open(path, mode="r", encoding="utf-8") as f:
+                return json.load(f)
+        except Exception as e:
+            raise UserException("Read the results to compare from %s failed: %s" % (path, str(e)))
+
+    @staticmethod
+    def _show(summary, errors):
+        def ms(value):
+            return "-" if value is None else "%.2f ms" % value
+
+        Operation("Finished %d requests in %.1fs" % (summary["invocations"], summary["seconds"])).information()
+        click.secho("  Throughput:  %.2f requests/s" % summary["throughput"])
+        click.secho("  Errors:      %d (%.2f%%)" % (summary["failed"], 100 * summary["error_rate"]),
+                    fg="red" if summary["failed"] else None)
+        for title in ("latency", "cold", "warm"):
+            figures = summary[title]
+            if not figures["count"]:
+                continue
+            click.secho("  %-11s  %5d  p50 %s  p95 %s  p99 %s  max %s" % (
+                title.capitalize() + ":", figures["count"], ms(figures["p50"]), ms(figures["p95"]),
+                ms(figures["p99"]), ms(figures["max"])))
+        if summary["memory"]["count"]:
+            click.secho("  Memory:       p50 %.2f MB  max %.2f MB" % (summary["memory"]["p50"],
+                                                                    summary["memory"]["max"]))
+        for error, count in sorted(errors.items(), key=lambda e: -e[1])[:5]:
+            click.secho("  %5d x %s" % (count, error), fg="red")
+
+    @staticmethod
+    def _compare(baseline, summary):
+        def get(values, path):
+            for key in path:
+                values = (values or {}).get(key)
+            return values
+
+        Operation("Compared with the run of %s (%s requests, concurrency %s):" % (
+            baseline.get("time"), baseline.get("requests"), baseline.get("concurrency"))).information()
+        for title, path, unit, higher_better in Bench.COMPARED:
+            before, after = get(baseline, path), get(summary, path)
+            if before is None or after is None:
+                continue
+            if path == ("error_rate",):
+                before, after, unit = before * 100, after * 100, "%"
+            # a change from 0 has no ratio, it is shown as the difference
+            change = "%+.1f%%" % ((after - before) / before * 100) if before else "%+.2f %s" % (after - before, unit)
+            better = (after > before) == higher_better
+            click.secho("  %-12s %10.2f %-3s -> %10.2f %-3s (%s)" % (title, before, unit, after, unit, change),
+                        fg=None if after == before else ("green" if better else "red"))
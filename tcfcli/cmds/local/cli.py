@@ -4,6 +4,8 @@ import click
 from .invoke.cli import invoke
 from .start_api.cli import start_api
 from .generate_event.cli import generate_event
+from .pull.cli import pull
+from .bench.cli import bench
 from tcfcli.help.message import LocalHelp as help
 
 
@@ -30,5 +32,7 @@ def local():
 
 local.add_command(invoke)
 local.add_command(generate_event)
+local.add_command(pull)
+local.add_command(bench)
 
 # local.add_command(start_api)
@@ -4,12 +4,14 @@ import json
 import sys
 import docker
 import os
+import threading
 
 from tcfcli.common.template import Template
 from tcfcli.libs.function.fam_function_provider import ScfFunctionProvider
 from tcfcli.common.user_exceptions import InvokeContextException
 from tcfcli.cmds.local.libs.local.local_runtime_manager import LocalRuntimeManager
 from tcfcli.cmds.local.libs.local.debug_context import DebugContext
+from tcfcli.cmds.local.libs.docker.image_cache import ImageCache
 from tcfcli.common import tcsam
 from tcfcli.common.tcsam.tcsam_macro import TcSamMacro as tsmacro
 
@@ -26,9 +28,13 @@ class InvokeContext(object):
                  docker_network=None,
                  log_file=None,
                  skip_pull_image=None,
+                 pull_ttl=ImageCache.DEFAULT_TTL,
                  region=None,
                  namespace=None,
-                 is_quiet=False):
+                 is_quiet=False,
+                 warm_containers=0,
+                 warm_idle_ttl=300,
+                 show_start=True):
 
         self._template_file = template_file
         self._function_identifier = function_identifier
@@ -40,6 +46,7 @@ class InvokeContext(object):
         self._docker_network = docker_network
         self._log_file = log_file
         self._skip_pull_image = skip_pull_image
+        self._pull_ttl = pull_ttl
         self._region = region
         self.namespace = namespace
 
@@ -50,6 +57,12 @@ class InvokeContext(object):
         self._debug_context = None
 
         self._is_quiet = is_quiet
+        self._warm_containers = warm_containers
+        self._warm_idle_ttl = warm_idle_ttl
+        self._show_start = show_start
+        self._local_runtime_manager = None
+        self._runtime_manager_lock = threading.Lock()
+        self._docker_client = None
 
     def __enter__(self):
         template_dict = tcsam.tcsam_validate(Template.get_template_data(self._template_file))
@@ -73,11 +86,15 @@ class InvokeContext(object):
         self._log_file_fp = self._get_log_file(self._log_file)
         self._debug_context = self._get_debug_context(self._debug_port, self._debug_args, self._debugger_path)
 
-        self._check_docker()
+        # one docker client is shared by all the containers and requests of the context
+        self._docker_client = docker.from_env()
+        self._check_docker(self._docker_client)
 
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
+        if self._local_runtime_manager:
+            self._local_runtime_manager.close()
         if self._log_file_fp:
             self._log_file_fp.close()
 
@@ -91,14 +108,23 @@ class InvokeContext(object):
 
     @property
     def local_runtime_manager(self):
-        return LocalRuntimeManager(function_provider=self._function_provider,
-                                   cwd=self.get_cwd(),
-                                   env_vars=self._env_vars,
-                                   debug_context=self._debug_context,
-                                   region=self._region,
-                                   docker_network_id=self._docker_network,
-                                   skip_pull_image=self._skip_pull_image,
-                                   is_quiet=self._is_quiet)
+        # the warm containers are owned by the manager, it lives as long as the context
+        with self._runtime_manager_lock:
+            if self._local_runtime_manager is None:
+                self._local_runtime_manager = LocalRuntimeManager(function_provider=self._function_provider,
+                                                                  cwd=self.get_cwd(),
+                                                                  env_vars=self._env_vars,
+                                                                  debug_context=self._debug_context,
+                                                                  region=self._region,
+                                                                  docker_network_id=self._docker_network,
+                                                                  skip_pull_image=self._skip_pull_image,
+                                                                  pull_ttl=self._pull_ttl,
+                                                                  is_quiet=self._is_quiet,
+                                                                  warm_containers=self._warm_containers,
+                                                                  warm_idle_ttl=self._warm_idle_ttl,
+                                                                  docker_client=self._docker_client,
+                                                                  show_start=self._show_start)
+            return self._local_runtime_manager
 
     @property
     def template(self):
@@ -3,6 +3,7 @@
 import click
 import os
 from tcfcli.help.message import CommonHelp as help
+from tcfcli.cmds.local.libs.docker.image_cache import ImageCache
 
 _DEAFULT_TEMPLATE_FILE = 'template.[yaml|yml]'
 
@@ -65,6 +66,13 @@ def invoke_common_options(f):
                      help=help.INVOKE_SKIP_PULL_IMAGE,
                      envvar="TCF_SKIP_PULL_IMAGE"),
 
+        click.option('--pull-ttl',
+                     type=int,
+                     default=ImageCache.DEFAULT_TTL,
+                     show_default=True,
+                     help=help.INVOKE_PULL_TTL,
+                     envvar="TCF_PULL_TTL"),
+
         click.option('--region', help=help.INVOKE_REGION),
 
     ]
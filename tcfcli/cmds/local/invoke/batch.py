@@ -0,0 +1,151 @@
+# -*- coding: utf-8 -*-
+
+import io
+import os
+import time
+import click
+from collections import namedtuple
+from multiprocessing.pool import ThreadPool
+from tcfcli.common.histogram import Histogram
+from tcfcli.common.operation_msg import Operation
+from tcfcli.common.user_exceptions import UserException
+from tcfcli.libs.utils.log_cache import CachedLog
+from tcfcli.libs.utils.log_stats import parse_report
+
+RESULT_FIELDS = ["Event", "Success", "ReturnValue", "Duration", "MemUsage", "ColdStart", "Error", "Log"]
+
+# Duration is the latency seen by the host in ms, MemUsage the max memory reported by the runtime in MB
+InvokeResult = namedtuple("InvokeResult", RESULT_FIELDS)
+
+
+def load_events(path):
+    '''
+        Return the (name, event) of a directory of .json files, one event per file,
+        or of a JSONL file, one event per line.
+    '''
+    if os.path.isdir(path):
+        names = sorted(n for n in os.listdir(path) if n.endswith(".json"))
+        events = []
+        for name in names:
+            with io.open(os.path.join(path, name), mode="r", encoding="utf-8") as f:
+                events.append((name, f.read()))
+    else:
+        with io.open(path, mode="r", encoding="utf-8") as f:
+            events = [("line %d" % (i + 1), line.strip()) for i, line in enumerate(f) if line.strip()]
+    if not events:
+        raise UserException("There is no event in %s" % path)
+    return events
+
+
+class BatchInvoker(object):
+    '''
+        Invoke a function with many events on `concurrency` threads, every invocation captures its
+        own output so the return value, the logs and the REPORT metrics are kept per event.
+    '''
+
+    def __init__(self, runtime_manager, func_name, concurrency=1, limiter=None):
+        self._runtime_manager = runtime_manager
+        self._func_name = func_name
+        self._concurrency = max(1, concurrency)
+        self._limiter = limiter
+
+    def invoke(self, name, event):
+        if self._limiter:
+            self._limiter.acquire()
+        stdout = io.BytesIO()
+        stderr = io.BytesIO()
+        warm = False
+        error = None
+        start = time.time()
+        try:
+            warm = self._runtime_manager.invoke(self._func_name, event, stdout=stdout, stderr=stderr)
+        except Exception as e:
+            error = str(e)
+        duration = (time.time() - start) * 1000
+
+        out = stdout.getvalue().decode("utf-8", "replace").strip("\n").split("\n")
+        err = stderr.getvalue().decode("utf-8", "replace").strip("\n")
+        return_value = out[-1] if out[-1] else None
+        logs = "\n".join(out[:-1] + ([err] if err else []))
+        report = parse_report(CachedLog(None, None, None, duration, None, None, logs))
+        # the runtimes report a failed invocation on stderr
+        if error is None and "REPORT RequestId" in err:
+            error = err.split("\n")[-1]
+            return_value = None
+
+        return InvokeResult(Event=name, Success=error is None, ReturnValue=return_value, Duration=round(duration, 2),
+                            MemUsage=report["max_memory_used"], ColdStart=not warm, Error=error, Log=logs)
+
+    def run(self, events):
+        '''
+            Yield the InvokeResult of every (name, event) as soon as it is done.
+        '''
+        pool = ThreadPool(self._concurrency)
+        try:
+            for result in pool.imap_unordered(lambda e: self.invoke(*e), events):
+                yield result
+        finally:
+            pool.terminate()
+
+
+class BatchStats(object):
+    PERCENTILES = (50, 90, 95, 99)
+
+    def __init__(self):
+        self.passed = 0
+        self.failed = 0
+        self.cold = Histogram()
+        self.warm = Histogram()
+        self.duration = Histogram()
+        self.memory = Histogram()
+        self._start = time.time()
+        self._end = self._start
+
+    def add(self, result):
+        if result.Success:
+            self.passed += 1
+        else:
+            self.failed += 1
+        self.duration.add(result.Duration)
+        (self.cold if result.ColdStart else self.warm).add(result.Duration)
+        if result.MemUsage is not None:
+            self.memory.add(result.MemUsage)
+        self._end = time.time()
+
+    @property
+    def elapsed(self):
+        return max(self._end - self._start, 0.001)
+
+    def summary(self):
+        '''
+            The figures of the invocations as a dict which can be saved and compared with another run.
+        '''
+        def figures(histogram):
+            values = dict(("p%d" % p, histogram.percentile(p)) for p in self.PERCENTILES)
+            values.update(count=histogram.count, max=histogram.max, mean=histogram.mean)
+            return values
+
+        total = self.passed + self.failed
+        return {
+            "invocations": total,
+            "passed": self.passed,
+            "failed": self.failed,
+            "error_rate": float(self.failed) / total if total else 0,
+            "seconds": self.elapsed,
+            "throughput": total / self.elapsed,
+            "latency": figures(self.duration),
+            "cold": figures(self.cold),
+            "warm": figures(self.warm),
+            "memory": figures(self.memory),
+        }
+
+    def show(self):
+        total = self.passed + self.failed
+        Operation("Invoked %d events in %.1fs: %d passed, %d failed" % (total, self.elapsed, self.passed,
+                                                                       self.failed)).information()
+        for title, histogram in (("Latency", self.duration), ("Cold", self.cold), ("Warm", self.warm)):
+            if not histogram.count:
+                continue
+            click.secho("  %-8s %5d  " % (title, histogram.count) + "  ".join(
+                ["p%d %.2f ms" % (p, histogram.percentile(p)) for p in self.PERCENTILES] +
+                ["max %.2f ms" % histogram.max]))
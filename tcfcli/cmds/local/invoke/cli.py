@@ -4,7 +4,9 @@ import click
 from tcfcli.common.operation_msg import Operation
 from tcfcli.cmds.local.common.invoke_context import InvokeContext
 from tcfcli.cmds.local.common.options import invoke_common_options
-from tcfcli.common.user_exceptions import UserException
+from tcfcli.common.user_exceptions import UserException, InvokeException
+from tcfcli.cmds.local.invoke.batch import BatchInvoker, BatchStats, RESULT_FIELDS, load_events
+from tcfcli.libs.utils.log_export import LogExporter
 from tcfcli.help.message import LocalHelp as help
 
 STD_IN = '-'
@@ -13,13 +15,17 @@ STD_IN = '-'
 @click.command(short_help=help.SHORT_HELP)
 @click.option('--event', '-e', type=click.Path(), default=STD_IN, help=help.INVOKE_EVENT)
 @click.option('--no-event', is_flag=True, default=False, help=help.INVOKE_NO_ENENT)
+@click.option('--events', type=click.Path(exists=True), help=help.INVOKE_EVENTS)
+@click.option('--concurrency', '-c', type=int, default=4, show_default=True, help=help.INVOKE_CONCURRENCY)
+@click.option('--output', '-o', type=click.Path(), help=help.INVOKE_OUTPUT)
 @invoke_common_options
 @click.option('--quiet', '-q', is_flag=True, default=False, help=help.INVOKE_QUIET)
 @click.argument('namespace_identifier', required=False)
 @click.argument('function_identifier', required=False)
-def invoke(template, namespace_identifier, function_identifier, event, no_event, env_vars, debug_port, debug_args,
+def invoke(template, namespace_identifier, function_identifier, event, no_event, events, concurrency, output,
+           env_vars, debug_port, debug_args,
            debugger_path,
-           docker_volume_basedir, docker_network, log_file, skip_pull_image, region, quiet):
+           docker_volume_basedir, docker_network, log_file, skip_pull_image, pull_ttl, region, quiet):
     '''
     \b
     Execute your scf in a docker environment locally.
@@ -28,15 +34,25 @@ def invoke(template, namespace_identifier, function_identifier, event, no_event,
         \b
         * Startup function runs locally
           $ scf local invoke -t template.yaml
+        \b
+        * Replay recorded events, 8 at a time, and save the results
+          $ scf local invoke -t template.yaml --events events.jsonl -c 8 -o results.jsonl
     '''
+    if events:
+        if event != STD_IN or no_event:
+            raise UserException('events is conflict with event and no_event, provide only one.')
+        do_batch_invoke(template, namespace_identifier, function_identifier, events, concurrency, output, env_vars,
+                        docker_volume_basedir, docker_network, log_file, skip_pull_image, pull_ttl, region)
+        return
+
     do_invoke(template, namespace_identifier, function_identifier, event, no_event, env_vars, debug_port, debug_args,
               debugger_path,
-              docker_volume_basedir, docker_network, log_file, skip_pull_image, region, quiet)
+              docker_volume_basedir, docker_network, log_file, skip_pull_image, pull_ttl, region, quiet)
 
 
 def do_invoke(template, namespace_identifier, function_identifier, event, no_event, env_vars, debug_port, debug_args,
               debugger_path,
-              docker_volume_basedir, docker_network, log_file, skip_pull_image, region, quiet):
+              docker_volume_basedir, docker_network, log_file, skip_pull_image, pull_ttl, region, quiet):
     if no_event and event != STD_IN:
         raise UserException('event is conflict with no_event, provide only one.')
 
@@ -56,6 +72,7 @@ def do_invoke(template, namespace_identifier, function_identifier, event, no_eve
                            docker_network=docker_network,
                            log_file=log_file,
                            skip_pull_image=skip_pull_image,
+                           pull_ttl=pull_ttl,
                            region=region,
                            namespace=namespace_identifier,
                            is_quiet=quiet
@@ -67,6 +84,45 @@ def do_invoke(template, namespace_identifier, function_identifier, event, no_eve
         raise e
 
 
+def do_batch_invoke(template, namespace_identifier, function_identifier, events, concurrency, output, env_vars,
+                    docker_volume_basedir, docker_network, log_file, skip_pull_image, pull_ttl, region):
+    event_list = load_events(events)
+    exporter = LogExporter(output, fields=RESULT_FIELDS) if output else None
+    stats = BatchStats()
+    try:
+        # every worker thread keeps its own warm container
+        with InvokeContext(template_file=template,
+                           function_identifier=function_identifier,
+                           env_vars_file=env_vars,
+                           docker_volume_basedir=docker_volume_basedir,
+                           docker_network=docker_network,
+                           log_file=log_file,
+                           skip_pull_image=skip_pull_image,
+                           pull_ttl=pull_ttl,
+                           region=region,
+                           namespace=namespace_identifier,
+                           warm_containers=concurrency,
+                           show_start=False) as context:
+
+            Operation('Invoking %d events with concurrency %d' % (len(event_list), concurrency)).process()
+            invoker = BatchInvoker(context.local_runtime_manager, context.functions_name, concurrency)
+            for result in invoker.run(event_list):
+                stats.add(result)
+                if exporter:
+                    exporter.write(result)
+                if not result.Success:
+                    Operation('Event %s failed: %s' % (result.Event, result.Error)).warning()
+    finally:
+        if exporter:
+            exporter.close()
+
+    stats.show()
+    if output:
+        Operation('Results are written to %s' % output).success()
+    if stats.failed:
+        raise InvokeException('%d of %d events failed' % (stats.failed, len(event_list)))
+
+
 def _get_event(event_file):
     if event_file == STD_IN:
         Operation('read event from stdin').process()
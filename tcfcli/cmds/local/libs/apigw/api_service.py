@@ -13,12 +13,17 @@ class LocalApiService(object):
     _DEFAULT_PORT = 3000
     _DEFAULT_HOST = '127.0.0.1'
 
-    def __init__(self, invoke_context, port=None, host=None, static_dir=None):
+    def __init__(self, invoke_context, port=None, host=None, static_dir=None, workers=32, concurrency=4,
+                 function_concurrency=None, queue_size=16):
         self._invoke_context = invoke_context
         self._stderr = invoke_context.stderr
         self._port = port or self._DEFAULT_PORT
         self._host = host or self._DEFAULT_HOST
         self._static_dir = static_dir
+        self._workers = workers
+        self._concurrency = concurrency
+        self._function_concurrency = function_concurrency
+        self._queue_size = queue_size
 
         self._local_runtime_manager = invoke_context.local_runtime_manager
         self._api_provider = ApiProvider(invoke_context.template)
@@ -36,7 +41,11 @@ class LocalApiService(object):
                            static_dir=static_dir_path,
                            port=self._port,
                            host=self._host,
-                           stderr=self._stderr)
+                           stderr=self._stderr,
+                           workers=self._workers,
+                           concurrency=self._concurrency,
+                           function_concurrency=self._function_concurrency,
+                           queue_size=self._queue_size)
 
         self._show_routes(routes_list, port=self._port, host=self._host)
         logger.info(
@@ -9,7 +9,10 @@ class ErrorResponse(object):
     _INVALID_RESPONSE_FORMAT = {'errno': 403,
                                 'error': 'Invalid scf response format. please check your scf response format.'}
 
+    _TOO_MANY_REQUESTS = {'errorMessage': 'Too many requests, the concurrency limit of the function is reached'}
+
     _STATUS_CODE_403 = 403
+    _STATUS_CODE_429 = 429
     _STATUS_CODE_502 = 502
 
     @staticmethod
@@ -38,3 +41,12 @@ class ErrorResponse(object):
             err_msg = {'errorMessage': msg}
 
         return make_response(jsonify(err_msg), ErrorResponse._STATUS_CODE_403)
+
+    @staticmethod
+    def TooManyRequests(msg=None):
+        err_msg = ErrorResponse._TOO_MANY_REQUESTS
+
+        if msg and isinstance(msg, str):
+            err_msg = {'errorMessage': msg}
+
+        return make_response(jsonify(err_msg), ErrorResponse._STATUS_CODE_429)
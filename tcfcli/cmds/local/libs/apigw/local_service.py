@@ -1,44 +1,49 @@
 # -*- coding: utf-8 -*-
 
-import io
-import os
-import sys
 import json
 import uuid
 import base64
 import logging
 
 from flask import Flask, Response, request
-from tcfcli.cmds.local.libs.apigw.path_converter import PathConverter
+from werkzeug.exceptions import MethodNotAllowed
+from tcfcli.cmds.local.libs.apigw.path_converter import RouteTrie
 from tcfcli.cmds.local.libs.events.api import ApigwEvent
 from tcfcli.cmds.local.libs.apigw.error_response import ErrorResponse
+from tcfcli.cmds.local.libs.apigw.server import PooledWSGIServer, ConcurrencyLimit
+from tcfcli.cmds.local.libs.apigw.output_demuxer import OutputDemuxer
 
 logger = logging.getLogger(__name__)
 
 
 class LocalService(object):
-    def __init__(self, routes_list, runtime_manager, static_dir=None, port=None, host=None, stderr=None):
+    def __init__(self, routes_list, runtime_manager, static_dir=None, port=None, host=None, stderr=None,
+                 workers=32, concurrency=4, function_concurrency=None, queue_size=16):
         self._routes_list = routes_list
         self._runtime_manager = runtime_manager
         self._static_dir = static_dir
         self._port = port
         self._host = host
         self._stderr = stderr
+        self._workers = workers
 
-        self._route_map = {}
+        self._routes = RouteTrie()
         self._server = None
 
+        function_concurrency = function_concurrency or {}
+        self._limits = dict((route.func_name, ConcurrencyLimit(function_concurrency.get(route.func_name, concurrency),
+                                                               queue_size))
+                            for route in routes_list)
+
     def create(self):
         self._server = Flask(__name__, static_url_path='', static_folder=self._static_dir)
 
+        # the routes are not flask rules, werkzeug tries its rules one by one on every request.
+        # they are resolved by the trie before flask dispatches, which is left with the static files
         for route in self._routes_list:
-            path = PathConverter.convert_path_to_flask(route.path)
-            self._save_route_map(path, route)
-            self._server.add_url_rule(path,
-                                      endpoint=path,
-                                      methods=route.method,
-                                      view_func=self._request_handler,
-                                      provide_automatic_options=False)
+            for method in route.method:
+                self._routes.add(route.path, method, route)
+        self._server.before_request(self._request_handler)
 
     def listen(self):
         self.create()
@@ -46,38 +51,53 @@ class LocalService(object):
         if not self._server:
             raise RuntimeError('Local service has not been created before listening')
 
-        os.environ['WERKZEUG_RUN_MAIN'] = 'true'
-
-        self._server.run(threaded=True, host=self._host, port=self._port)
-
-    def _request_handler(self, **kwargs):
-        key = request.path + ':' + request.method
-
-        if key not in self._route_map.keys():
-            raise RuntimeError('Not found the function bind to the route')
-
+        # the connections queue up to twice the workers before they are rejected with 503
+        server = PooledWSGIServer(self._host, self._port, self._server, self._workers, self._workers * 2)
+        logger.info('Running on http://{}:{}/ with {} workers'.format(self._host, self._port, self._workers))
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+
+    def _request_handler(self):
+        matched = self._routes.match(request.path)
+        if matched is None:
+            # not a route, flask serves the static file or 404
+            return None
+
+        methods, values = matched
+        method = request.method
+        if method not in methods and method == 'HEAD':
+            method = 'GET'
+        if method not in methods:
+            raise MethodNotAllowed(valid_methods=list(methods))
+
+        path, names, route = methods[method]
         try:
-            event = self._generate_api_event(request)
+            event = self._generate_api_event(request, path, dict(zip(names, values)))
         except UnicodeDecodeError:
             return ErrorResponse.InternalError()
 
-        stdout = io.BytesIO()
+        func_name = route.func_name
+        limit = self._limits[func_name]
+        if not limit.acquire():
+            return ErrorResponse.TooManyRequests()
+
+        # the logs go to stderr while the function runs, only its return value is kept
+        stdout = OutputDemuxer(self._stderr)
         try:
-            self._runtime_manager.invoke(self._route_map[key].func_name,
+            self._runtime_manager.invoke(func_name,
                                          event,
                                          stdout=stdout,
                                          stderr=self._stderr)
         except:
             return ErrorResponse.InternalError()
+        finally:
+            limit.release()
 
-        return_value, log_list = self._get_ouput(stdout)
-
-        if self._stderr and log_list:
-            for line in log_list:
-                if sys.version_info.major > 2:
-                    self._stderr.write(bytes(line + '\n', encoding='utf-8'))
-                else:
-                    self._stderr.write(bytes(line + '\n').encode("utf-8"))
+        return_value = stdout.result()
 
         try:
             status_code, headers, body = self._parse_output(return_value)
@@ -87,18 +107,10 @@ class LocalService(object):
 
         return self._response(status_code, headers, body)
 
-    def _save_route_map(self, path=None, route=None):
-        if not route or not path:
-            return
-
-        for method in route.method:
-            key = '{}:{}'.format(path, method)
-            self._route_map[key] = route
-
     @staticmethod
-    def _generate_api_event(request):
+    def _generate_api_event(request, path, path_params):
         req_context = {
-            'path': PathConverter.convert_path_to_api_gateway(request.endpoint),
+            'path': path,
             'httpMethod': request.method,
             'requestId': str(uuid.uuid1()),
             'sourceIp': request.remote_addr,
@@ -115,7 +127,7 @@ class LocalService(object):
 
         event = ApigwEvent(method=request.method,
                            path=request.path,
-                           path_paras=request.view_args,
+                           path_paras=path_params,
                            body=body,
                            headers=headers,
                            req_context=req_context,
@@ -137,19 +149,6 @@ class LocalService(object):
 
         return query_dict
 
-    @staticmethod
-    def _get_ouput(stdout_stream):
-        output = stdout_stream.getvalue().decode('utf-8').strip('\n').split('\n')
-
-        output_length = len(output)
-        log_list = None
-        if output_length > 1:
-            log_list = output[:output_length - 1]
-
-        return_value = output[-1]
-
-        return return_value, log_list
-
     @staticmethod
     def _parse_output(return_vlue):
         try:
@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+
+
+class OutputDemuxer(object):
+    '''
+        File-like sink of the function stdout which forwards the log lines to `log_stream` as
+        they arrive and keeps only the last non-empty line, the return value of the function.
+        A line longer than `max_line` is forwarded in pieces up to its end, it can not be a valid
+        return value, so there is none if it is the last line.
+    '''
+    MAX_LINE = 8 * 1024 * 1024
+
+    def __init__(self, log_stream=None, max_line=MAX_LINE):
+        self._log_stream = log_stream
+        self._max_line = max_line
+        # the chunks of the line not terminated yet
+        self._partial = []
+        self._partial_size = 0
+        self._last = None
+        self._blanks = 0
+        # the line not terminated yet is too long, the rest of it is forwarded as it comes
+        self._oversized = False
+
+    def write(self, data):
+        lines = data.split(b'\n')
+        if len(lines) > 1:
+            if self._oversized:
+                self._log(lines[0] + b'\n')
+                self._oversized = False
+            else:
+                self._partial.append(lines[0])
+                self._add_line(b''.join(self._partial))
+            self._partial = []
+            self._partial_size = 0
+            for line in lines[1:-1]:
+                self._add_line(line)
+        if lines[-1]:
+            if self._oversized:
+                self._log(lines[-1])
+            else:
+                self._partial.append(lines[-1])
+                self._partial_size += len(lines[-1])
+        if self._partial_size > self._max_line:
+            self._forget_last()
+            self._log(b''.join(self._partial))
+            self._partial = []
+            self._partial_size = 0
+            self._oversized = True
+
+    def flush(self):
+        pass
+
+    def result(self):
+        '''
+            Return the last line and forget it, once the function has finished.
+        '''
+        if self._oversized:
+            self._log(b'\n')
+        elif self._partial:
+            self._add_line(b''.join(self._partial))
+        self._partial = []
+        self._partial_size = 0
+        self._oversized = False
+        last, self._last, self._blanks = self._last, None, 0
+        return last.decode('utf-8', 'replace') if last is not None else ''
+
+    def _add_line(self, line):
+        # the blank lines after the last line are only logged if another line follows
+        if not line.strip(b'\r'):
+            self._blanks += 1
+            return
+        self._forget_last()
+        self._last = line
+
+    def _forget_last(self):
+        if self._last is not None:
+            self._log(self._last + b'\n' * (self._blanks + 1))
+        elif self._blanks:
+            self._log(b'\n' * self._blanks)
+        self._last = None
+        self._blanks = 0
+
+    def _log(self, data):
+        if self._log_stream:
+            self._log_stream.write(data)
@@ -70,3 +70,91 @@ class PathConverter(object):
 
         # Replace the '<' and '>' with '{' and '}' respectively
         return proxy_sub_path.replace(LEFT_ANGLE_BRACKET, LEFT_BRACKET).replace(RIGHT_ANGLE_BRACKET, RIGHT_BRACKET)
+
+
+class RouteTrie(object):
+    """
+    Api Gateway paths compiled into a trie of their segments, a request path is resolved to its route
+    and its path params in one walk, whatever the number of routes.
+
+    A segment is literal ('user'), a param ('{id}', one non-empty segment) or a proxy ('{proxy+}', the
+    rest of the path). At every segment a literal is tried before a param, and a param before a proxy.
+    """
+
+    def __init__(self):
+        self._root = _TrieNode()
+
+    def add(self, path, method, value):
+        """
+        :param str path: Api Gateway path, like '/user/{id}'
+        :param str method: HTTP method
+        :param value: Returned by match for the path and method
+        """
+        node = self._root
+        names = []
+        for segment in path.split('/')[1:]:
+            if segment.startswith(LEFT_BRACKET) and segment.endswith('+' + RIGHT_BRACKET):
+                names.append(segment[1:-2])
+                node = node.proxy or node.set_proxy()
+                break
+            elif segment.startswith(LEFT_BRACKET) and segment.endswith(RIGHT_BRACKET):
+                names.append(segment[1:-1])
+                node = node.param or node.set_param()
+            else:
+                node = node.children.setdefault(segment, _TrieNode())
+        node.methods[method] = (path, names, value)
+
+    def match(self, path):
+        """
+        :param str path: Path of a request, like '/user/1001'
+        :return: ({method: (api gateway path, names of the path params, value)}, values of the path params),
+                 None if no route matches the path
+        """
+        values = []
+        node = self._match(self._root, path.split('/')[1:], 0, values)
+        if node is None:
+            return None
+        return node.methods, values
+
+    def _match(self, node, segments, index, values):
+        if index == len(segments):
+            return node if node.methods else None
+
+        segment = segments[index]
+        child = node.children.get(segment)
+        if child is not None:
+            found = self._match(child, segments, index + 1, values)
+            if found is not None:
+                return found
+
+        if node.param is not None and segment:
+            values.append(segment)
+            found = self._match(node.param, segments, index + 1, values)
+            if found is not None:
+                return found
+            values.pop()
+
+        rest = '/'.join(segments[index:])
+        if node.proxy is not None and rest and node.proxy.methods:
+            values.append(rest)
+            return node.proxy
+
+        return None
+
+
+class _TrieNode(object):
+    __slots__ = ('children', 'param', 'proxy', 'methods')
+
+    def __init__(self):
+        self.children = {}
+        self.param = None
+        self.proxy = None
+        self.methods = {}
+
+    def set_param(self):
+        self.param = _TrieNode()
+        return self.param
+
+    def set_proxy(self):
+        self.proxy = _TrieNode()
+        return self.proxy
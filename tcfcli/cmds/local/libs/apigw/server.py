@@ -0,0 +1,298 @@
+# -*- coding: utf-8 -*-
+
+import io
+import errno
+import json
+import time
+import select
+import socket
+import threading
+from six.moves import queue
+from werkzeug.serving import BaseWSGIServer, WSGIRequestHandler
+
+# the server of the worker running on the current thread
+_worker = threading.local()
+
+
+class KeepAliveRequestHandler(WSGIRequestHandler):
+    '''
+        Handle one request of a connection. HTTP/1.1 keeps the connection open, between two requests
+        it is watched by the server instead of holding a worker.
+    '''
+    protocol_version = 'HTTP/1.1'
+
+    def setup(self):
+        connection = self.request
+        self.connection = connection.sock
+        self.rfile = connection.rfile
+        self.wfile = connection.wfile
+
+    def handle(self):
+        self.close_connection = True
+        try:
+            self.handle_one_request()
+        except (socket.error, socket.timeout) as e:
+            self.close_connection = True
+            self.connection_dropped(e)
+
+    def finish(self):
+        if not self.wfile.closed:
+            try:
+                self.wfile.flush()
+            except socket.error:
+                self.close_connection = True
+
+
+class _SocketWriter(io.BufferedIOBase):
+    # every write is sent at once, like the unbuffered wfile of the request handlers
+
+    def __init__(self, sock):
+        self._sock = sock
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._sock.sendall(data)
+        return len(data)
+
+
+class _Connection(object):
+    def __init__(self, sock, client_address, timeout):
+        self.sock = sock
+        self.client_address = client_address
+        self.timeout = timeout
+        sock.settimeout(timeout)
+        self.rfile = sock.makefile('rb', -1)
+        self.wfile = _SocketWriter(sock)
+        self.idle_since = time.time()
+
+    def fileno(self):
+        return self.sock.fileno()
+
+    def has_buffered_request(self):
+        '''
+            Whether the next request was already read into the buffer, a pipelining client sends it
+            without waiting for the response and the socket is not readable any more.
+        '''
+        peek = getattr(self.rfile, 'peek', None)
+        if peek is None:
+            # the socket file of python 2
+            return self.rfile._rbuf.tell() > 0
+        self.sock.setblocking(False)
+        try:
+            return len(peek(1)) > 0
+        except socket.error:
+            return False
+        finally:
+            self.sock.settimeout(self.timeout)
+
+    def is_closed_by_peer(self):
+        '''
+            Whether the readable socket only holds the end of the connection, it needs no worker.
+        '''
+        self.sock.setblocking(False)
+        try:
+            return not self.sock.recv(1, socket.MSG_PEEK)
+        except socket.error as e:
+            return e.args[0] not in (errno.EAGAIN, errno.EWOULDBLOCK)
+        finally:
+            self.sock.settimeout(self.timeout)
+
+    def close(self):
+        for f in (self.wfile, self.rfile):
+            try:
+                f.close()
+            except socket.error:
+                pass
+        try:
+            self.sock.shutdown(socket.SHUT_WR)
+        except socket.error:
+            pass
+        self.sock.close()
+
+
+class PooledWSGIServer(BaseWSGIServer):
+    '''
+        WSGI server handling the requests on a fixed number of worker threads instead of one new
+        thread per connection. A worker holds a connection only while one of its requests is handled.
+        The connections waiting for a request, new or kept alive, are watched by one thread with select,
+        an idle connection is closed after `keep_alive_timeout` seconds. A connection with a request
+        waits in a queue of `backlog` connections, when it is full the request is answered with 503 at once.
+    '''
+
+    multithread = True
+    keep_alive_timeout = 5
+    # the idle connections above this are closed, select can not watch an unlimited number of sockets
+    max_idle = 512
+
+    def __init__(self, host, port, app, workers=32, backlog=64):
+        BaseWSGIServer.__init__(self, host, port, app, handler=KeepAliveRequestHandler)
+        self.workers = workers
+        self._connections = queue.Queue(backlog)
+        self._idle = set()
+        self._idle_lock = threading.Lock()
+        self._closed = False
+        # wakes the watcher up when a connection becomes idle, python 2 on Windows has no socketpair
+        self._wakeup = socket.socketpair() if hasattr(socket, 'socketpair') else None
+        watcher = threading.Thread(target=self._watch)
+        watcher.daemon = True
+        watcher.start()
+        for _ in range(workers):
+            self._start_worker()
+
+    def process_request(self, request, client_address):
+        self._park(_Connection(request, client_address, self.keep_alive_timeout))
+
+    def server_close(self):
+        self._closed = True
+        self._wake()
+        BaseWSGIServer.server_close(self)
+
+    def _start_worker(self):
+        worker = threading.Thread(target=self._work)
+        worker.daemon = True
+        worker.start()
+
+    def _work(self):
+        _worker.server = self
+        _worker.detached = False
+        while not _worker.detached:
+            connection = self._connections.get()
+            try:
+                keep_alive = self._handle(connection)
+            except Exception:
+                self.handle_error(connection.sock, connection.client_address)
+                keep_alive = False
+            if keep_alive:
+                self._park(connection)
+            else:
+                connection.close()
+
+    def _handle(self, connection):
+        while True:
+            handler = self.RequestHandlerClass(connection, connection.client_address, self)
+            if handler.close_connection:
+                return False
+            if not connection.has_buffered_request():
+                return True
+
+    def _park(self, connection):
+        with self._idle_lock:
+            if self._closed or len(self._idle) >= self.max_idle:
+                connection.close()
+                return
+            connection.idle_since = time.time()
+            self._idle.add(connection)
+        self._wake()
+
+    def _wake(self):
+        if self._wakeup:
+            try:
+                self._wakeup[1].send(b'x')
+            except socket.error:
+                pass
+
+    def _watch(self):
+        while not self._closed:
+            with self._idle_lock:
+                idle = list(self._idle)
+            watched = idle + ([self._wakeup[0]] if self._wakeup else [])
+            timeout = 1 if self._wakeup else 0.05
+            try:
+                readable = select.select(watched, [], [], timeout)[0]
+            except (select.error, ValueError, socket.error):
+                # a connection was closed meanwhile, the next round drops it
+                readable = []
+
+            expired = time.time() - self.keep_alive_timeout
+            with self._idle_lock:
+                for connection in idle:
+                    if connection in readable:
+                        self._idle.discard(connection)
+                        if connection.is_closed_by_peer():
+                            connection.close()
+                        else:
+                            self._dispatch(connection)
+                    elif connection.idle_since < expired:
+                        self._idle.discard(connection)
+                        connection.close()
+            if self._wakeup and self._wakeup[0] in readable:
+                self._wakeup[0].recv(4096)
+
+        with self._idle_lock:
+            for connection in self._idle:
+                connection.close()
+            self._idle.clear()
+
+    def _dispatch(self, connection):
+        try:
+            self._connections.put_nowait(connection)
+        except queue.Full:
+            self._reject(connection.sock)
+            connection.close()
+
+    @staticmethod
+    def _reject(request):
+        body = json.dumps({'errorMessage': 'Server is busy, too many connections'}).encode('utf-8')
+        head = 'HTTP/1.1 503 Service Unavailable\r\nContent-Type: application/json\r\nContent-Length: %d\r\n' \
+               'Retry-After: 1\r\nConnection: close\r\n\r\n' % len(body)
+        try:
+            request.sendall(head.encode('utf-8') + body)
+        except Exception:
+            pass
+
+
+def detach_worker():
+    '''
+        Called by a request about to wait outside of the server, like for a concurrency limit. Another worker
+        takes the place of the current one, which ends after the request, so the waiting requests do not
+        take the workers of the other requests.
+    '''
+    server = getattr(_worker, 'server', None)
+    if server is not None and not _worker.detached:
+        _worker.detached = True
+        server._start_worker()
+
+
+class ConcurrencyLimit(object):
+    '''
+        Concurrency limit of a function, like the reserved concurrency of SCF. At most `limit`
+        requests run at the same time, at most `queue_size` more wait for `timeout` seconds,
+        the other requests are rejected.
+    '''
+
+    def __init__(self, limit, queue_size=0, timeout=30):
+        self.limit = limit
+        self.queue_size = queue_size
+        self.timeout = timeout
+        self._running = 0
+        self._waiting = 0
+        self._cond = threading.Condition()
+
+    def acquire(self):
+        '''
+            Return False if the request is rejected, otherwise release must be called after it.
+        '''
+        with self._cond:
+            if self._running >= self.limit:
+                if self._waiting >= self.queue_size:
+                    return False
+                self._waiting += 1
+                detach_worker()
+                try:
+                    deadline = time.time() + self.timeout
+                    while self._running >= self.limit:
+                        remaining = deadline - time.time()
+                        if remaining <= 0:
+                            return False
+                        self._cond.wait(remaining)
+                finally:
+                    self._waiting -= 1
+            self._running += 1
+            return True
+
+    def release(self):
+        with self._cond:
+            self._running -= 1
+            self._cond.notify()
@@ -33,6 +33,12 @@ def attach(docker_client, container, stdout=True, stderr=True, logs=False):
     return _read_socket(socket)
 
 
+def exec_attach(docker_client, exec_id):
+    socket = docker_client.api.exec_start(exec_id, socket=True)
+
+    return _read_socket(socket)
+
+
 def _read_socket(socket):
     while True:
 
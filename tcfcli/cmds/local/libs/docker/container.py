@@ -2,7 +2,7 @@
 
 import docker
 from .utils import to_posix_path
-from .attach_api import attach
+from .attach_api import attach, exec_attach
 
 
 class Container(object):
@@ -31,6 +31,7 @@ class Container(object):
         self._ports = ports
         self._entrypoint = entrypoint
         self._network_id = network_id
+        self._additional_volumes = additional_volumes or {}
 
         self._docker_client = docker_client or docker.from_env()
         self.id = None
@@ -50,6 +51,7 @@ class Container(object):
             },
             "tty": False
         }
+        kwargs["volumes"].update(self._additional_volumes)
 
         kwargs["volumes"] = {to_posix_path(host_dir): mount for host_dir, mount in kwargs["volumes"].items()}
 
@@ -116,6 +118,20 @@ class Container(object):
 
         self._write_container_output(logs_itr, stdout=stdout, stderr=stderr)
 
+    def exec_run(self, cmd, env_vars=None, stdout=None, stderr=None):
+        """
+        Run the command in the running container, write its output and return its exit code
+        """
+        if not self.is_exist():
+            raise Exception('can not exec, container does not exist')
+
+        api_client = self._docker_client.api
+        exec_id = api_client.exec_create(self.id, cmd, stdout=True, stderr=True, environment=env_vars)['Id']
+
+        self._write_container_output(exec_attach(self._docker_client, exec_id), stdout=stdout, stderr=stderr)
+
+        return api_client.exec_inspect(exec_id).get('ExitCode')
+
     @staticmethod
     def _write_container_output(output_itr, stdout=None, stderr=None):
         for frame_type, data in output_itr:
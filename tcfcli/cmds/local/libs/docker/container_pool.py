@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+
+import time
+import threading
+
+
+class ContainerPool(object):
+    '''
+        Idle runtime containers kept alive between the invocations of the same function.
+        A pooled container runs KEEP_ALIVE_ENTRYPOINT instead of the runtime, the invocations are
+        executed in it by `docker exec`. At most `max_size` idle containers are kept per key, an idle
+        container is removed after `idle_ttl` seconds.
+    '''
+    KEEP_ALIVE_ENTRYPOINT = ["/bin/sh", "-c", "trap 'exit 0' TERM; while true; do sleep 1; done"]
+
+    def __init__(self, max_size=2, idle_ttl=300):
+        self.max_size = max_size
+        self.idle_ttl = idle_ttl
+        self._idle = {}
+        self._lock = threading.Lock()
+        self._closed = threading.Event()
+        self._reaper = None
+
+    def acquire(self, key):
+        '''
+            Return an idle container of the key, None if there is none.
+        '''
+        self._remove_expired()
+        with self._lock:
+            idle = self._idle.get(key)
+            if idle:
+                container, _ = idle.pop()
+                return container
+        return None
+
+    def release(self, key, container):
+        '''
+            Give back the container after an invocation, it is removed if the pool of the key is full.
+        '''
+        if not container.is_exist():
+            return
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if not self._closed.is_set() and len(idle) < self.max_size:
+                idle.append((container, time.time()))
+                self._start_reaper()
+                return
+        container.delete()
+
+    def close(self):
+        self._closed.set()
+        with self._lock:
+            containers = [c for idle in self._idle.values() for c, _ in idle]
+            self._idle = {}
+        for container in containers:
+            container.delete()
+
+    def _remove_expired(self):
+        expired = []
+        deadline = time.time() - self.idle_ttl
+        with self._lock:
+            for key, idle in self._idle.items():
+                expired.extend([c for c, last_used in idle if last_used < deadline])
+                idle[:] = [(c, last_used) for c, last_used in idle if last_used >= deadline]
+        for container in expired:
+            container.delete()
+
+    def _start_reaper(self):
+        if self._reaper is not None:
+            return
+
+        def reap():
+            while not self._closed.wait(min(self.idle_ttl, 10)):
+                self._remove_expired()
+
+        self._reaper = threading.Thread(target=reap)
+        self._reaper.daemon = True
+        self._reaper.start()
@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+
+import io
+import os
+import json
+import time
+import threading
+
+home = os.path.expanduser('~')
+_IMAGE_CACHE_FILE = home + '/.tcli_image_cache.json'
+
+
+class ImageCache(object):
+    '''
+        Freshness of the runtime images, the id of the local image and the time the registry was
+        last checked are recorded per image tag. The registry is not checked again within `ttl`
+        seconds as long as the local image is still the one recorded.
+    '''
+    DEFAULT_TTL = 24 * 3600
+
+    def __init__(self, ttl=DEFAULT_TTL, cache_file=_IMAGE_CACHE_FILE):
+        self.ttl = ttl
+        self._cache_file = cache_file
+        self._lock = threading.Lock()
+        self._images = self._load()
+
+    def is_fresh(self, image, image_id):
+        with self._lock:
+            record = self._images.get(image)
+        if not record or not image_id or record.get("id") != image_id:
+            return False
+        return time.time() - record.get("checked", 0) < self.ttl
+
+    def record(self, image, image_id):
+        with self._lock:
+            # merged with the file, other scf processes may have recorded images meanwhile
+            self._images.update(self._load())
+            self._images[image] = {"id": image_id, "checked": time.time()}
+            self._dump()
+
+    def _load(self):
+        try:
+            with io.open(self._cache_file, mode="r", encoding="utf-8") as f:
+                return json.load(f)
+        except Exception:
+            return {}
+
+    def _dump(self):
+        try:
+            with open(self._cache_file, "w") as f:
+                f.write(json.dumps(self._images, indent=2))
+        except Exception:
+            pass
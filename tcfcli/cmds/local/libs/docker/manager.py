@@ -2,34 +2,47 @@
 
 import docker
 import click
+import threading
+from .image_cache import ImageCache
 
 
 class ContainerManager(object):
     def __init__(self,
                  docker_network_id=None,
                  skip_pull_image=False,
-                 is_quiet=False):
+                 is_quiet=False,
+                 pull_ttl=ImageCache.DEFAULT_TTL,
+                 docker_client=None):
 
         self._docker_network_id = docker_network_id
         self._skip_pull_image = skip_pull_image
-        self._docker_client = docker.from_env()
+        self._docker_client = docker_client or docker.from_env()
+        self._image_cache = ImageCache(pull_ttl)
+        self._pull_lock = threading.Lock()
 
         self._is_quiet = is_quiet
 
     def run(self, container):
         image = container.image
 
-        if not self.has_image(image) or not self._skip_pull_image:
-            self.pull_image(image)
-        else:
+        if self._skip_pull_image and self.has_image(image):
             if not self._is_quiet:
                 click.secho('skip pull image %s' % image)
+        elif not self._image_cache.is_fresh(image, self.get_image_id(image)):
+            with self._pull_lock:
+                # the image may have been pulled by a concurrent invocation meanwhile
+                if not self._image_cache.is_fresh(image, self.get_image_id(image)):
+                    self.pull_image(image)
 
         if not container.is_exist():
             container.create()
 
         container.start()
 
+    @property
+    def docker_client(self):
+        return self._docker_client
+
     def stop(self, container):
         pass
 
@@ -45,9 +58,17 @@ class ContainerManager(object):
         except docker.errors.APIError as e:
             raise Exception('pull the docker image %s failed, %s' % (image, str(e)))
 
+        self._image_cache.record(image, self.get_image_id(image))
+
+    def get_entrypoint(self, image):
+        config = self._docker_client.images.get(image).attrs.get('Config') or {}
+        return list(config.get('Entrypoint') or [])
+
     def has_image(self, image):
+        return self.get_image_id(image) is not None
+
+    def get_image_id(self, image):
         try:
-            self._docker_client.images.get(image)
-            return True
+            return self._docker_client.images.get(image).id
         except docker.errors.ImageNotFound:
-            return False
+            return None
@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+
+import os
+import shutil
+import hashlib
+import zipfile
+import tempfile
+import threading
+
+home = os.path.expanduser('~')
+_CODE_CACHE_DIR = home + '/.tcli_code_cache'
+
+_MB = 1024 * 1024
+
+
+class CodeCache(object):
+    '''
+        Extracted zip CodeUri shared by the invocations, the archive is extracted once into a
+        directory named after its content hash and mounted read-only by all the containers.
+        The hash is only computed again when the path, size or mtime of the archive changes.
+        The least recently used directories are removed when the cache grows over `budget` bytes,
+        except the ones used by this process, which may still be mounted by warm containers.
+    '''
+    DEFAULT_BUDGET = 1024 * _MB
+    HASH_BLOCK = 1024 * 1024
+
+    def __init__(self, root=_CODE_CACHE_DIR, budget=DEFAULT_BUDGET):
+        self._root = root
+        self._budget = budget
+        self._hashes = {}
+        self._used = set()
+        self._lock = threading.Lock()
+
+    def get(self, archive):
+        '''
+            Return the directory of the extracted archive, extracting it if it is not cached yet.
+        '''
+        digest = self._hash(archive)
+        target = os.path.join(self._root, digest)
+        with self._lock:
+            self._used.add(digest)
+            if not os.path.isdir(target):
+                self._extract(archive, target)
+                self._evict()
+            else:
+                # the mtime of the directory tells which entries were used last
+                os.utime(target, None)
+        return os.path.realpath(target)
+
+    def _hash(self, archive):
+        st = os.stat(archive)
+        key = (os.path.abspath(archive), st.st_size, st.st_mtime)
+        digest = self._hashes.get(key)
+        if digest is None:
+            sha = hashlib.sha256()
+            with open(archive, 'rb') as f:
+                for block in iter(lambda: f.read(self.HASH_BLOCK), b''):
+                    sha.update(block)
+            digest = sha.hexdigest()
+            self._hashes[key] = digest
+        return digest
+
+    def _extract(self, archive, target):
+        if not os.path.isdir(self._root):
+            os.makedirs(self._root)
+
+        # extracted aside then renamed, another scf process never sees a partial directory
+        tmp_dir = tempfile.mkdtemp(dir=self._root, prefix='.tmp-')
+        try:
+            if os.name == 'posix':
+                os.chmod(tmp_dir, 0o755)
+            with zipfile.ZipFile(archive, 'r') as f:
+                f.extractall(tmp_dir)
+            os.rename(tmp_dir, target)
+        except OSError:
+            # extracted by another process meanwhile
+            if not os.path.isdir(target):
+                raise
+        finally:
+            if os.path.isdir(tmp_dir):
+                shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    def _evict(self):
+        entries = []
+        for name in os.listdir(self._root):
+            path = os.path.join(self._root, name)
+            if name.startswith('.') or not os.path.isdir(path):
+                continue
+            entries.append((os.path.getmtime(path), self._size(path), name))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, name in sorted(entries):
+            if total <= self._budget:
+                break
+            if name in self._used:
+                continue
+            shutil.rmtree(os.path.join(self._root, name), ignore_errors=True)
+            total -= size
+
+    @staticmethod
+    def _size(path):
+        size = 0
+        for root, _, files in os.walk(path):
+            for name in files:
+                try:
+                    size += os.path.getsize(os.path.join(root, name))
+                except OSError:
+                    pass
+        return size
@@ -38,13 +38,16 @@ class LocalRuntime(object):
 
     _thread_err_msg = ""
 
-    def __init__(self, func_config, env_vars=None, cwd=None, debug_options=None, container_manager=None, is_quiet=None):
+    def __init__(self, func_config, env_vars=None, cwd=None, debug_options=None, container_manager=None, is_quiet=None,
+                 container_pool=None, code_cache=None):
         self._func_config = func_config
         self._env_vars = env_vars
         self._cwd = cwd
         self._debug_options = debug_options
         self._container_manager = container_manager
         self._is_quiet = is_quiet
+        self._container_pool = container_pool
+        self._code_cache = code_cache
 
         self._thread_err_msg = ""
 
@@ -55,6 +58,18 @@ class LocalRuntime(object):
         self._container = None
 
     def invoke(self, event=None, stdout=None, stderr=None):
+        """
+        Run the function with the event, return True if it ran in a warm pooled container
+        """
+        # an archive is only extracted once for the warm containers when it is cached
+        if self._container_pool is not None and not self._debug_options and \
+                (self._code_cache is not None or not self._is_archive(self.get_code_abs_path())):
+            return self._invoke_pooled(event, stdout, stderr)
+
+        self._invoke_once(event, stdout, stderr)
+        return False
+
+    def _invoke_once(self, event=None, stdout=None, stderr=None):
         image = self.get_image()
         cmd = [self.get_handler()]
         code_abs_path = self.get_code_abs_path()
@@ -73,7 +88,8 @@ class LocalRuntime(object):
                                         mem=memory,
                                         env_vars=envs,
                                         entrypoint=entry,
-                                        ports=ports)
+                                        ports=ports,
+                                        docker_client=self._container_manager.docker_client)
 
             try:
                 self._container_manager.run(self._container)
@@ -96,12 +112,75 @@ class LocalRuntime(object):
             if self._thread_err_msg != "":
                 raise TimeoutException(self._thread_err_msg)
 
+    def _invoke_pooled(self, event=None, stdout=None, stderr=None):
+        # the pooled container is shared by the invocations with the same configuration,
+        # the event is only passed to the `docker exec` of each invocation
+        image = self.get_image()
+        code_dir = self.get_code_abs_path()
+        if self._is_archive(code_dir):
+            code_dir = self._code_cache.get(code_dir)
+        memory = self.get_memory()
+        envs = self.get_envs()
+        key = (self.get_func_name(), image, code_dir, memory, json.dumps(envs, sort_keys=True))
+        timer = None
+
+        self._container = self._container_pool.acquire(key)
+        warm = self._container is not None
+        try:
+            if not warm:
+                self._container = Container(image=image,
+                                            cmd=[],
+                                            work_dir=self._WORK_DIR,
+                                            host_dir=code_dir,
+                                            mem=memory,
+                                            env_vars=envs,
+                                            entrypoint=self._container_pool.KEEP_ALIVE_ENTRYPOINT,
+                                            docker_client=self._container_manager.docker_client)
+                self._container_manager.run(self._container)
+
+            cmd = self._container_manager.get_entrypoint(image) + [self.get_handler()]
+            timer = self._wait_timeout(self._container, self.get_timeout())
+
+            self._container.exec_run(cmd, env_vars={'SCF_EVENT_BODY': event} if event else None,
+                                     stdout=stdout, stderr=stderr)
+
+        except KeyboardInterrupt:
+            click.secho('Abort function execution')
+            self._discard_container()
+        except Exception as err:
+            click.secho('Invoke Failed.', fg="red")
+            self._discard_container()
+            raise InvokeException('Invoke error:%s' % str(err))
+
+        finally:
+            if timer:
+                timer.cancel()
+            # a timed out or failed container has been removed, it is not given back to the pool
+            if self._container:
+                self._container_pool.release(key, self._container)
+
+        if self._thread_err_msg != "":
+            raise TimeoutException(self._thread_err_msg)
+
+        return warm
+
+    def _discard_container(self):
+        if self._container:
+            self._container.delete()
+
     def get_func_name(self):
         return self._func_config.name
 
     def get_image(self):
-        runtime = self.get_runtime()
-        return '%s:%s' % (self._BASE_IMAGE_NAME, runtime)
+        return self.runtime_image(self.get_runtime())
+
+    @classmethod
+    def runtime_image(cls, runtime):
+        return '%s:%s' % (cls._BASE_IMAGE_NAME, runtime)
+
+    @classmethod
+    def runtimes(cls):
+        return list(cls._RUNTIME_LIST)
 
     def get_runtime(self):
         return self._func_config.runtime.lower()
@@ -240,12 +319,17 @@ class LocalRuntime(object):
 
         return res
 
+    def _is_archive(self, code_abs_path):
+        return os.path.isfile(code_abs_path) and code_abs_path.endswith(self._ARCHIVE_FORMATS)
+
     @contextmanager
     def _get_code(self, code_abs_path):
         tmp_code_path = None
 
         try:
-            if os.path.isfile(code_abs_path) and code_abs_path.endswith(self._ARCHIVE_FORMATS):
+            if self._is_archive(code_abs_path) and self._code_cache is not None:
+                yield self._code_cache.get(code_abs_path)
+            elif self._is_archive(code_abs_path):
                 tmp_code_path = self._get_tmp_code_path(code_abs_path)
                 yield tmp_code_path
             else:
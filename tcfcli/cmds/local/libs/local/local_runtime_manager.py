@@ -1,7 +1,11 @@
 # -*- coding: utf-8 -*-
 
+import click
 from tcfcli.cmds.local.libs.docker.manager import ContainerManager
+from tcfcli.cmds.local.libs.docker.container_pool import ContainerPool
+from tcfcli.cmds.local.libs.docker.image_cache import ImageCache
 from tcfcli.cmds.local.libs.local.local_runtime import LocalRuntime
+from tcfcli.cmds.local.libs.local.code_cache import CodeCache
 from tcfcli.common.user_exceptions import FunctionNotFound
 
 
@@ -14,7 +18,12 @@ class LocalRuntimeManager(object):
                  region=None,
                  docker_network_id=None,
                  skip_pull_image=False,
-                 is_quiet=False):
+                 pull_ttl=ImageCache.DEFAULT_TTL,
+                 is_quiet=False,
+                 warm_containers=0,
+                 warm_idle_ttl=300,
+                 docker_client=None,
+                 show_start=True):
 
         self._provider = function_provider
         self._cwd = cwd
@@ -22,8 +31,12 @@ class LocalRuntimeManager(object):
         self._region = region
         self._debug_context = debug_context
         self._is_quiet = is_quiet
+        self._show_start = show_start and not is_quiet
 
-        self._container_manager = ContainerManager(docker_network_id, skip_pull_image, is_quiet)
+        self._container_manager = ContainerManager(docker_network_id, skip_pull_image, is_quiet, pull_ttl,
+                                                   docker_client)
+        self._container_pool = ContainerPool(warm_containers, warm_idle_ttl) if warm_containers else None
+        self._code_cache = CodeCache()
 
     def invoke(self, func_name, event=None, stdout=None, stderr=None):
         local_runtime = LocalRuntime(func_config=self._get_func_config(func_name),
@@ -31,9 +44,18 @@ class LocalRuntimeManager(object):
                                      cwd=self._cwd,
                                      debug_options=self.debug_options,
                                      container_manager=self._container_manager,
-                                     is_quiet=self._is_quiet)
+                                     is_quiet=self._is_quiet,
+                                     container_pool=self._container_pool,
+                                     code_cache=self._code_cache)
 
-        local_runtime.invoke(event, stdout=stdout, stderr=stderr)
+        warm = local_runtime.invoke(event, stdout=stdout, stderr=stderr)
+        if self._show_start:
+            click.secho('%s start of function "%s"' % ('Warm' if warm else 'Cold', func_name), fg="cyan", err=True)
+        return warm
+
+    def close(self):
+        if self._container_pool is not None:
+            self._container_pool.close()
 
     def _get_func_config(self, func_name):
         func_config = self._provider.get(func_name)
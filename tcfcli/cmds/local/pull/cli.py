@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+
+import time
+import click
+import docker
+from multiprocessing.pool import ThreadPool
+from tcfcli.common.operation_msg import Operation
+from tcfcli.common.user_exceptions import UserException
+from tcfcli.cmds.local.common.invoke_context import InvokeContext
+from tcfcli.cmds.local.libs.docker.manager import ContainerManager
+from tcfcli.cmds.local.libs.local.local_runtime import LocalRuntime
+from tcfcli.help.message import LocalHelp as help
+
+POOL_SIZE = 4
+
+
+@click.command(short_help=help.PULL_SHORT_HELP)
+@click.option('--runtime', '-r', multiple=True, type=click.Choice(LocalRuntime.runtimes()), help=help.PULL_RUNTIME)
+def pull(runtime):
+    '''
+    \b
+    Pull the docker images of the SCF runtimes ahead of time, the local invocations
+    then use them without checking the registry until --pull-ttl expires.
+    \b
+    Common usage:
+        \b
+        * Refresh the images of all the runtimes
+          $ scf local pull
+        \b
+        * Refresh the image of a runtime
+          $ scf local pull -r python3.6
+    '''
+    Pull.do_cli(runtime)
+
+
+class Pull(object):
+    @staticmethod
+    def do_cli(runtimes):
+        docker_client = docker.from_env()
+        InvokeContext._check_docker(docker_client)
+
+        images = [LocalRuntime.runtime_image(r) for r in (runtimes or LocalRuntime.runtimes())]
+        manager = ContainerManager(is_quiet=True, docker_client=docker_client)
+
+        def pull_image(image):
+            start = time.time()
+            try:
+                manager.pull_image(image)
+                return image, time.time() - start, None
+            except Exception as e:
+                return image, time.time() - start, e
+
+        Operation("Pulling %d runtime images..." % len(images)).process()
+        failed = 0
+        pool = ThreadPool(min(POOL_SIZE, len(images)))
+        try:
+            for image, seconds, err in pool.imap_unordered(pull_image, images):
+                if err:
+                    failed += 1
+                    Operation("Pull %s failed: %s" % (image, str(err))).warning()
+                else:
+                    Operation("Pull %s success (%.1fs)" % (image, seconds)).success()
+        finally:
+            pool.terminate()
+
+        if failed:
+            raise UserException("%d of %d runtime images failed to pull" % (failed, len(images)))
@@ -2,6 +2,18 @@ import click
 from tcfcli.cmds.local.common.options import invoke_common_options, service_common_options
 from tcfcli.cmds.local.common.invoke_context import InvokeContext
 from tcfcli.cmds.local.libs.apigw.api_service import LocalApiService
+from tcfcli.common.user_exceptions import ArgsException
+from tcfcli.help.message import LocalHelp as help
+
+
+def parse_function_concurrency(ctx, param, values):
+    limits = {}
+    for value in values:
+        name, _, limit = value.rpartition('=')
+        if not name or not limit.isdigit() or int(limit) <= 0:
+            raise ArgsException("The function concurrency must be like 'FunctionName=4', not '%s'" % value)
+        limits[name] = int(limit)
+    return limits
 
 
 @click.command(short_help='Set up a local service to simulate invoke by API event')
@@ -10,16 +22,27 @@ from tcfcli.cmds.local.libs.apigw.api_service import LocalApiService
               default="public",
               help="Any static assets (e.g. CSS/Javascript/HTML) files located in this directory "
                    "will be presented at /")
+@click.option('--warm-containers', type=int, default=2, show_default=True, help=help.WARM_CONTAINERS)
+@click.option('--warm-idle-ttl', type=int, default=300, show_default=True, help=help.WARM_IDLE_TTL)
+@click.option('--workers', type=click.IntRange(1), default=32, show_default=True, help=help.START_API_WORKERS)
+@click.option('--concurrency', type=click.IntRange(1), default=4, show_default=True, help=help.START_API_CONCURRENCY)
+@click.option('--function-concurrency', multiple=True, callback=parse_function_concurrency,
+              help=help.START_API_FUNCTION_CONCURRENCY)
+@click.option('--queue-size', type=click.IntRange(0), default=16, show_default=True, help=help.START_API_QUEUE_SIZE)
 @invoke_common_options
-def start_api(host, port, static_dir, template, env_vars, debug_port, debug_args, debugger_path,
-              docker_volume_basedir, docker_network, log_file, skip_pull_image, region):
+def start_api(host, port, static_dir, warm_containers, warm_idle_ttl, workers, concurrency, function_concurrency,
+              queue_size, template, env_vars, debug_port, debug_args, debugger_path, docker_volume_basedir,
+              docker_network, log_file, skip_pull_image, pull_ttl, region):
 
     do_start_api(host, port, static_dir, template, env_vars, debug_port, debug_args, debugger_path,
-                 docker_volume_basedir, docker_network, log_file, skip_pull_image, region)
+                 docker_volume_basedir, docker_network, log_file, skip_pull_image, pull_ttl, region,
+                 warm_containers, warm_idle_ttl, workers, concurrency, function_concurrency, queue_size)
 
 
 def do_start_api(host, port, static_dir, template, env_vars, debug_port, debug_args, debugger_path,
-                 docker_volume_basedir, docker_network, log_file, skip_pull_image, region):
+                 docker_volume_basedir, docker_network, log_file, skip_pull_image, pull_ttl, region,
+                 warm_containers=0, warm_idle_ttl=300, workers=32, concurrency=4, function_concurrency=None,
+                 queue_size=16):
 
     with InvokeContext(template_file=template,
                        function_identifier=None,
@@ -31,6 +54,11 @@ def do_start_api(host, port, static_dir, template, env_vars, debug_port, debug_a
                        docker_network=docker_network,
                        log_file=log_file,
                        skip_pull_image=skip_pull_image,
-                       region=region) as context:
+                       pull_ttl=pull_ttl,
+                       region=region,
+                       warm_containers=warm_containers,
+                       warm_idle_ttl=warm_idle_ttl) as context:
 
-        LocalApiService(invoke_context=context, port=port, host=host, static_dir=static_dir).start()
+        LocalApiService(invoke_context=context, port=port, host=host, static_dir=static_dir, workers=workers,
+                        concurrency=concurrency, function_concurrency=function_concurrency,
+                        queue_size=queue_size).start()
@@ -9,6 +9,10 @@ from tcfcli.common.user_exceptions import *
 from tcfcli.common.template import Template
 from tcfcli.common.user_exceptions import InvalidEnvParameters
 from tcfcli.common.scf_client.scf_log_client import ScfLogClient
+from tcfcli.common.user_config import UserConfig
+from tcfcli.libs.utils.inventory import FunctionInventory
+from tcfcli.libs.utils.log_cache import LogCache, LogFilter
+from tcfcli.libs.utils.log_export import LogExporter
 from tcfcli.common.tcsam.tcsam_macro import TcSamMacro as tsmacro
 from tcfcli.help.message import LogsHelp as help
 
@@ -26,7 +30,16 @@ REGIONS = infor.REGIONS
 @click.option('-d', '--duration', type=int, default=None, help=help.DURATION)
 @click.option('-f', '--failed', is_flag=True, default=False, help=help.FAILED)
 @click.option('-t', '--tail', is_flag=True, default=False, help=help.TAIL)
-def logs(name, namespace, region, count, start_time, end_time, duration, failed, tail):
+@click.option('--grep', type=str, default=None, help=help.GREP)
+@click.option('--ret-code', type=int, default=None, help=help.RET_CODE)
+@click.option('--min-duration', type=float, default=None, help=help.MIN_DURATION)
+@click.option('--no-cache', is_flag=True, default=False, help=help.NO_CACHE)
+@click.option('--offline', is_flag=True, default=False, help=help.OFFLINE)
+@click.option('--stats', is_flag=True, default=False, help=help.STATS)
+@click.option('-o', '--output', type=click.Path(dir_okay=False), default=None, help=help.OUTPUT)
+@click.option('--all', 'all_functions', is_flag=True, default=False, help=help.ALL)
+def logs(name, namespace, region, count, start_time, end_time, duration, failed, tail, grep, ret_code, min_duration,
+         no_cache, offline, stats, output, all_functions):
     """
     \b
     Scf cli can use the logs command to view historical or real-time logs generated by cloud functions.
@@ -50,12 +63,36 @@ def logs(name, namespace, region, count, start_time, end_time, duration, failed,
         \b
         * Specify region of service
           $ scf logs -n function --region ap-guangzhou
+        \b
+        * Search the cached logs of the last hour without calling the API
+          $ scf logs -n function -d 3600 --offline --grep Timeout --min-duration 1000
+        \b
+        * Summarize the duration, memory, errors and cost of the invocations of the last day
+          $ scf logs -n function -d 86400 --stats
+        \b
+        * Export the logs of the last day as compressed JSON lines
+          $ scf logs -n function -d 86400 --output logs.jsonl.gz
+        \b
+        * Follow the logs of several functions merged in time order
+          $ scf logs -n gateway,orders,payment --tail
+          $ scf logs --all --tail
     """
 
     if region and region not in REGIONS:
         raise ArgsException("The region must in %s." % (", ".join(REGIONS)))
     else:
-        if name is None:
+        if all_functions:
+            if name:
+                raise InvalidEnvParameters("--all is conflict with --name")
+            functions = _template_functions()
+            if not functions:
+                raise InvalidEnvParameters("There is no function in template.yaml")
+        elif name and "," in name:
+            functions = [(namespace, n.strip()) for n in name.split(",") if n.strip()]
+        else:
+            functions = []
+
+        if name is None and not functions:
             try:
                 template_data = tcsam.tcsam_validate(Template.get_template_data("template.yaml"))
                 resource = template_data.get(tsmacro.Resources, {})
@@ -75,12 +112,32 @@ def logs(name, namespace, region, count, start_time, end_time, duration, failed,
             except:
                 raise InvalidEnvParameters("Function name is unspecif")
 
-        if name is None:
+        if name is None and not functions:
             raise InvalidEnvParameters("Function name is unspecif")
+        if not functions:
+            functions = [(namespace, name)]
+
+        inventory = FunctionInventory()
+        try:
+            for ns, func in functions:
+                if inventory.exists(region if region else UserConfig().region, ns, func) is False:
+                    raise InvalidEnvParameters("Function '{}' not exists in namespace '{}'. If it was created just "
+                                               "now, sync the inventory by 'scf list --refresh'".format(func, ns))
+        finally:
+            inventory.close()
+
+        if len(functions) > 1 and tail and count:
+            raise InvalidEnvParameters("--count with --tail only supports one function")
 
         if duration and (start_time or end_time):
             raise InvalidEnvParameters("Duration is conflict with (start_time, end_time)")
 
+        if offline and (tail or no_cache):
+            raise InvalidEnvParameters("--offline is conflict with --tail and --no-cache")
+
+        if stats and (tail or output):
+            raise InvalidEnvParameters("--stats is conflict with --tail and --output")
+
         if tail:
             start = datetime.now()
             end = start + timedelta(days=1)
@@ -89,14 +146,46 @@ def logs(name, namespace, region, count, start_time, end_time, duration, failed,
                 start = end - timedelta(days=1)
         else:
             start, end = _align_time(start_time, end_time, duration)
-        client = ScfLogClient(name, namespace, region, failed)
-        if tail and count:
-            client.fetch_log_tail_c(start.strftime(TM_FORMAT),
-                                    end.strftime(TM_FORMAT), count, tail)
-            return
-        if not count:
-            count = 10000  # cloudapi limit
-        client.fetch_log(start.strftime(TM_FORMAT), end.strftime(TM_FORMAT), count, tail)
+        # the time range queries go through the local log cache, only the uncached ranges are fetched
+        cache = None if tail or no_cache else LogCache()
+        log_filter = LogFilter(grep, ret_code, min_duration, failed)
+        clients = [ScfLogClient(func, ns, region, failed, log_filter, cache, offline) for ns, func in functions]
+        exporter = LogExporter(output) if output else None
+        try:
+            if tail and count:
+                clients[0].fetch_log_tail_c(start.strftime(TM_FORMAT),
+                                            end.strftime(TM_FORMAT), count,
+                                            exporter.sink(*functions[0]) if exporter else None)
+            elif tail and len(clients) > 1:
+                ScfLogClient.tail_log_many(clients, start.strftime(TM_FORMAT), 10000,
+                                           [exporter.sink(ns, func) for ns, func in functions] if exporter else None)
+            elif stats:
+                for client in clients:
+                    client.fetch_stats(start.strftime(TM_FORMAT), end.strftime(TM_FORMAT), count)
+            else:
+                if not count:
+                    count = 10000  # cloudapi limit
+                for client, (ns, func) in zip(clients, functions):
+                    if len(clients) > 1 and not exporter:
+                        Operation("Function: %s" % func).information()
+                    client.fetch_log(start.strftime(TM_FORMAT), end.strftime(TM_FORMAT), count, tail,
+                                     exporter.sink(ns, func) if exporter else None)
+        finally:
+            if cache:
+                cache.close()
+            if exporter:
+                exporter.close()
+        if exporter:
+            Operation("Export {} logs to '{}' success".format(exporter.count, output)).success()
+
+
+def _template_functions():
+    try:
+        template_data = tcsam.tcsam_validate(Template.get_template_data("template.yaml"))
+    except Exception:
+        raise InvalidEnvParameters("--all needs template.yaml in the current directory")
+    resource = template_data.get(tsmacro.Resources, {})
+    return [(ns, func) for ns in resource if resource[ns] for func in resource[ns] if func != tsmacro.Type]
 
 
 def _align_time(_start, _end, _offset):
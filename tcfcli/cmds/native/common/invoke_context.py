@@ -17,6 +17,7 @@ from tcfcli.common.file_util import FileUtil
 import tcfcli.common.base_infor as infor
 from tcfcli.common.user_config import UserConfig
 from tcfcli.common.operation_msg import Operation
+from tcfcli.cmds.native.common.result_channel import ResultChannel
 
 class InvokeContext(object):
     BOOTSTRAP_SUFFIX = {
@@ -48,6 +49,8 @@ class InvokeContext(object):
         self._debug_context = None
         self._env_file = env_file
         self._is_quiet = is_quiet
+        self._result_channel = None
+        self._result = None
 
         self._thread_err_msg = ""
 
@@ -99,10 +102,13 @@ class InvokeContext(object):
         #self._check_function_type(resource)
         self._runtime = Runtime(func.get(tsmacro.Properties, {}))
         self._debug_context = DebugContext(self._debug_port, self._debug_argv, self._runtime.runtime)
+        # the runtimes write the return value and the REPORT metrics of the invocation to it
+        self._result_channel = ResultChannel()
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        pass
+        if self._result_channel is not None:
+            self._result_channel.close()
 
     def invoke(self):
         def timeout_handle(child):
@@ -110,9 +116,13 @@ class InvokeContext(object):
             child.kill()
             self._thread_err_msg = 'Function "%s" timeout after %d seconds' % (self._function, self._runtime.timeout)
 
+        self._result = None
+        result_file = self._result_channel.new_file()
+        env = self.env
+        env.update(self._result_channel.env(result_file))
         try:
             click.secho("Run %s's cmd: %s" % (self._runtime.runtime, click.style(self.cmd, fg="green")))
-            child = subprocess.Popen(args=[self.cmd] + self.argv, env=self.env)
+            child = subprocess.Popen(args=[self.cmd] + self.argv, env=env)
         except OSError:
             click.secho("Execution Failed.", fg="red")
             raise UserException(
@@ -131,12 +141,19 @@ class InvokeContext(object):
             child.kill()
             click.secho("Recv a SIGINT, exit.")
         timer.cancel()
+        self._result = self._result_channel.read(result_file)
         if self._thread_err_msg != "":
             raise TimeoutException(self._thread_err_msg)
         if ret_code == 233:  # runtime not match
             raise UserException(
                 "Execution failed,confirm whether the program({}) is installed".format(self._runtime.runtime))
 
+    def get_result(self):
+        """
+        Return the record written by the runtime to the result file, None if it wrote none
+        """
+        return self._result
+
     @property
     def cmd(self):
         if self._debug_context.cmd is not None:
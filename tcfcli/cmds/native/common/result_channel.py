@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+
+import io
+import os
+import json
+import uuid
+import shutil
+import tempfile
+
+
+class ResultChannel(object):
+    '''
+        Directory of the result files of the native runtimes. A runtime given SCF_RESULT_FILE writes the
+        return value and the REPORT metrics of the invocation to that file instead of printing them, so they
+        are not taken from the end of stdout. `read` returns None when the runtime wrote no file.
+    '''
+
+    def __init__(self):
+        self.host_dir = tempfile.mkdtemp(prefix='scf-result-')
+
+    @staticmethod
+    def new_file():
+        return uuid.uuid4().hex + '.json'
+
+    def env(self, name):
+        return {'SCF_RESULT_FILE': os.path.join(self.host_dir, name)}
+
+    def read(self, name):
+        path = os.path.join(self.host_dir, name)
+        try:
+            with io.open(path, mode='r', encoding='utf-8') as f:
+                return json.load(f)
+        except (IOError, OSError, ValueError):
+            return None
+        finally:
+            if os.path.exists(path):
+                os.remove(path)
+
+    def close(self):
+        shutil.rmtree(self.host_dir, ignore_errors=True)
@@ -14,6 +14,8 @@ var GLOBAL_MEM_SIZE = process.env.SCF_FUNCTION_MEMORY_SIZE || '256';
 var GLOBAL_TIMEOUT = process.env.SCF_FUNCTION_TIMEOUT || '3';
 var GLOBAL_ENVIRON = process.env.SCF_FUNCTION_ENVIRON || '';
 var GLOBAL_IS_QUIET = (process.env.SCF_DISPLAY_IS_QUIET === 'True') || false;
+// the host reads the return value and the metrics from this file and prints them, nothing is taken from stdout
+var GLOBAL_RESULT_FILE = process.env.SCF_RESULT_FILE || '';
 
 var GLOBAL_REQUEST_ID =  uuid();
 var GLOBAL_START_TIME = process.hrtime();
@@ -73,6 +75,9 @@ module.exports = {
             result['stackTrace'] = stackTrace;
         }
 
+        if (writeResult(null, result)) {
+            return;
+        }
         reportDone("", errType=1);
         // console.dir(result);
         consoleLogErr(JSON.stringify(result));
@@ -99,7 +104,34 @@ function initContext() {
     return JSON.stringify(context)
 }
 
+// return true if the record was written, the host prints it then instead of the runtime
+function writeResult(result, error) {
+    if (!GLOBAL_RESULT_FILE) {
+        return false;
+    }
+
+    var diffMs = hrTimeMs(process.hrtime(GLOBAL_START_TIME));
+    var record = {
+        requestId: GLOBAL_REQUEST_ID,
+        result: typeof result === 'string' ? result : null,
+        error: error,
+        duration: Number(diffMs.toFixed(2)),
+        billedDuration: Math.min(100 * (Math.floor(diffMs / 100) + 1), GLOBAL_TIMEOUT * 1000),
+        memorySize: GLOBAL_MEM_SIZE,
+        maxMemoryUsed: Math.round(process.memoryUsage().rss / (1024 * 1024)),
+    };
+    // renamed into place, the host never reads a partial file
+    var tmpFile = GLOBAL_RESULT_FILE + '.tmp';
+    fs.writeFileSync(tmpFile, JSON.stringify(record));
+    fs.renameSync(tmpFile, GLOBAL_RESULT_FILE);
+    return true;
+}
+
 function reportDone(resultStr, errType=0) {
+    if (errType === 0 && writeResult(resultStr, null)) {
+        return;
+    }
+
     if (GLOBAL_IS_QUIET) {
         if (typeof resultStr === 'string') {
             if (errType === 0)
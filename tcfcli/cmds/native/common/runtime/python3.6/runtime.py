@@ -19,6 +19,8 @@ _GLOBAL_VERSION = os.environ.get('SCF_FUNCTION_VERSION', '$LATEST')
 _GLOBAL_MEM_SIZE = os.environ.get('SCF_FUNCTION_MEMORY_SIZE', '256')
 _GLOBAL_TIMEOUT = int(os.environ.get('SCF_FUNCTION_TIMEOUT', '3'))
 _GLOBAL_IS_QUIET = (os.environ.get('SCF_DISPLAY_IS_QUIET', 'False') == 'True')
+# the host reads the return value and the metrics from this file and prints them, nothing is taken from stdout
+_GLOBAL_RESULT_FILE = os.environ.get('SCF_RESULT_FILE')
 
 _GLOBAL_FUNCTION_HANDLER = sys.argv[1] if len(sys.argv) > 1 else os.environ.get('SCF_FUNCTION_HANDLER',
         'index.main_handler')
@@ -85,8 +87,43 @@ def wait_for_invoke():
     return invoke_info
 
 
+def report_metrics():
+    duration = int((time.time() - _GLOBAL_START_TIME) * 1000)
+    billed_duration = min(100 * int((duration / 100) + 1), _GLOBAL_TIMEOUT * 1000)
+    max_mem = pstool.get_peak_memory()  # memory use in MB
+    return duration, billed_duration, max_mem
+
+
+def write_result(result=None, error=None):
+    '''
+        Return True if the record was written, the host prints it then instead of the runtime
+    '''
+    if not _GLOBAL_RESULT_FILE:
+        return False
+
+    duration, billed_duration, max_mem = report_metrics()
+    record = {
+        'requestId': _GLOBAL_REQUEST_ID,
+        'result': result,
+        'error': error,
+        'duration': duration,
+        'billedDuration': billed_duration,
+        'memorySize': _GLOBAL_MEM_SIZE,
+        'maxMemoryUsed': max_mem,
+    }
+    # renamed into place, the host never reads a partial file
+    tmp_file = _GLOBAL_RESULT_FILE + '.tmp'
+    with open(tmp_file, 'w') as f:
+        f.write(json.dumps(record))
+    os.rename(tmp_file, _GLOBAL_RESULT_FILE)
+    return True
+
+
 def report_done(msg, err_type=0):
     global _GLOBAL_IS_QUIET
+    if err_type == 0 and write_result(result=msg):
+        return
+
     if _GLOBAL_IS_QUIET:
         if msg:
             if err_type != 0:
@@ -94,13 +131,10 @@ def report_done(msg, err_type=0):
             else:
                 tcf_print("%s" % msg)
             return
-
     if err_type == 0:
         tcf_print("END RequestId: %s" % _GLOBAL_REQUEST_ID)
 
-    duration = int((time.time() - _GLOBAL_START_TIME) * 1000)
-    billed_duration = min(100 * int((duration / 100) + 1), _GLOBAL_TIMEOUT * 1000)
-    max_mem = pstool.get_peak_memory() # memory use in MB
+    duration, billed_duration, max_mem = report_metrics()
     if err_type != 0:
         tcf_print_err(
             "REPORT RequestId: %s Duration: %s ms Billed Duration: %s ms Memory Size: %s MB Max Memory Used: %s MB" % (
@@ -135,6 +169,8 @@ def report_fail(stackTrace, mem_kb, ret_code):
     if stackTrace:
         result['stackTrace'] = stackTrace
 
+    if write_result(error=result):
+        return
     report_done('', err_type=1)
     tcf_print_err(result)
 
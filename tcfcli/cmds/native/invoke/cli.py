@@ -1,5 +1,6 @@
 # -*- coding: utf-8 -*-
 
+import json
 import click
 from tcfcli.cmds.native.common.invoke_context import InvokeContext
 from tcfcli.help.message import NativeHelp as help
@@ -54,9 +55,34 @@ def do_invoke(template, namespace, function, env_vars, event, no_event, debug_po
                 is_quiet=quiet
         ) as context:
             context.invoke()
+            result = context.get_result()
     except Exception as e:
         raise e
 
+    # a runtime writing no result file already printed its return value on stdout
+    if result is not None:
+        show_result(result, quiet)
+
+
+def show_result(result, quiet=False):
+    '''
+        Print the return value or the error of the result file, like the runtimes print them on stdout
+    '''
+    error = result.get('error')
+    if not quiet:
+        report = 'REPORT RequestId: %s Duration: %s ms Billed Duration: %s ms Memory Size: %s MB ' \
+                 'Max Memory Used: %s MB' % (result.get('requestId'), result.get('duration'),
+                                             result.get('billedDuration'), result.get('memorySize'),
+                                             result.get('maxMemoryUsed'))
+        if error is None:
+            click.echo('END RequestId: %s' % result.get('requestId'))
+        click.echo(report + '\n', err=error is not None)
+
+    if error is not None:
+        click.echo(json.dumps(error), err=True)
+    elif result.get('result') is not None:
+        click.echo(result['result'])
+
 
 def _get_event(event_file):
     if event_file == STD_IN:
@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+
+import os
+import click
+
+import tcfcli.common.base_infor as infor
+from tcfcli.help.message import PackageHelp as help
+from tcfcli.common.operation_msg import Operation
+from tcfcli.common.user_config import UserConfig
+from tcfcli.common.user_exceptions import *
+from tcfcli.cmds.deploy.cli import Package
+from tcfcli.cmds.package.manifest import Manifest
+
+DEF_TMP_FILENAME = 'template.yaml'
+DEF_OUTPUT_DIR = '.tcf_package'
+
+REGIONS = infor.REGIONS
+
+
+@click.command(short_help=help.SHORT_HELP)
+@click.option('--template-file', '-t', default=DEF_TMP_FILENAME, type=click.Path(exists=True), help=help.TEMPLATE_FILE)
+@click.option('--cos-bucket', '-c', type=str, help=help.COS_BUCKET)
+@click.option('--name', '-n', type=str, help=help.NAME)
+@click.option('--namespace', '-ns', type=str, help=help.NAMESPACE)
+@click.option('--region', '-r', type=str, help=help.REGION)
+@click.option('--without-cos', is_flag=True, default=False, help=help.WITHOUT_COS)
+@click.option('--output-dir', '-o', default=DEF_OUTPUT_DIR, type=click.Path(), help=help.OUTPUT_DIR)
+def package(template_file, cos_bucket, name, namespace, region, without_cos, output_dir):
+    '''
+        \b
+        Package the functions in the template into zip files, upload them as the deployment would, and write a manifest.
+        The manifest records the hashes, COS locations and the resolved template, so the same artifact can be deployed
+        to several environments without packaging again.
+        \b
+        Common usage:
+            \b
+            * Package the functions
+              $ scf package
+            \b
+            * Deploy the packaged functions
+              $ scf deploy --from-manifest .tcf_package/manifest.json
+    '''
+    if region and region not in REGIONS:
+        raise ArgsException("The region must in %s." % (", ".join(REGIONS)))
+
+    region = region if region else UserConfig().region
+    output_dir = os.path.abspath(output_dir)
+
+    pkg = Package(template_file, cos_bucket, name, region, namespace, without_cos, build_dir=output_dir)
+    resource = pkg.do_package()
+    if name and "'%s'" % str(name) not in str(resource):
+        raise PackageException("Couldn't find the function in YAML, please add this function in YAML.")
+
+    manifest_file = os.path.join(output_dir, Manifest.DEFAULT_NAME)
+    Manifest(region, namespace, pkg.template_file, resource, pkg.artifacts).dump(manifest_file)
+    Operation("Generate manifest '{}' success".format(manifest_file)).success()
+    Operation("You could deploy it with: scf deploy --from-manifest {}".format(manifest_file)).information()
@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+
+import io
+import os
+import json
+import time
+import hashlib
+
+from tcfcli.cmds.cli import __version__
+from tcfcli.common.user_exceptions import PackageException
+from tcfcli.common.tcsam.tcsam_macro import TcSamMacro as tsmacro
+
+
+class Manifest(object):
+    '''
+        The manifest records everything `scf package` produced: the zip files with their hashes,
+        the COS locations and the resolved resources, so `scf deploy --from-manifest` can go
+        straight to the cloud API calls.
+    '''
+    VERSION = "1.0"
+    DEFAULT_NAME = "manifest.json"
+
+    def __init__(self, region, namespace, template_file, resources, artifacts, create_time=None):
+        self.region = region
+        self.namespace = namespace
+        self.template_file = template_file
+        self.resources = resources
+        self.artifacts = artifacts
+        self.create_time = create_time if create_time else time.strftime("%Y-%m-%d %H:%M:%S")
+
+    def dump(self, manifest_file):
+        manifest_dir = os.path.dirname(os.path.abspath(manifest_file))
+        if not os.path.exists(manifest_dir):
+            os.makedirs(manifest_dir)
+
+        artifacts = []
+        for artifact in self.artifacts:
+            artifact = dict(artifact)
+            if artifact.get("zip_file"):
+                artifact["zip_file"] = os.path.relpath(artifact["zip_file"], manifest_dir)
+            artifacts.append(artifact)
+
+        # local zip files are restored from the artifacts when the manifest is loaded
+        resources = json.loads(json.dumps(self.resources))
+        for ns in resources:
+            for func in resources[ns]:
+                if func == tsmacro.Type:
+                    continue
+                resources[ns][func].get(tsmacro.Properties, {}).pop(tsmacro.LocalZipFile, None)
+
+        data = {
+            "version": self.VERSION,
+            "cli_version": __version__,
+            "create_time": self.create_time,
+            "region": self.region,
+            "namespace": self.namespace,
+            "template_file": self.template_file,
+            "artifacts": artifacts,
+            "resources": resources,
+        }
+        with io.open(manifest_file, mode="w", encoding="utf-8") as f:
+            f.write(json.dumps(data, indent=2, ensure_ascii=False, sort_keys=True))
+
+    @staticmethod
+    def load(manifest_file):
+        if not os.path.isfile(manifest_file):
+            raise PackageException("Manifest '{}' not found.".format(manifest_file))
+
+        try:
+            with io.open(manifest_file, mode="r", encoding="utf-8") as f:
+                data = json.load(f)
+        except ValueError as e:
+            raise PackageException("Parse manifest '{}' failed: {}".format(manifest_file, str(e)))
+
+        if data.get("version") != Manifest.VERSION:
+            raise PackageException("Unsupported manifest version '{}'.".format(data.get("version")))
+
+        manifest_dir = os.path.dirname(os.path.abspath(manifest_file))
+        resources = data.get("resources", {})
+        artifacts = data.get("artifacts", [])
+        for artifact in artifacts:
+            if not artifact.get("zip_file"):
+                continue
+            zip_file = os.path.normpath(os.path.join(manifest_dir, artifact["zip_file"]))
+            Manifest._verify(zip_file, artifact.get("md5"))
+            artifact["zip_file"] = zip_file
+            func = resources.get(artifact["namespace"], {}).get(artifact["function"])
+            if func is not None:
+                func.setdefault(tsmacro.Properties, {})[tsmacro.LocalZipFile] = zip_file
+
+        return Manifest(data.get("region"), data.get("namespace"), data.get("template_file"),
+                        resources, artifacts, data.get("create_time"))
+
+    @staticmethod
+    def _verify(zip_file, md5):
+        if not os.path.isfile(zip_file):
+            raise PackageException("Package file '{}' in manifest not found.".format(zip_file))
+        with open(zip_file, "rb") as f:
+            if hashlib.md5(f.read()).hexdigest() != md5:
+                raise PackageException("Package file '{}' does not match the md5 in manifest.".format(zip_file))
@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+
+import math
+
+
+class Histogram(object):
+    '''
+        Streaming histogram with logarithmic buckets. A value is counted in the bucket
+        floor(log(value) / log(1 + 2 * accuracy)), so any percentile is known within the relative
+        accuracy while the memory only grows with the range of the values, not their number.
+    '''
+
+    def __init__(self, accuracy=0.01):
+        self._gamma = 1 + 2 * accuracy
+        self._log_gamma = math.log(self._gamma)
+        self._buckets = {}
+        self._zeros = 0
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+
+    def add(self, value):
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+        if value <= 0:
+            self._zeros += 1
+            return
+        index = int(math.floor(math.log(value) / self._log_gamma))
+        self._buckets[index] = self._buckets.get(index, 0) + 1
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else None
+
+    def percentile(self, p):
+        '''
+            Return the p-th percentile (0 - 100) of the values, None if there is no value.
+        '''
+        if not self.count:
+            return None
+        # the ends are known exactly
+        if p <= 0:
+            return self.min
+        if p >= 100:
+            return self.max
+        rank = p / 100.0 * (self.count - 1)
+        seen = self._zeros
+        if rank < seen:
+            return min(0, self.max)
+        for index in sorted(self._buckets):
+            seen += self._buckets[index]
+            if rank < seen:
+                # the middle of the bucket, clipped to the observed range
+                value = 2 * self._gamma ** index * self._gamma / (self._gamma + 1)
+                return min(max(value, self.min), self.max)
+        return self.max
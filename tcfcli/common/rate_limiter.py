@@ -0,0 +1,37 @@
+# -*- coding: utf-8 -*-
+
+import time
+import threading
+
+
+class RateLimiter(object):
+    '''
+        Thread-safe token bucket shared by the threads calling the cloud API concurrently,
+        at most `rate` calls are made per second after a burst of `burst` calls.
+    '''
+
+    def __init__(self, rate, burst=None):
+        self.rate = float(rate)
+        self.burst = burst if burst else max(1, int(rate))
+        self._tokens = float(self.burst)
+        self._last = time.time()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.time()
+                self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+                self._last = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+    def backoff(self, seconds):
+        '''
+            Stop handing out tokens for a while, called when the cloud API reports the limit is exceeded.
+        '''
+        with self._lock:
+            self._tokens = min(self._tokens, 0) - seconds * self.rate
@@ -20,10 +20,17 @@ class ScfBaseClient(object):
             self._region = uc.region
         else:
             self._region = region
+        self._client = self._create_client()
+
+    def _create_client(self):
+        '''
+            Create a new cloud API client, the threads calling the API concurrently use one each.
+        '''
         hp = HttpProfile(reqTimeout=ScfBaseClient.CLOUD_API_REQ_TIMEOUT)
         cp = ClientProfile("TC3-HMAC-SHA256", hp)
-        self._client = scf_client.ScfClient(self._cred, self._region, cp)
-        self._client._sdkVersion = "TCFCLI_" + __version__
+        client = scf_client.ScfClient(self._cred, self._region, cp)
+        client._sdkVersion = "TCFCLI_" + __version__
+        return client
 
     @staticmethod
     def wrapped_err_handle(apifunc, req):
@@ -2,73 +2,392 @@
 
 import click
 import time
+import threading
+from multiprocessing.pool import ThreadPool
+from datetime import datetime, timedelta
+from six.moves import queue
 from builtins import str as text
 from tcfcli.common.operation_msg import Operation
+from tcfcli.common.rate_limiter import RateLimiter
+from tcfcli.libs.utils.log_stats import InvocationStats
 from tencentcloud.scf.v20180416 import models
 from . import ScfBaseClient
 
+TM_FORMAT = '%Y-%m-%d %H:%M:%S'
+
 
 class ScfLogClient(ScfBaseClient):
     DEFAULT_INTERVAL = 300
+    PAGE_SIZE = 1000
+    # GetFunctionLogs returns at most MAX_COUNT logs of a time range
+    MAX_COUNT = 10000
+
+    # the time range is split into shards fetched concurrently, every shard is at least one minute
+    MAX_SHARDS = 8
+    MIN_SHARD_SECONDS = 60
+    # pages a shard may fetch ahead of the output, and GetFunctionLogs calls per second of all the shards
+    PREFETCH_PAGES = 2
+    RATE = 5
+
+    # the tail polls faster while logs keep coming and slower when idle, the logs arriving
+    # late are picked up by querying TAIL_LAG seconds before the newest log seen
+    MIN_POLL_INTERVAL = 1
+    MAX_POLL_INTERVAL = 10
+    TAIL_LAG = 10
 
-    def __init__(self, func, ns="default", region=None, err_only=None):
+    def __init__(self, func, ns="default", region=None, err_only=None, log_filter=None, cache=None, offline=False):
         super(ScfLogClient, self).__init__(region)
         self._func = func
         self._ns = ns
         self._err_only = err_only
+        self._log_filter = log_filter
+        self._cache = cache
+        self._offline = offline
 
-        # fetch in desc, print in asc
-
-    def fetch_log_tail_c(self, startime, endtime, count, tail):
-        log_stack = []
-        for logs in self.__fetch_log(startime, endtime, count, tail, order="desc"):
-            for log in logs:
-                log_stack.append(log)
-        for i in range(len(log_stack) - 1, -1, -1):
-            log = log_stack[i]
-            click.secho(log.StartTime, fg="green")
-            if log.RetCode == 0:
-                click.secho(log.Log)
-            else:
-                click.secho(log.Log, fg="red")
-
-    def fetch_log(self, startime, endtime, count, tail=False):
-        for logs in self.__fetch_log(startime, endtime, count, tail):
-            if len(logs) == 0 and not tail:
-                Operation("There is no data during this time period.").information()
-                Operation(
-                    "You can try to adjust the start-time, end-time, duration, etc. to view a larger range of logs.").information()
-            for log in logs:
-                Operation("Log startTime: %s" % str(log.StartTime)).process()
+    def fetch_log_tail_c(self, startime, endtime, count, sink=None):
+        '''
+            Print the latest `count` logs in ascending order as the pages arrive, nothing is accumulated.
+            One descending probe at offset count - 1 finds the oldest of them, then the logs from its
+            StartTime on are streamed ascending. The logs of the same second older than it are skipped
+            by the offset, TotalCount of the ascending query tells how many there are.
+        '''
+        probe = self._log_request(startime, endtime, order="desc")
+        probe.Offset = count - 1
+        probe.Limit = 1
+        rsp = self.wrapped_err_handle(self._client.GetFunctionLogs, probe)
+        if rsp.Data:
+            startime = rsp.Data[0].StartTime
 
+        req = self._log_request(startime, endtime)
+        skip = None
+        while count > 0:
+            req.Limit = self.PAGE_SIZE
+            rsp = self.wrapped_err_handle(self._client.GetFunctionLogs, req)
+            logs = rsp.Data
+            if skip is None:
+                skip = max(0, (rsp.TotalCount or 0) - count)
+                if skip >= len(logs):
+                    req.Offset = skip
+                    continue
+                logs = logs[skip:]
+                req.Offset = skip
+            for log in logs[:count]:
+                if self._log_filter and not self._log_filter.match(log):
+                    continue
+                if sink:
+                    sink(log)
+                    continue
+                click.secho(log.StartTime, fg="green")
                 if log.RetCode == 0:
-                    click.secho(u"%s" % (text(log.Log)).replace("\n\n", "\n"))
+                    click.secho(log.Log)
                 else:
-                    click.secho(u"%s" % (text(log.Log)).replace("\n\n", "\n"), fg="red")
+                    click.secho(log.Log, fg="red")
+            count -= len(logs)
+            req.Offset += len(logs)
+            if len(rsp.Data) < req.Limit:
+                break
+
+    def fetch_log(self, startime, endtime, count, tail=False, sink=None):
+        '''
+            Print the logs, or hand them to `sink` one by one as they arrive.
+        '''
+        sink = sink if sink else self._show
+        if tail:
+            for log in self.__tail(startime, count):
+                if not self._log_filter or self._log_filter.match(log):
+                    sink(log)
+            return
+
+        found = False
+        for log in self.iter_logs(startime, endtime, count):
+            found = True
+            sink(log)
+        if not found:
+            Operation("There is no data during this time period.").information()
+            Operation(
+                "You can try to adjust the start-time, end-time, duration, etc. to view a larger range of logs.").information()
+
+    def fetch_stats(self, startime, endtime, count=None):
+        '''
+            Summarize the invocations of the time range, all of them unless `count` is given.
+        '''
+        stats = InvocationStats(self._func)
+        for log in self.iter_logs(startime, endtime, count):
+            stats.add(log)
+        stats.show()
+
+    def iter_logs(self, startime, endtime, count=None):
+        '''
+            Generate the logs of the time range in ascending order, filtered by the log filter,
+            at most `count` of them if it is given.
+        '''
+        if self._cache:
+            logs = self.__cached_logs(startime, endtime)
+        else:
+            logs = self.__fetch_log_all(startime, endtime, count)
+        for log in logs:
+            if self._log_filter and not self._log_filter.match(log):
+                continue
+            yield log
+            if count is not None:
+                count -= 1
+                if count <= 0:
+                    return
+
+    @staticmethod
+    def _show(log, function=None):
+        prefix = "[%s] " % function if function else ""
+        Operation("%sLog startTime: %s" % (prefix, str(log.StartTime))).process()
+
+        if log.RetCode == 0:
+            click.secho(u"%s" % (text(log.Log)).replace("\n\n", "\n"))
+        else:
+            click.secho(u"%s" % (text(log.Log)).replace("\n\n", "\n"), fg="red")
+
+        click.secho("\n")
 
-                click.secho("\n")
+    def __cached_logs(self, startime, endtime):
+        '''
+            Generate the logs of the time range in ascending order, the covered ranges from the cache and
+            the gaps as their pages are fetched, so the output does not wait for the whole range.
+            All the logs are cached, --failed and the other filters are evaluated locally.
+        '''
+        key = (self._region, self._ns, self._func)
+        if self._offline:
+            for log in self._cache.query(key, startime, endtime):
+                yield log
+            return
 
-    def __fetch_log(self, startime, endtime, count, tail, order="asc"):
-        step = 1000
+        cursor = datetime.strptime(startime, TM_FORMAT)
+        for gap_start, gap_end in self._cache.gaps(key, cursor, datetime.strptime(endtime, TM_FORMAT)):
+            if gap_start > cursor:
+                for log in self._cache.query(key, cursor.strftime(TM_FORMAT),
+                                             (gap_start - timedelta(seconds=1)).strftime(TM_FORMAT)):
+                    yield log
+            for log in self.__fetch_gap(key, gap_start, gap_end):
+                yield log
+            cursor = gap_end + timedelta(seconds=1)
+        for log in self._cache.query(key, cursor.strftime(TM_FORMAT), endtime):
+            yield log
+
+    def __fetch_gap(self, key, gap_start, gap_end):
+        '''
+            Generate the logs of a gap and cache them by pages. The gap is recorded as covered only when
+            it is fetched to the end, not when the output stops early.
+        '''
+        batch = []
+        try:
+            for log in self.__fetch_log_all(gap_start.strftime(TM_FORMAT), gap_end.strftime(TM_FORMAT),
+                                            err_only=False):
+                batch.append(log)
+                if len(batch) >= self.PAGE_SIZE:
+                    self._cache.add(key, batch)
+                    batch = []
+                yield log
+        finally:
+            self._cache.add(key, batch)
+        self._cache.cover(key, gap_start, gap_end)
+
+    def _log_request(self, startime, endtime, order="asc", err_only=None):
         req = models.GetFunctionLogsRequest()
         req.FunctionName = self._func
+        req.Namespace = self._ns
         req.StartTime = startime
         req.EndTime = endtime
         req.Order = order
         req.Offset = 0
-        if self._err_only:
+        if self._err_only if err_only is None else err_only:
             req.Filter = models.Filter()
             req.Filter.RetCode = "not0"
-        while count > 0:
-            req.Limit = step if step < count else count
+        return req
+
+    def __tail(self, startime, count):
+        self.start_tail(startime)
+        interval = self.MIN_POLL_INTERVAL
+        while True:
+            logs = self.poll_tail()
+            for log in logs:
+                yield log
+                count -= 1
+                if count <= 0:
+                    return
+            interval = self._next_interval(interval, len(logs))
+            time.sleep(interval)
+
+    @classmethod
+    def tail_log_many(cls, clients, startime, count, sinks=None):
+        '''
+            Follow the logs of several functions and print them merged in time order, prefixed with the
+            function name, or hand them to the sinks, one per client. One scheduler polls all the functions
+            in the same round through a shared rate limiter, so the API calls do not multiply with every function.
+        '''
+        limiter = RateLimiter(cls.RATE)
+        pool = ThreadPool(min(len(clients), cls.MAX_SHARDS))
+        for client in clients:
+            client.start_tail(startime)
+        interval = cls.MIN_POLL_INTERVAL
+        try:
+            while True:
+                polled = pool.map(lambda c: c.poll_tail(limiter), clients)
+                merged = sorted(((log.StartTime, i, log) for i, logs in enumerate(polled) for log in logs
+                                 if not clients[i]._log_filter or clients[i]._log_filter.match(log)),
+                                key=lambda item: item[:2])
+                for start_time, i, log in merged:
+                    if sinks:
+                        sinks[i](log)
+                    else:
+                        cls._show(log, clients[i]._func)
+                    count -= 1
+                    if count <= 0:
+                        return
+                interval = cls._next_interval(interval, len(merged))
+                time.sleep(interval)
+        finally:
+            pool.terminate()
+
+    def start_tail(self, startime):
+        self._tail_start = self._tail_cursor = datetime.strptime(startime, TM_FORMAT)
+        self._tail_seen = set()
+
+    def poll_tail(self, limiter=None):
+        '''
+            Return the new logs since the last poll in ascending order. The time cursor stays at the newest
+            log seen, every poll asks for the logs after it and drops those already returned by their
+            (RequestId, StartTime).
+        '''
+        since = max(self._tail_start, self._tail_cursor - timedelta(seconds=self.TAIL_LAG))
+        req = self._log_request(since.strftime(TM_FORMAT), datetime.now().strftime(TM_FORMAT))
+        logs = []
+        while True:
+            req.Limit = self.PAGE_SIZE
+            if limiter:
+                limiter.acquire()
             rsp = self.wrapped_err_handle(self._client.GetFunctionLogs, req)
-            yield rsp.Data
-            c = len(rsp.Data)
-            count -= c
-            if c < req.Limit and not tail:
+            for log in rsp.Data:
+                key = (log.RequestId, log.StartTime)
+                if key in self._tail_seen:
+                    continue
+                self._tail_seen.add(key)
+                self._tail_cursor = max(self._tail_cursor, datetime.strptime(log.StartTime, TM_FORMAT))
+                logs.append(log)
+            if len(rsp.Data) < req.Limit:
                 break
-            req.Offset += c
-            if tail:
-                time.sleep(2)
+            req.Offset += len(rsp.Data)
+
+        # only the keys inside the window of the next poll are needed
+        horizon = (self._tail_cursor - timedelta(seconds=self.TAIL_LAG)).strftime(TM_FORMAT)
+        self._tail_seen = set(k for k in self._tail_seen if k[1] >= horizon)
+        return logs
+
+    @classmethod
+    def _next_interval(cls, interval, new):
+        # poll faster while logs keep coming and slower when idle
+        if new:
+            return max(cls.MIN_POLL_INTERVAL, interval / 2.0)
+        return min(cls.MAX_POLL_INTERVAL, interval * 1.5)
+
+    def __fetch_log_all(self, startime, endtime, count=None, err_only=None):
+        '''
+            Generate the logs of the time range in ascending order, all of them unless `count` is given.
+            A query returns at most MAX_COUNT logs, when it is full the range goes on from the second of
+            its last log, the logs of that second already generated are skipped.
+        '''
+        # the logs already generated of the second the query starts from
+        seen = set()
+        while count is None or count > 0:
+            limit = self.MAX_COUNT if count is None else min(count, self.MAX_COUNT)
+            fetched = 0
+            last_time = None
+            last_seen = set()
+            for log in self.__fetch_log_sharded(startime, endtime, limit, err_only):
+                fetched += 1
+                key = (log.RequestId, log.StartTime)
+                if log.StartTime != last_time:
+                    last_time = log.StartTime
+                    last_seen = set()
+                last_seen.add(key)
+                if key in seen:
+                    continue
+                yield log
+                if count is not None:
+                    count -= 1
+            if fetched < limit or count == 0:
+                return
+            if last_time == startime:
+                # more than MAX_COUNT logs in one second, the rest of them can not be queried
+                Operation("More than {} logs at {}, the rest of them are skipped.".format(
+                    self.MAX_COUNT, startime)).warning()
+                startime = (datetime.strptime(startime, TM_FORMAT) + timedelta(seconds=1)).strftime(TM_FORMAT)
+                seen = set()
             else:
-                time.sleep(0.5)
+                startime = last_time
+                seen = last_seen
+
+    def __fetch_log_sharded(self, startime, endtime, count, err_only=None):
+        '''
+            Generate the first `count` logs of the time range in ascending order. Every shard is paginated
+            by its own thread, the output reads the shards one after another, so the logs stay in order
+            while the later shards are already being fetched.
+        '''
+        start = datetime.strptime(startime, TM_FORMAT)
+        end = datetime.strptime(endtime, TM_FORMAT)
+        seconds = int((end - start).total_seconds())
+        shards = max(1, min(self.MAX_SHARDS, seconds // self.MIN_SHARD_SECONDS))
+        bounds = [start + timedelta(seconds=seconds * i // shards) for i in range(shards)] + [end]
+
+        limiter = RateLimiter(self.RATE)
+        stop = threading.Event()
+        pages = []
+        for i in range(shards):
+            # the time range of the API is inclusive, the shards must not overlap
+            shard_end = bounds[i + 1] if i == shards - 1 else bounds[i + 1] - timedelta(seconds=1)
+            pages.append(queue.Queue(maxsize=self.PREFETCH_PAGES))
+            worker = threading.Thread(target=self.__fetch_shard,
+                                      args=(bounds[i], shard_end, count, pages[-1], limiter, stop, err_only))
+            worker.daemon = True
+            worker.start()
+
+        try:
+            for shard_pages in pages:
+                while True:
+                    logs = shard_pages.get()
+                    if logs is None:
+                        break
+                    if isinstance(logs, Exception):
+                        raise logs
+                    for log in logs:
+                        if count <= 0:
+                            return
+                        count -= 1
+                        yield log
+        finally:
+            stop.set()
+
+    def __fetch_shard(self, start, end, count, pages, limiter, stop, err_only=None):
+        client = self._create_client()
+        req = self._log_request(start.strftime(TM_FORMAT), end.strftime(TM_FORMAT), err_only=err_only)
+        try:
+            while count > 0 and not stop.is_set():
+                req.Limit = self.PAGE_SIZE if self.PAGE_SIZE < count else count
+                limiter.acquire()
+                rsp = self.wrapped_err_handle(client.GetFunctionLogs, req)
+                self.__put(pages, rsp.Data, stop)
+                c = len(rsp.Data)
+                count -= c
+                if c < req.Limit:
+                    break
+                req.Offset += c
+        except Exception as e:
+            self.__put(pages, e, stop)
+            return
+        self.__put(pages, None, stop)
+
+    @staticmethod
+    def __put(pages, item, stop):
+        # the output may stop early, a blocked shard must not wait for it forever
+        while not stop.is_set():
+            try:
+                pages.put(item, timeout=0.5)
+                return
+            except queue.Full:
+                pass
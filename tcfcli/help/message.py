@@ -55,6 +55,7 @@ class CommonHelp():
     INVOKE_DOCKER_NETWORK = 'Specifies the name or id of an existing docker network which containers should connect to, along with the default bridge network.'
     INVOKE_LOG_FILE = 'Path of logfile where send runtime logs to file.'
     INVOKE_SKIP_PULL_IMAGE = 'Specify whether CLI skip pulling or update docker images.'
+    INVOKE_PULL_TTL = 'The seconds a pulled docker image is used before the registry is checked for an update again.'
     INVOKE_REGION = "The function region. Including %s." % REGIONS_STR
 
 
@@ -68,6 +69,9 @@ class DeleteHelp():
 
     FORCED = "Force delete function without ask."
     REGION = "Region name. Including %s." % REGIONS_STR
+    MATCH = "Delete all the functions whose names match the shell-style pattern, like 'pr-123-*'. " \
+            "Use '--namespace all' to match in all the namespaces."
+    ALL_REGIONS = "Match the functions in all the regions, only valid with --match."
 
 
 class DeployHelp():
@@ -85,6 +89,24 @@ class DeployHelp():
     SKIP_EVENT = "Triggers will continue with the previous setup and won't cover them this time."
     WITHOUT_COS = "Deploy SCF function without COS. If you set cos-bucket in configure."
     HISTORY = "The deployment history version code is only valid when using using-cos."
+    RESUME = "Continue the last failed deployment from the first unfinished step, reuse the uploaded packages."
+    WATCH = "Keep watching the template and CodeUri after deploying, redeploy the code of the changed functions."
+    FROM_MANIFEST = "Deploy the artifacts recorded in the manifest generated by 'scf package', skip packaging and uploading."
+
+
+class PackageHelp():
+    # Package Help Message
+
+    SHORT_HELP = "Package SCF functions and generate a manifest."
+
+    NAME = CommonHelp.NAME
+    NAMESPACE = CommonHelp.NAMESPACE
+
+    COS_BUCKET = DeployHelp.COS_BUCKET
+    TEMPLATE_FILE = DeployHelp.TEMPLATE_FILE
+    REGION = "The function will be packaged for this region. Including %s." % REGIONS_STR
+    WITHOUT_COS = "Package SCF function without COS, the zip files will be uploaded when deploying."
+    OUTPUT_DIR = "The directory where the zip files and manifest.json are written to. The default is .tcf_package."
 
 
 class InitHelp():
@@ -162,7 +184,7 @@ class LogsHelp():
 
     SHORT_HELP = "Fetch logs of SCF function from service."
 
-    NAME = MUST + CommonHelp.NAME
+    NAME = MUST + CommonHelp.NAME + " Separate several functions with commas, like: a,b,c."
     NAMESPACE = CommonHelp.NAMESPACE
 
     REGION = "Specify the area where the function is located (e.g. ap-guangzhou)."
@@ -172,6 +194,16 @@ class LogsHelp():
     DURATION = "The duration between starttime and current time (unit:second)."
     FAILED = "Get the log of the failed call."
     TAIL = "Get the latest real-time logs."
+    ALL = "Fetch the logs of all the functions in template.yaml, merged in time order with --tail."
+    GREP = "Only show the logs matching the regular expression."
+    RET_CODE = "Only show the logs of the invocations returning this RetCode."
+    MIN_DURATION = "Only show the logs of the invocations running longer than this (unit:millisecond)."
+    NO_CACHE = "Fetch all the logs from the service, without reading or writing the local log cache."
+    OFFLINE = "Only query the local log cache, the service is not called."
+    OUTPUT = "Write the logs to the file as structured rows instead of printing them, " \
+             "the format is chosen by the extension: .jsonl, .jsonl.gz, .csv or .csv.gz."
+    STATS = "Show the duration percentiles, memory headroom, error rate, cold starts and billed GB-seconds " \
+            "of the invocations instead of the logs."
 
 
 class LocalHelp():
@@ -183,6 +215,35 @@ class LocalHelp():
     INVOKE_EVENT = 'The source of the file for the simulated test event, the file content must be in JSON format.'
     INVOKE_NO_ENENT = "Without the source of the file for the simulated test. The default is False."
     INVOKE_QUIET = 'Only display what function return.'
+    INVOKE_EVENTS = 'Invoke the function with every event of a JSONL file (one event per line) or of a directory ' \
+                    '(one .json file per event) and report the pass/fail and latency of all the invocations.'
+    INVOKE_CONCURRENCY = 'The number of events invoked at the same time with --events.'
+    INVOKE_OUTPUT = 'Write the result of every event invoked with --events to a .jsonl or .csv file.'
+
+    WARM_CONTAINERS = "The max number of idle containers kept warm per function, 0 runs every invocation " \
+                      "in a new container."
+    WARM_IDLE_TTL = "The seconds an idle warm container is kept before it is removed."
+
+    START_API_WORKERS = "The number of threads serving the HTTP requests, an idle keep-alive connection holds " \
+                        "none of them. The requests are rejected with 503 when all of them are busy and the " \
+                        "queue is full."
+    START_API_CONCURRENCY = "The max number of requests a function handles at the same time."
+    START_API_FUNCTION_CONCURRENCY = "The concurrency of a function like 'FunctionName=10', overriding " \
+                                     "--concurrency, like the reserved concurrency of SCF. Can be repeated."
+    START_API_QUEUE_SIZE = "The number of requests waiting when a function is at its concurrency, the other " \
+                           "requests are rejected with 429."
+
+    BENCH_SHORT_HELP = "Benchmark a SCF function locally under concurrency."
+    BENCH_EVENT = "The file of the event every request is invoked with, the content must be in JSON format."
+    BENCH_REQUESTS = "The number of invocations."
+    BENCH_CONCURRENCY = "The number of invocations running at the same time."
+    BENCH_RATE = "The max number of invocations started per second, unlimited by default."
+    BENCH_OUTPUT = "Write the results to a JSON file, which can be compared with a later run by --compare."
+    BENCH_COMPARE = "The JSON file of a previous run written by --output, the results are compared with it."
+    BENCH_ENV_VARS = "JSON file contains values for environment variables."
+
+    PULL_SHORT_HELP = "Pull the docker images of the SCF runtimes."
+    PULL_RUNTIME = "The runtime whose image is pulled, can be repeated. All the runtimes are pulled by default."
 
 
 class ListHelp():
@@ -192,3 +253,5 @@ class ListHelp():
     NAMESPACE = CommonHelp.NAMESPACE
 
     REGION = "The function region. Including %s" % REGIONS_STR
+
+    REFRESH = "Sync the local function inventory with the cloud instead of using the cached functions."
@@ -9,6 +9,7 @@ from tcfcli.common.operation_msg import Operation
 from qcloud_cos.cos_auth import CosS3Auth
 from qcloud_cos.version import __version__
 from qcloud_cos.cos_threadpool import SimpleThreadPool
+from tcfcli.libs.utils.upload_strategy import ProgressReader
 
 
 class CosReset(CosS3Client):
@@ -30,6 +31,9 @@ class CosReset(CosS3Client):
             kwargs['data'] = to_bytes(kwargs['data'])
         for j in range(self._retry + 1):
             try:
+                # a file-like body has been consumed by the failed attempt
+                if j > 0 and hasattr(kwargs.get('data'), 'seek'):
+                    kwargs['data'].seek(0)
                 if method == 'POST':
                     res = self._session.post(url, timeout=timeout, **kwargs)
                 elif method == 'GET':
@@ -242,8 +246,9 @@ class CosReset(CosS3Client):
         data.update(body)
         return data
 
-    def upload_file(self, Bucket, Key, LocalFilePath, PartSize=1, MAXThread=5, EnableMD5=False, **kwargs):
-        """小于等于20MB的文件简单上传，大于20MB的文件使用分块上传
+    def upload_file(self, Bucket, Key, LocalFilePath, PartSize=1, MAXThread=5, EnableMD5=False,
+                    MultipartThreshold=1024 * 1024 * 20, ProgressCallback=None, **kwargs):
+        """小于等于MultipartThreshold(默认20MB)的文件简单上传，大于的文件使用分块上传
 
         :param Bucket(string): 存储桶名称.
         :param key(string): 分块上传路径名.
@@ -251,6 +256,8 @@ class CosReset(CosS3Client):
         :param PartSize(int): 分块的大小设置,单位为MB.
         :param MAXThread(int): 并发上传的最大线程数.
         :param EnableMD5(bool): 是否打开MD5校验.
+        :param MultipartThreshold(int): 使用分块上传的文件大小阈值,单位为字节.
+        :param ProgressCallback(function): 每个分块上传成功后以分块大小为参数回调.
         :param kwargs(dict): 设置请求headers.
         :return(dict): 成功上传文件的元信息.
 
@@ -269,7 +276,7 @@ class CosReset(CosS3Client):
             )
         """
         file_size = os.path.getsize(LocalFilePath)
-        if file_size <= 1024 * 1024 * 20:
+        if file_size <= MultipartThreshold:
             with open(LocalFilePath, 'rb') as fp:
                 rt = self.put_object(Bucket=Bucket, Key=Key, Body=fp, EnableMD5=EnableMD5, **kwargs)
             return rt
@@ -311,10 +318,10 @@ class CosReset(CosS3Client):
             for i in range(1, parts_num + 1):
                 if i == parts_num:  # 最后一块
                     pool.add_task(self._upload_part, Bucket, Key, LocalFilePath, offset, file_size - offset, i,
-                                  uploadid, lst, resumable_flag, already_exist_parts, EnableMD5)
+                                  uploadid, lst, resumable_flag, already_exist_parts, EnableMD5, ProgressCallback)
                 else:
                     pool.add_task(self._upload_part, Bucket, Key, LocalFilePath, offset, part_size, i, uploadid, lst,
-                                  resumable_flag, already_exist_parts, EnableMD5)
+                                  resumable_flag, already_exist_parts, EnableMD5, ProgressCallback)
                     offset += part_size
             pool.wait_completion()
             result = pool.get_result()
@@ -371,7 +378,7 @@ class CosReset(CosS3Client):
 
     # Advanced interface
     def _upload_part(self, bucket, key, local_path, offset, size, part_num, uploadid, md5_lst, resumable_flag,
-                     already_exist_parts, enable_md5):
+                     already_exist_parts, enable_md5, progress_callback=None):
         """从本地文件中读取分块, 上传单个分块,将结果记录在md5——list中
 
         :param bucket(string): 存储桶名称.
@@ -385,6 +392,7 @@ class CosReset(CosS3Client):
         :param resumable_flag(bool): 是否为断点续传.
         :param already_exist_parts(dict): 断点续传情况下,保存已经上传的块的序号和Etag.
         :param enable_md5(bool): 是否开启md5校验.
+        :param progress_callback(function): 分块上传成功后的回调.
         :return: None.
         """
         # 如果是断点续传且该分块已经上传了则不用实际上传
@@ -396,6 +404,8 @@ class CosReset(CosS3Client):
                 data = fp.read(size)
             rt = self.upload_part(bucket, key, data, part_num, uploadid, enable_md5)
             md5_lst.append({'PartNumber': part_num, 'ETag': rt['ETag']})
+        if progress_callback:
+            progress_callback(size)
         return None
 
     def upload_part(self, Bucket, Key, Body, PartNumber, UploadId, EnableMD5=False, **kwargs):
@@ -561,11 +571,11 @@ class CosClient(object):
                                  Region=region, Appid=uc.appid)
         self._client = CosReset(self._config)
 
-    def upload_file2cos(self, bucket, file, key):
+    def upload_file2cos(self, bucket, file, key, progress=None):
         # save funcs in the func directory
         try:
             response = self._client.put_object(Bucket=bucket,
-                                               Body=file,
+                                               Body=ProgressReader(file, progress) if progress else file,
                                                Key=key,
                                                Metadata={
                                                    'x-cos-acl': 'public-read',
@@ -594,13 +604,17 @@ class CosClient(object):
         code_uri_in_cos = bucket + '/' + key
         return code_uri_in_cos
 
-    def upload_file2cos2(self, bucket, file, key, md5):
-        # save funcs in the func directory
+    def upload_file2cos2(self, bucket, file, key, md5, part_size=1, max_thread=5, progress=None):
+        # multipart upload of the local file, every part is reported to progress
         try:
             response = self._client.upload_file(Bucket=bucket,
                                                 LocalFilePath=file,
                                                 Key=key,
                                                 EnableMD5=md5,
+                                                PartSize=part_size,
+                                                MAXThread=max_thread,
+                                                MultipartThreshold=part_size * 1024 * 1024,
+                                                ProgressCallback=progress.update if progress else None,
                                                 Metadata={
                                                     'x-cos-acl': 'public-read',
                                                     'Content-Type': 'application/x-zip-compressed',
@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+
+import sys
+import six
+import threading
+from multiprocessing.pool import ThreadPool
+from six.moves import queue
+from tcfcli.common.operation_msg import Operation
+from tcfcli.libs.utils.scf_client import ScfClient
+from tencentcloud.common.exception.tencent_cloud_sdk_exception import TencentCloudSDKException
+
+
+def error_message(err):
+    s = err.get_message() if isinstance(err, TencentCloudSDKException) else str(err)
+    if sys.version_info[0] == 2 and isinstance(s, six.text_type):
+        s = s.encode("utf8")
+    return s
+
+
+class FunctionLister(object):
+    '''
+        List the functions of many regions and namespaces concurrently with a bounded thread pool.
+        The first page of every namespace gives the total count, the rest pages are requested at once,
+        and the pages are handed out in the order they arrive.
+    '''
+
+    def __init__(self, pool_size=8):
+        self._pool = ThreadPool(pool_size)
+        self._local = threading.local()
+
+    def client(self, region):
+        # a client is not shared between the threads, each thread keeps one for every region
+        clients = getattr(self._local, "clients", None)
+        if clients is None:
+            clients = self._local.clients = {}
+        if region not in clients:
+            clients[region] = ScfClient(region)
+        return clients[region]
+
+    def map(self, func, items):
+        return self._pool.map(func, items)
+
+    def imap_unordered(self, func, items):
+        return self._pool.imap_unordered(func, items)
+
+    def pages(self, targets):
+        '''
+            Generate (region, namespace, functions, complete) for every page of the target namespaces,
+            complete is True for the last page of a namespace whose pages were all fetched.
+        '''
+        results = queue.Queue()
+        limit = ScfClient.LIST_PAGE_LIMIT
+
+        def fetch(region, namespace, offset):
+            try:
+                functions, total_count = self.client(region).list_function_page(namespace, offset, limit)
+                results.put((region, namespace, offset, functions, total_count, None))
+            except Exception as err:
+                # whatever fails, a result is put for the page, or the generator waits for it forever
+                results.put((region, namespace, offset, None, None, err))
+
+        pending = 0
+        # the pages of every namespace still to arrive, and the namespaces missing a page
+        remaining = {}
+        failed = set()
+        for region, namespace in targets:
+            self._pool.apply_async(fetch, (region, namespace, 0))
+            pending += 1
+            remaining[(region, namespace)] = 1
+
+        while pending:
+            region, namespace, offset, functions, total_count, err = results.get()
+            pending -= 1
+            key = (region, namespace)
+            remaining[key] -= 1
+            if err is not None:
+                failed.add(key)
+                Operation("list functions of {r} {ns} failure. Error: {e}.".format(r=region, ns=namespace,
+                                                                                  e=error_message(err))).warning()
+                continue
+            if offset == 0:
+                for next_offset in range(limit, total_count, limit):
+                    self._pool.apply_async(fetch, (region, namespace, next_offset))
+                    pending += 1
+                    remaining[key] += 1
+            yield region, namespace, functions, remaining[key] == 0 and key not in failed
+
+    def close(self):
+        self._pool.terminate()
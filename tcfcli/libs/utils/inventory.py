@@ -0,0 +1,212 @@
+# -*- coding: utf-8 -*-
+
+import os
+import time
+import sqlite3
+from collections import namedtuple
+from tcfcli.common.operation_msg import Operation
+from tcfcli.libs.utils.scf_client import ScfClient
+from tcfcli.libs.utils.function_lister import error_message
+
+home = os.path.expanduser('~')
+_INVENTORY_FILE = home + '/.tcli_inventory.db'
+
+# the attributes used by the commands, named as the function model of the cloud API
+InventoryFunction = namedtuple("InventoryFunction",
+                               ["FunctionName", "Runtime", "Status", "AddTime", "ModTime", "Description"])
+
+
+class FunctionInventory(object):
+    '''
+        Local inventory of the functions of every region and namespace, stored in SQLite.
+        A namespace is served from the inventory while its last sync is younger than the TTL. When it expires,
+        only the functions modified since the last sync are fetched (ordered by ModTime), the whole namespace
+        is fetched again only if the count no longer matches, which means functions were deleted.
+    '''
+    TTL = 300
+
+    def __init__(self, path=None, ttl=TTL):
+        self.ttl = ttl
+        try:
+            self._conn = sqlite3.connect(path if path else _INVENTORY_FILE, timeout=5)
+            self._create_tables()
+        except sqlite3.Error:
+            # the inventory is only a cache, keep it in memory if the home directory is not writable
+            self._conn = sqlite3.connect(":memory:")
+            self._create_tables()
+
+    def _create_tables(self):
+        self._conn.executescript('''
+            CREATE TABLE IF NOT EXISTS regions (
+                region TEXT PRIMARY KEY, synced_at REAL);
+            CREATE TABLE IF NOT EXISTS namespaces (
+                region TEXT, namespace TEXT, synced_at REAL, PRIMARY KEY (region, namespace));
+            CREATE TABLE IF NOT EXISTS functions (
+                region TEXT, namespace TEXT, name TEXT, runtime TEXT, status TEXT,
+                add_time TEXT, mod_time TEXT, description TEXT, PRIMARY KEY (region, namespace, name));
+        ''')
+        self._conn.commit()
+
+    def close(self):
+        self._conn.close()
+
+    def _is_fresh(self, synced_at):
+        return synced_at is not None and time.time() - synced_at < self.ttl
+
+    def namespaces(self, region):
+        '''
+            Return the cached namespace names of the region, or None if they have to be synced.
+        '''
+        row = self._conn.execute("SELECT synced_at FROM regions WHERE region = ?", (region,)).fetchone()
+        if not row or not self._is_fresh(row[0]):
+            return None
+        return [r[0] for r in self._conn.execute(
+            "SELECT namespace FROM namespaces WHERE region = ? ORDER BY namespace", (region,))]
+
+    def save_namespaces(self, region, names):
+        cached = set(r[0] for r in self._conn.execute("SELECT namespace FROM namespaces WHERE region = ?",
+                                                      (region,)))
+        for ns in cached - set(names):
+            self._conn.execute("DELETE FROM namespaces WHERE region = ? AND namespace = ?", (region, ns))
+            self._conn.execute("DELETE FROM functions WHERE region = ? AND namespace = ?", (region, ns))
+        for ns in set(names) - cached:
+            self._conn.execute("INSERT INTO namespaces (region, namespace, synced_at) VALUES (?, ?, NULL)",
+                               (region, ns))
+        self._conn.execute("INSERT OR REPLACE INTO regions (region, synced_at) VALUES (?, ?)", (region, time.time()))
+        self._conn.commit()
+
+    def is_fresh(self, region, namespace):
+        row = self._conn.execute("SELECT synced_at FROM namespaces WHERE region = ? AND namespace = ?",
+                                 (region, namespace)).fetchone()
+        return bool(row) and self._is_fresh(row[0])
+
+    def functions(self, region, namespace):
+        return [InventoryFunction(*r) for r in self._conn.execute(
+            "SELECT name, runtime, status, add_time, mod_time, description FROM functions "
+            "WHERE region = ? AND namespace = ? ORDER BY name", (region, namespace))]
+
+    def exists(self, region, namespace, name):
+        '''
+            Return whether the function exists, or None if the inventory of the namespace is expired.
+        '''
+        if not self.is_fresh(region, namespace):
+            return None
+        return self._conn.execute("SELECT 1 FROM functions WHERE region = ? AND namespace = ? AND name = ?",
+                                  (region, namespace, name)).fetchone() is not None
+
+    def remove(self, region, namespace, name):
+        self._conn.execute("DELETE FROM functions WHERE region = ? AND namespace = ? AND name = ?",
+                           (region, namespace, name))
+        self._conn.commit()
+
+    def invalidate(self, region, namespace=None):
+        '''
+            Force the next command to sync the namespace, the cached rows are kept for the incremental sync.
+        '''
+        if namespace is None:
+            self._conn.execute("UPDATE regions SET synced_at = NULL WHERE region = ?", (region,))
+            self._conn.execute("UPDATE namespaces SET synced_at = NULL WHERE region = ?", (region,))
+        else:
+            self._conn.execute("UPDATE namespaces SET synced_at = NULL WHERE region = ? AND namespace = ?",
+                               (region, namespace))
+        self._conn.commit()
+
+    def apply(self, region, namespace, functions, full):
+        if full:
+            self._conn.execute("DELETE FROM functions WHERE region = ? AND namespace = ?", (region, namespace))
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO functions (region, namespace, name, runtime, status, add_time, mod_time, "
+            "description) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            [(region, namespace, f.FunctionName, f.Runtime, f.Status, f.AddTime, f.ModTime, f.Description)
+             for f in functions])
+        self._conn.execute("INSERT OR REPLACE INTO namespaces (region, namespace, synced_at) VALUES (?, ?, ?)",
+                           (region, namespace, time.time()))
+        self._conn.commit()
+
+    def _sync_state(self, region, namespace):
+        rows = self._conn.execute("SELECT name, mod_time FROM functions WHERE region = ? AND namespace = ?",
+                                  (region, namespace)).fetchall()
+        return set(r[0] for r in rows), max([r[1] for r in rows] or [None])
+
+    @staticmethod
+    def fetch_changes(client, namespace, known, last_mod_time):
+        '''
+            Fetch the functions modified since last_mod_time, newest first. Return the functions and
+            whether they are the complete list of the namespace. Only network is done here, so it can
+            run in the worker threads.
+        '''
+        changes = []
+        offset = 0
+        while True:
+            page, total_count = client.list_function_page(namespace, offset, ScfClient.LIST_PAGE_LIMIT,
+                                                          "ModTime", "DESC")
+            for function in page:
+                # functions modified in the same second as the last sync are fetched again
+                if last_mod_time and function.ModTime < last_mod_time:
+                    if len(known | set(f.FunctionName for f in changes)) == total_count:
+                        return changes, False
+                    return FunctionInventory.fetch_changes(client, namespace, set(), None)
+                changes.append(function)
+            offset += len(page)
+            if not page or offset >= total_count:
+                return changes, True
+
+    def sync(self, lister, regions, namespace=None, refresh=False):
+        '''
+            Generate (region, namespace, functions) for every namespace of the regions, or only the given
+            namespace. Fresh namespaces come from the inventory at once. The expired ones are synced by
+            the thread pool of the lister: a namespace fetched as a whole is generated page by page as the
+            pages arrive, a namespace synced incrementally is generated once its changes are applied.
+        '''
+        region_namespaces = {}
+        expired = []
+        for region in regions:
+            names = None if refresh else self.namespaces(region)
+            if names is None:
+                expired.append(region)
+            else:
+                region_namespaces[region] = names
+        for region, names in zip(expired, lister.map(lambda r: lister.client(r).list_ns(), expired)):
+            if names is not None:
+                names = [ns["Name"] for ns in names]
+                self.save_namespaces(region, names)
+                region_namespaces[region] = names
+
+        full = []
+        stale = []
+        for region in regions:
+            for ns in region_namespaces.get(region, []):
+                if namespace is not None and ns != namespace:
+                    continue
+                if not refresh and self.is_fresh(region, ns):
+                    yield region, ns, self.functions(region, ns)
+                    continue
+                # --refresh fetches the whole namespace again instead of the modified functions
+                known, last_mod_time = (set(), None) if refresh else self._sync_state(region, ns)
+                if known:
+                    stale.append((region, ns, known, last_mod_time))
+                else:
+                    full.append((region, ns))
+
+        # the pages of a namespace are kept until the last one, it replaces the cached rows only if complete
+        fetched = {}
+        for region, ns, functions, complete in lister.pages(full):
+            fetched.setdefault((region, ns), []).extend(functions)
+            if complete:
+                self.apply(region, ns, fetched.pop((region, ns)), True)
+            yield region, ns, functions
+
+        def fetch(target):
+            region, ns, known, last_mod_time = target
+            try:
+                return target, self.fetch_changes(lister.client(region), ns, known, last_mod_time), None
+            except Exception as err:
+                return target, None, err
+
+        for (region, ns, known, last_mod_time), changes, err in lister.imap_unordered(fetch, stale):
+            if err is not None:
+                Operation("list functions of {r} {ns} failure. Error: {e}.".format(
+                    r=region, ns=ns, e=error_message(err))).warning()
+                continue
+            self.apply(region, ns, *changes)
+            yield region, ns, self.functions(region, ns)
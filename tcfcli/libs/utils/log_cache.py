@@ -0,0 +1,146 @@
+# -*- coding: utf-8 -*-
+
+import os
+import re
+import sqlite3
+from collections import namedtuple
+from datetime import datetime, timedelta
+
+home = os.path.expanduser('~')
+_LOG_CACHE_FILE = home + '/.tcli_logs.db'
+
+TM_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+# the attributes used by the commands, named as the function log model of the cloud API
+CachedLog = namedtuple("CachedLog", ["RequestId", "StartTime", "RetCode", "Duration", "BillDuration",
+                                     "MemUsage", "Log"])
+
+
+class LogFilter(object):
+    '''
+        Filters of the logs evaluated locally, on the cached logs as well as on the fetched ones.
+    '''
+
+    def __init__(self, pattern=None, ret_code=None, min_duration=None, failed=False):
+        self._regex = re.compile(pattern) if pattern else None
+        self._ret_code = ret_code
+        self._min_duration = min_duration
+        self._failed = failed
+
+    def __bool__(self):
+        return bool(self._regex or self._ret_code is not None or self._min_duration is not None or self._failed)
+
+    __nonzero__ = __bool__
+
+    def match(self, log):
+        if self._failed and log.RetCode == 0:
+            return False
+        if self._ret_code is not None and log.RetCode != self._ret_code:
+            return False
+        if self._min_duration is not None and (log.Duration or 0) < self._min_duration:
+            return False
+        if self._regex and not self._regex.search(log.Log or ""):
+            return False
+        return True
+
+
+class LogCache(object):
+    '''
+        Local store of the fetched logs, indexed by function and StartTime.
+        The time ranges completely fetched are recorded as coverage, a query fetches only the gaps
+        between them. The last SETTLE_SECONDS before now are never recorded as covered, their logs may
+        still be arriving. Logs older than RETENTION_DAYS are removed.
+    '''
+    SETTLE_SECONDS = 60
+    RETENTION_DAYS = 7
+
+    def __init__(self, path=None):
+        try:
+            self._conn = sqlite3.connect(path if path else _LOG_CACHE_FILE, timeout=5)
+            self._create_tables()
+        except sqlite3.Error:
+            # the cache is optional, keep it in memory if the home directory is not writable
+            self._conn = sqlite3.connect(":memory:")
+            self._create_tables()
+        self._prune()
+
+    def _create_tables(self):
+        self._conn.executescript('''
+            CREATE TABLE IF NOT EXISTS logs (
+                region TEXT, namespace TEXT, function TEXT, request_id TEXT, start_time TEXT,
+                ret_code INTEGER, duration REAL, bill_duration REAL, mem_usage REAL, log TEXT,
+                PRIMARY KEY (region, namespace, function, start_time, request_id));
+            CREATE TABLE IF NOT EXISTS coverage (
+                region TEXT, namespace TEXT, function TEXT, start_time TEXT, end_time TEXT);
+            CREATE INDEX IF NOT EXISTS coverage_function ON coverage (region, namespace, function);
+        ''')
+        self._conn.commit()
+
+    def close(self):
+        self._conn.close()
+
+    def _prune(self):
+        # the coverage is cut at the same time as the logs, it must not claim the removed logs are cached
+        expired = (datetime.now() - timedelta(days=self.RETENTION_DAYS)).strftime(TM_FORMAT)
+        self._conn.execute("DELETE FROM logs WHERE start_time < ?", (expired,))
+        self._conn.execute("DELETE FROM coverage WHERE end_time < ?", (expired,))
+        self._conn.execute("UPDATE coverage SET start_time = ? WHERE start_time < ?", (expired, expired))
+        self._conn.commit()
+
+    def add(self, key, logs):
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO logs (region, namespace, function, request_id, start_time, ret_code, duration, "
+            "bill_duration, mem_usage, log) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            [key + (log.RequestId, log.StartTime, log.RetCode, log.Duration, log.BillDuration, log.MemUsage,
+                    log.Log) for log in logs])
+        self._conn.commit()
+
+    def query(self, key, start, end):
+        cursor = self._conn.execute(
+            "SELECT request_id, start_time, ret_code, duration, bill_duration, mem_usage, log FROM logs "
+            "WHERE region = ? AND namespace = ? AND function = ? AND start_time >= ? AND start_time <= ? "
+            "ORDER BY start_time, request_id", key + (start, end))
+        for row in cursor:
+            yield CachedLog(*row)
+
+    def _coverage(self, key):
+        return [(datetime.strptime(s, TM_FORMAT), datetime.strptime(e, TM_FORMAT)) for s, e in self._conn.execute(
+            "SELECT start_time, end_time FROM coverage WHERE region = ? AND namespace = ? AND function = ? "
+            "ORDER BY start_time", key)]
+
+    def gaps(self, key, start, end):
+        '''
+            Return the (start, end) datetime ranges inside [start, end] which are not covered.
+        '''
+        gaps = []
+        cursor = start
+        for s, e in self._coverage(key):
+            if e < cursor:
+                continue
+            if s > end:
+                break
+            if s > cursor:
+                gaps.append((cursor, s - timedelta(seconds=1)))
+            cursor = e + timedelta(seconds=1)
+        if cursor <= end:
+            gaps.append((cursor, end))
+        return gaps
+
+    def cover(self, key, start, end):
+        '''
+            Record that all the logs in [start, end] are cached, merged with the adjacent ranges.
+        '''
+        end = min(end, datetime.now() - timedelta(seconds=self.SETTLE_SECONDS))
+        if end < start:
+            return
+        merged = []
+        for s, e in sorted(self._coverage(key) + [(start, end)]):
+            if merged and s <= merged[-1][1] + timedelta(seconds=1):
+                merged[-1] = (merged[-1][0], max(merged[-1][1], e))
+            else:
+                merged.append((s, e))
+        self._conn.execute("DELETE FROM coverage WHERE region = ? AND namespace = ? AND function = ?", key)
+        self._conn.executemany(
+            "INSERT INTO coverage (region, namespace, function, start_time, end_time) VALUES (?, ?, ?, ?, ?)",
+            [key + (s.strftime(TM_FORMAT), e.strftime(TM_FORMAT)) for s, e in merged])
+        self._conn.commit()
@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+
+import io
+import csv
+import gzip
+import json
+import six
+from tcfcli.common.user_exceptions import ArgsException
+
+# Namespace and Function are not attributes of a log, they are given by the sink of the function
+FIELDS = ["Namespace", "Function", "RequestId", "StartTime", "RetCode", "Duration", "BillDuration", "MemUsage", "Log"]
+
+
+class LogExporter(object):
+    '''
+        Write the logs to a file as they stream by, one structured row per log.
+        The format comes from the file name: '.jsonl' or '.csv', compressed with gzip if followed by '.gz'.
+    '''
+    BUFFER_SIZE = 1024 * 1024
+
+    def __init__(self, path, fields=None):
+        self.path = path
+        self.fields = fields if fields else FIELDS
+        self.count = 0
+        name = path[:-len(".gz")] if path.endswith(".gz") else path
+        if name.endswith(".jsonl"):
+            self._format = self._jsonl
+        elif name.endswith(".csv"):
+            self._format = self._csv
+        else:
+            raise ArgsException("The output file must end with .jsonl, .jsonl.gz, .csv or .csv.gz")
+
+        if path.endswith(".gz"):
+            self._file = gzip.open(path, "wb")
+        else:
+            self._file = io.open(path, "wb", buffering=self.BUFFER_SIZE)
+        if self._format == self._csv:
+            self._file.write(self._csv(self.fields))
+
+    def write(self, log, namespace=None, function=None):
+        known = {"Namespace": namespace, "Function": function}
+        self._file.write(self._format([known[f] if f in known else getattr(log, f, None) for f in self.fields]))
+        self.count += 1
+
+    def sink(self, namespace, function):
+        '''
+            Return the sink writing the logs of one function.
+        '''
+        return lambda log: self.write(log, namespace, function)
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def _jsonl(self, values):
+        line = json.dumps(dict(zip(self.fields, values)), ensure_ascii=False) + u"\n"
+        return line.encode("utf-8") if isinstance(line, six.text_type) else line
+
+    @staticmethod
+    def _csv(values):
+        buff = six.StringIO()
+        # the csv module of python 2 only writes bytes
+        csv.writer(buff).writerow([v.encode("utf-8") if six.PY2 and isinstance(v, six.text_type) else
+                                   ("" if v is None else v) for v in values])
+        line = buff.getvalue()
+        return line.encode("utf-8") if isinstance(line, six.text_type) else line
@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+
+import re
+import click
+from tcfcli.common.histogram import Histogram
+from tcfcli.common.operation_msg import Operation
+
+_DURATION = re.compile(r"(?<!Billed )(?<!Init )Duration:\s*([\d.]+)\s*ms", re.I)
+_BILLED_DURATION = re.compile(r"Billed Duration:\s*([\d.]+)\s*ms", re.I)
+_MEMORY_SIZE = re.compile(r"Memory(?: Size)?:\s*([\d.]+)\s*MB", re.I)
+_MAX_MEMORY_USED = re.compile(r"(?:Max Memory Used|MemUsage):\s*([\d.]+)\s*MB", re.I)
+_COLD_START = re.compile(r"Init Duration|Coldstart|Cold Start", re.I)
+_REPORT = re.compile(r"^(?:REPORT|Report) RequestId:.*$", re.M)
+
+
+def parse_report(log):
+    '''
+        Return the fields of the REPORT line of an invocation log, the fields of the log record
+        are used when the line or one of its fields is missing.
+    '''
+    match = _REPORT.search(log.Log or "")
+    report = match.group(0) if match else ""
+
+    def field(regex, default=None):
+        found = regex.search(report)
+        return float(found.group(1)) if found else default
+
+    return {
+        "duration": field(_DURATION, log.Duration),
+        "billed_duration": field(_BILLED_DURATION, log.BillDuration),
+        "memory_size": field(_MEMORY_SIZE),
+        # MemUsage of the log record is in bytes
+        "max_memory_used": field(_MAX_MEMORY_USED, log.MemUsage / 1024.0 / 1024 if log.MemUsage else None),
+        "cold_start": bool(_COLD_START.search(log.Log or "")),
+    }
+
+
+class InvocationStats(object):
+    '''
+        Performance summary of the invocations of a function, computed while the logs stream by.
+    '''
+    PERCENTILES = (50, 90, 99)
+
+    def __init__(self, function):
+        self.function = function
+        self.invocations = 0
+        self.errors = 0
+        self.cold_starts = 0
+        self.gb_seconds = 0.0
+        self.memory_size = None
+        self.duration = Histogram()
+        self.memory_used = Histogram()
+
+    def add(self, log):
+        report = parse_report(log)
+        self.invocations += 1
+        if log.RetCode != 0:
+            self.errors += 1
+        if report["cold_start"]:
+            self.cold_starts += 1
+        if report["duration"] is not None:
+            self.duration.add(report["duration"])
+        if report["max_memory_used"] is not None:
+            self.memory_used.add(report["max_memory_used"])
+        if report["memory_size"]:
+            self.memory_size = report["memory_size"]
+            billed = report["billed_duration"] if report["billed_duration"] is not None else report["duration"]
+            self.gb_seconds += (billed or 0) / 1000.0 * report["memory_size"] / 1024.0
+
+    def show(self):
+        Operation("Function: %s" % self.function).process()
+        if not self.invocations:
+            Operation("There is no invocation during this time period.").information()
+            return
+
+        def ms(value):
+            return "-" if value is None else "%.2f ms" % value
+
+        click.secho("  Invocations:       %d" % self.invocations)
+        click.secho("  Errors:            %d (%.2f%%)" % (self.errors, 100.0 * self.errors / self.invocations),
+                    fg="red" if self.errors else None)
+        click.secho("  Cold starts:       %d" % self.cold_starts)
+        click.secho("  Duration:          " + "  ".join(
+            ["p%d %s" % (p, ms(self.duration.percentile(p))) for p in self.PERCENTILES] +
+            ["max %s" % ms(self.duration.max)]))
+        if self.memory_used.count:
+            line = "  Max memory used:   p50 %.2f MB  max %.2f MB" % (self.memory_used.percentile(50),
+                                                                      self.memory_used.max)
+            if self.memory_size:
+                line += "  of %d MB, headroom %.1f%%" % (self.memory_size,
+                                                         100.0 * (1 - self.memory_used.max / self.memory_size))
+            click.secho(line)
+        click.secho("  Billed GB-seconds: %s" % ("%.4f" % self.gb_seconds if self.memory_size else "-"))
+        click.secho("\n")
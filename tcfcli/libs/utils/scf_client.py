@@ -20,6 +20,7 @@ import click
 
 class ScfClient(object):
     CLOUD_API_REQ_TIMEOUT = 120
+    LIST_PAGE_LIMIT = 100
 
     def __init__(self, region=None):
         uc = UserConfig()
@@ -52,11 +53,7 @@ class ScfClient(object):
 
     def delete_function(self, function_name=None, namespace='default'):
         try:
-            req = models.DeleteFunctionRequest()
-            req.FunctionName = function_name
-            req.Namespace = namespace
-            resp = self._client.DeleteFunction(req)
-            return resp.to_json_string()
+            return self.remove_function(function_name, namespace)
         except TencentCloudSDKException as err:
             if sys.version_info[0] == 3:
                 s = err.get_message()
@@ -65,15 +62,24 @@ class ScfClient(object):
             # click.secho("Get functions failure. Error: {e}.".format(e=s), fg="red")
         return None
 
+    def remove_function(self, function_name, namespace='default'):
+        '''
+            Same as delete_function, but the TencentCloudSDKException is raised to the caller.
+        '''
+        req = models.DeleteFunctionRequest()
+        req.FunctionName = function_name
+        req.Namespace = namespace
+        resp = self._client.DeleteFunction(req)
+        return resp.to_json_string()
+
     def list_function(self, namespace=None):
         try:
-            req = models.ListFunctionsRequest()
-            req.Offset = 0
-            req.Limit = 20
-            req.Namespace = namespace
-            resp = self._client.ListFunctions(req)
-            functions = resp.Functions
-            return functions
+            functions = []
+            while True:
+                page, total_count = self.list_function_page(namespace, len(functions))
+                functions.extend(page)
+                if not page or len(functions) >= total_count:
+                    return functions
         except TencentCloudSDKException as err:
             if sys.version_info[0] == 3:
                 s = err.get_message()
@@ -82,6 +88,19 @@ class ScfClient(object):
             Operation("list functions failure. Error: {e}.".format(e=s)).warning()
         return None
 
+    def list_function_page(self, namespace=None, offset=0, limit=LIST_PAGE_LIMIT, order_by=None, order=None):
+        '''
+            Return one page of the functions and the total count of the namespace.
+        '''
+        req = models.ListFunctionsRequest()
+        req.Offset = offset
+        req.Limit = limit
+        req.Namespace = namespace
+        req.Orderby = order_by
+        req.Order = order
+        resp = self._client.ListFunctions(req)
+        return resp.Functions or [], resp.TotalCount
+
     def update_func_code(self, func, func_name, func_ns):
         req = models.UpdateFunctionCodeRequest()
         req.Namespace = func_ns
@@ -221,8 +240,7 @@ class ScfClient(object):
 
     def get_ns(self, namespace):
         try:
-            resp = self._client_ext.ListNamespaces()
-            namespaces = resp.get("Namespaces", [])
+            namespaces = self._list_all_ns()
             for ns_dict in namespaces:
                 if namespace == ns_dict.get("Name"):
                     return namespace
@@ -244,9 +262,7 @@ class ScfClient(object):
 
     def list_ns(self):
         try:
-            resp = self._client_ext.ListNamespaces()
-            namespaces = resp.get("Namespaces", [])
-            return namespaces
+            return self._list_all_ns()
         except TencentCloudSDKException as err:
             if sys.version_info[0] == 3:
                 s = err.get_message()
@@ -255,6 +271,15 @@ class ScfClient(object):
             Operation("list namespace failure. Error: {e}.".format(e=s)).warning()
         return None
 
+    def _list_all_ns(self):
+        namespaces = []
+        while True:
+            resp = self._client_ext.ListNamespaces(len(namespaces), self.LIST_PAGE_LIMIT)
+            page = resp.get("Namespaces", [])
+            namespaces.extend(page)
+            if not page or len(namespaces) >= resp.get("TotalCount", 0):
+                return namespaces
+
     @staticmethod
     def _fill_trigger_req_desc(req, t, proper):
         if t == tsmacro.TrTimer:
@@ -345,11 +370,11 @@ class ScfClient(object):
 
 
 class ScfClientExt(scf_client.ScfClient):
-    def ListNamespaces(self):
+    def ListNamespaces(self, offset=0, limit=20):
         try:
             request = {
-                'Offset': 0,
-                'Limit': 20,
+                'Offset': offset,
+                'Limit': limit,
             }
             body = self.call("ListNamespaces", request)
             response = json.loads(body)
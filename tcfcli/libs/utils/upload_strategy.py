@@ -0,0 +1,194 @@
+# -*- coding: utf-8 -*-
+
+import io
+import os
+import json
+import math
+import time
+import click
+import threading
+from tcfcli.common.operation_msg import Operation
+
+home = os.path.expanduser('~')
+_UPLOAD_STATS_FILE = home + '/.tcli_upload_stats.json'
+
+_MB = 1024 * 1024
+
+
+class UploadStrategy(object):
+    INLINE = "inline"
+    SINGLE_PUT = "single-put"
+    MULTIPART = "multipart"
+
+    # limits of the cloud api and COS
+    INLINE_LIMIT = 20 * _MB
+    INLINE_RECOMMEND_LIMIT = 8 * _MB
+    SINGLE_PUT_LIMIT = 5 * 1024 * _MB
+    MAX_PARTS = 10000
+
+    MULTIPART_MIN_SIZE = 5 * _MB
+    MULTIPART_MIN_SECONDS = 3
+    MAX_THREAD = 10
+    # throughput assumed for a single connection before anything is measured
+    DEFAULT_THROUGHPUT = 1 * _MB
+
+    def __init__(self, mode, size, threads=1, part_size=None, throughput=None):
+        self.mode = mode
+        self.size = size
+        self.threads = threads
+        self.part_size = part_size
+        self.throughput = throughput
+
+    @property
+    def estimated_seconds(self):
+        throughput = self.throughput or self.DEFAULT_THROUGHPUT
+        return float(self.size) / (throughput * self.threads)
+
+    def describe(self):
+        if self.mode == self.MULTIPART:
+            msg = "multipart upload with %d threads, part size %d MB" % (self.threads, self.part_size)
+        elif self.mode == self.SINGLE_PUT:
+            msg = "single PUT upload"
+        else:
+            msg = "inline upload by TencentCloud Cloud API"
+        if self.throughput:
+            msg += ", measured throughput %s/s, estimated %.1fs" % (
+                UploadProgress.format_size(self.throughput), self.estimated_seconds)
+        return msg
+
+    @staticmethod
+    def choose(size, region, using_cos):
+        '''
+            Choose how a package of `size` bytes is uploaded.
+            `using_cos` tells whether a COS bucket is available (--cos-bucket or using-cos, not --without-cos),
+            without one the package is uploaded inline by the cloud api. With one, single PUT or multipart is
+            chosen from the throughput measured by previous uploads to the region: multipart only pays off
+            when the upload would take a while on a single connection.
+        '''
+        if not using_cos:
+            return UploadStrategy(UploadStrategy.INLINE, size)
+
+        throughput = UploadStats().throughput(region)
+        single = UploadStrategy(UploadStrategy.SINGLE_PUT, size, throughput=throughput)
+        if size < UploadStrategy.SINGLE_PUT_LIMIT and (size < UploadStrategy.MULTIPART_MIN_SIZE or
+                                                       single.estimated_seconds < UploadStrategy.MULTIPART_MIN_SECONDS):
+            return single
+
+        threads = int(math.ceil(single.estimated_seconds / UploadStrategy.MULTIPART_MIN_SECONDS))
+        threads = max(2, min(UploadStrategy.MAX_THREAD, threads))
+        # at least two parts for every thread, parts are counted in MB
+        part_size = max(1, int(size // (threads * 2 * _MB)))
+        if size // (part_size * _MB) > UploadStrategy.MAX_PARTS:
+            part_size = int(math.ceil(float(size) / (UploadStrategy.MAX_PARTS * _MB)))
+        return UploadStrategy(UploadStrategy.MULTIPART, size, threads, part_size, throughput)
+
+
+class UploadStats(object):
+    '''
+        Upload throughput of the previous runs, stored per region as an exponential moving average
+        of the throughput of a single connection.
+    '''
+    WEIGHT = 0.3
+    MIN_SAMPLE_SIZE = 256 * 1024
+
+    def __init__(self, stats_file=_UPLOAD_STATS_FILE):
+        self._stats_file = stats_file
+        self._stats = self._load()
+
+    def throughput(self, region):
+        return self._stats.get(region, {}).get("throughput")
+
+    def record(self, region, size, seconds, threads=1):
+        # small uploads are dominated by latency and tell nothing about the bandwidth
+        if size < self.MIN_SAMPLE_SIZE or seconds <= 0:
+            return
+        sample = float(size) / seconds / threads
+        stats = self._stats.setdefault(region, {})
+        last = stats.get("throughput")
+        stats["throughput"] = sample if not last else last * (1 - self.WEIGHT) + sample * self.WEIGHT
+        stats["samples"] = stats.get("samples", 0) + 1
+        stats["update_time"] = time.strftime("%Y-%m-%d %H:%M:%S")
+        self._dump()
+
+    def _load(self):
+        try:
+            with io.open(self._stats_file, mode="r", encoding="utf-8") as f:
+                return json.load(f)
+        except Exception:
+            return {}
+
+    def _dump(self):
+        try:
+            with open(self._stats_file, "w") as f:
+                f.write(json.dumps(self._stats))
+        except Exception:
+            pass
+
+
+class UploadProgress(object):
+    REFRESH_INTERVAL = 0.5
+
+    def __init__(self, total):
+        self._total = total
+        self._done = 0
+        self._start = time.time()
+        self._last_show = 0
+        self._lock = threading.Lock()
+
+    def update(self, size):
+        with self._lock:
+            self._done += size
+            now = time.time()
+            if now - self._last_show < self.REFRESH_INTERVAL and self._done < self._total:
+                return
+            self._last_show = now
+            click.secho("\r[>] Uploading %3d%% (%s / %s, %s/s)  " % (
+                self._done * 100 // max(self._total, 1),
+                self.format_size(self._done),
+                self.format_size(self._total),
+                self.format_size(self.throughput)), nl=False, fg="cyan")
+
+    def finish(self):
+        click.secho("")
+        Operation("Upload %s in %.1fs, throughput %s/s" % (
+            self.format_size(self._total), self.elapsed, self.format_size(self.throughput))).success()
+
+    @property
+    def elapsed(self):
+        return max(time.time() - self._start, 0.001)
+
+    @property
+    def throughput(self):
+        return self._done / self.elapsed
+
+    @staticmethod
+    def format_size(size):
+        if size >= _MB:
+            return "%.1f MB" % (float(size) / _MB)
+        return "%.1f KB" % (float(size) / 1024)
+
+
+class ProgressReader(object):
+    '''
+        File-like wrapper of the package content which reports the progress when the body is sent.
+    '''
+
+    def __init__(self, data, progress):
+        self._buff = io.BytesIO(data)
+        self._size = len(data)
+        self._progress = progress
+
+    def __len__(self):
+        return self._size
+
+    def read(self, size=-1):
+        chunk = self._buff.read(size)
+        if chunk:
+            self._progress.update(len(chunk))
+        return chunk
+
+    def seek(self, offset, whence=0):
+        return self._buff.seek(offset, whence)
+
+    def tell(self):
+        return self._buff.tell()
@@ -0,0 +1,54 @@
+import io
+import os
+import shutil
+import tempfile
+import unittest
+
+from click.testing import CliRunner
+from tcfcli.cmds.deploy import cli as deploy_cli
+from tcfcli.cmds.deploy.journal import DeployJournal
+
+
+class TestDeployJournal(unittest.TestCase):
+    def setUp(self):
+        super(TestDeployJournal, self).setUp()
+        self.dir = tempfile.mkdtemp()
+        self.template = os.path.join(self.dir, "template.yaml")
+        with io.open(self.template, "w", encoding="utf-8") as f:
+            f.write(u"Resources: {}\n")
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+        super(TestDeployJournal, self).tearDown()
+
+    def journal(self, cos_bucket=None, without_cos=False, using_cos=False):
+        return DeployJournal(self.dir, self.template, "ap-guangzhou", None, None, cos_bucket, without_cos, using_cos)
+
+    def test_resume(self):
+        self.journal(cos_bucket="bucket").mark("default", "hello", DeployJournal.UPLOADED, {"cos_object_name": "/a"})
+        journal = self.journal(cos_bucket="bucket")
+        self.assertTrue(journal.load())
+        self.assertEqual({"cos_object_name": "/a"}, journal.get("default", "hello", DeployJournal.UPLOADED))
+
+    def test_upload_mode_mismatch(self):
+        for first, second in (({"cos_bucket": "bucket"}, {"cos_bucket": "other"}),
+                              ({"cos_bucket": "bucket"}, {"without_cos": True}),
+                              ({"using_cos": True}, {})):
+            self.journal(**first).mark("default", "hello", DeployJournal.UPLOADED, {"cos_object_name": "/a"})
+            journal = self.journal(**second)
+            self.assertFalse(journal.load())
+            # the journal of the other upload mode is thrown away
+            self.assertFalse(os.path.exists(os.path.join(self.dir, DeployJournal.NAME)))
+            self.assertIsNone(journal.get("default", "hello", DeployJournal.UPLOADED))
+
+    def test_resume_with_manifest(self):
+        manifest = os.path.join(self.dir, "manifest.json")
+        with io.open(manifest, "w", encoding="utf-8") as f:
+            f.write(u"{}")
+        result = CliRunner().invoke(deploy_cli.deploy, ["--from-manifest", manifest, "--resume"])
+        self.assertNotEqual(0, result.exit_code)
+        self.assertIn("--resume can't be used with --from-manifest", result.output)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,42 @@
+import unittest
+
+from tcfcli.libs.utils.function_lister import FunctionLister
+
+
+class FakeClient(object):
+    def __init__(self, total_count, fail_offset=None):
+        self.total_count = total_count
+        self.fail_offset = fail_offset
+
+    def list_function_page(self, namespace, offset, limit):
+        if offset == self.fail_offset:
+            raise ValueError("connection reset")
+        return ["%s-%d" % (namespace, i) for i in range(offset, min(offset + limit, self.total_count))], \
+            self.total_count
+
+
+class TestFunctionLister(unittest.TestCase):
+    def setUp(self):
+        super(TestFunctionLister, self).setUp()
+        self.lister = FunctionLister(4)
+
+    def tearDown(self):
+        self.lister.close()
+        super(TestFunctionLister, self).tearDown()
+
+    def test_pages(self):
+        self.lister.client = lambda region: FakeClient(250)
+        pages = list(self.lister.pages([("ap-guangzhou", "default")]))
+        self.assertEqual(3, len(pages))
+        self.assertEqual(250, sum(len(functions) for _, _, functions, _ in pages))
+        self.assertEqual([False, False, True], [complete for _, _, _, complete in pages])
+
+    def test_failed_page_does_not_block(self):
+        self.lister.client = lambda region: FakeClient(250, fail_offset=100)
+        pages = list(self.lister.pages([("ap-guangzhou", "default")]))
+        self.assertEqual(150, sum(len(functions) for _, _, functions, _ in pages))
+        self.assertFalse(any(complete for _, _, _, complete in pages))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,58 @@
+import math
+import random
+import unittest
+
+from tcfcli.common.histogram import Histogram
+
+
+def exact_percentile(values, p):
+    # the value at the rank used by Histogram.percentile
+    values = sorted(values)
+    return values[int(math.floor(p / 100.0 * (len(values) - 1)))]
+
+
+class TestHistogram(unittest.TestCase):
+    def assertWithin(self, expected, actual, accuracy):
+        self.assertLessEqual(abs(actual - expected), expected * accuracy,
+                             "%s is not within %s of %s" % (actual, accuracy, expected))
+
+    def test_uniform_sample(self):
+        values = list(range(1, 1001))
+        random.Random(1).shuffle(values)
+        histogram = Histogram()
+        for value in values:
+            histogram.add(value)
+
+        for p in (0, 1, 25, 50, 90, 95, 99, 100):
+            self.assertWithin(exact_percentile(values, p), histogram.percentile(p), 0.01)
+        self.assertEqual(1, histogram.min)
+        self.assertEqual(1000, histogram.max)
+        self.assertEqual(500.5, histogram.mean)
+
+    def test_skewed_sample(self):
+        rand = random.Random(2)
+        values = [rand.lognormvariate(3, 1.5) for _ in range(20000)]
+        histogram = Histogram(accuracy=0.005)
+        for value in values:
+            histogram.add(value)
+
+        for p in (50, 90, 99, 99.9):
+            self.assertWithin(exact_percentile(values, p), histogram.percentile(p), 0.005)
+
+    def test_zeros_and_single_value(self):
+        histogram = Histogram()
+        self.assertIsNone(histogram.percentile(50))
+        self.assertIsNone(histogram.mean)
+
+        histogram.add(42.0)
+        # a single value is clipped to the observed range, so it is exact
+        self.assertEqual(42.0, histogram.percentile(50))
+
+        for _ in range(3):
+            histogram.add(0)
+        self.assertEqual(0, histogram.percentile(50))
+        self.assertEqual(42.0, histogram.percentile(100))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+import unittest
+
+from tcfcli.libs.utils.function_lister import FunctionLister
+from tcfcli.libs.utils.inventory import FunctionInventory, InventoryFunction
+
+
+class FakeClient(object):
+    def __init__(self, functions):
+        self.functions = functions
+
+    def list_ns(self):
+        return [{"Name": "default"}]
+
+    def list_function_page(self, namespace, offset, limit, order_by=None, order=None):
+        functions = self.functions
+        if order_by == "ModTime":
+            functions = sorted(functions, key=lambda f: f.ModTime, reverse=order == "DESC")
+        return functions[offset:offset + limit], len(functions)
+
+
+def function(i, mod_time="2020-01-01 00:00:00"):
+    return InventoryFunction("func%03d" % i, "Python3.6", "Active", "2020-01-01 00:00:00", mod_time, "")
+
+
+class TestFunctionInventory(unittest.TestCase):
+    def setUp(self):
+        super(TestFunctionInventory, self).setUp()
+        self.client = FakeClient([function(i) for i in range(250)])
+        self.lister = FunctionLister(4)
+        self.lister.client = lambda region: self.client
+        self.inventory = FunctionInventory(":memory:")
+
+    def tearDown(self):
+        self.lister.close()
+        self.inventory.close()
+        super(TestFunctionInventory, self).tearDown()
+
+    def sync(self, refresh=False):
+        return list(self.inventory.sync(self.lister, ["ap-guangzhou"], refresh=refresh))
+
+    def test_full_sync_streams_pages(self):
+        synced = self.sync()
+        self.assertEqual(3, len(synced))
+        self.assertEqual(250, sum(len(functions) for _, _, functions in synced))
+        self.assertTrue(self.inventory.is_fresh("ap-guangzhou", "default"))
+        self.assertEqual(250, len(self.inventory.functions("ap-guangzhou", "default")))
+
+        # fresh, served from the inventory as one namespace
+        self.assertEqual(1, len(self.sync()))
+
+    def test_incremental_sync(self):
+        self.sync()
+        self.client.functions = self.client.functions[:-1] + [function(249, "2020-02-01 00:00:00")]
+        self.inventory.invalidate("ap-guangzhou")
+
+        synced = self.sync()
+        self.assertEqual(1, len(synced))
+        functions = dict((f.FunctionName, f) for f in synced[0][2])
+        self.assertEqual(250, len(functions))
+        self.assertEqual("2020-02-01 00:00:00", functions["func249"].ModTime)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,103 @@
+import io
+import os
+import json
+import shutil
+import tempfile
+import unittest
+
+from tcfcli.common.user_exceptions import UserException
+from tcfcli.cmds.local.invoke.batch import load_events, BatchInvoker, BatchStats, InvokeResult
+
+
+class FakeRuntimeManager(object):
+    '''
+        Writes the logs and the return value of an invocation like a runtime, {"fail": true} fails.
+    '''
+
+    def __init__(self):
+        self.invocations = 0
+
+    def invoke(self, func_name, event=None, stdout=None, stderr=None):
+        self.invocations += 1
+        event = json.loads(event)
+        warm = self.invocations > 1
+        ret = json.dumps(event.get("value"))
+        report = b"REPORT RequestId: 1 Duration: 1.00 ms Max Memory Used: 32 MB"
+        stdout.write(b"log line\n")
+        if event.get("fail"):
+            stderr.write(b"Traceback\n" + report)
+            return warm
+        # the return value is the last line of stdout, after the REPORT line
+        stdout.write(report + b"\n" + ret.encode("utf-8") + b"\n")
+        return warm
+
+
+class TestLoadEvents(unittest.TestCase):
+    def setUp(self):
+        super(TestLoadEvents, self).setUp()
+        self.dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+        super(TestLoadEvents, self).tearDown()
+
+    def test_jsonl(self):
+        path = os.path.join(self.dir, "events.jsonl")
+        with io.open(path, "w", encoding="utf-8") as f:
+            f.write(u'{"a": 1}\n\n{"a": 2}\n')
+        self.assertEqual([("line 1", '{"a": 1}'), ("line 3", '{"a": 2}')], load_events(path))
+
+    def test_directory(self):
+        for name in ("b.json", "a.json", "notes.txt"):
+            with io.open(os.path.join(self.dir, name), "w", encoding="utf-8") as f:
+                f.write(u'{}')
+        self.assertEqual(["a.json", "b.json"], [name for name, _ in load_events(self.dir)])
+
+    def test_empty(self):
+        self.assertRaises(UserException, load_events, self.dir)
+
+
+class TestBatchInvoker(unittest.TestCase):
+    def invoke(self, event):
+        return BatchInvoker(FakeRuntimeManager(), "func").invoke("event", json.dumps(event))
+
+    def test_return_value(self):
+        result = self.invoke({"value": {"ok": 1}})
+        self.assertTrue(result.Success)
+        self.assertEqual('{"ok": 1}', result.ReturnValue)
+        self.assertEqual(32, result.MemUsage)
+        self.assertTrue(result.ColdStart)
+        self.assertIn("log line", result.Log)
+
+    def test_failure(self):
+        result = self.invoke({"fail": True})
+        self.assertFalse(result.Success)
+        self.assertIsNone(result.ReturnValue)
+
+    def test_run(self):
+        manager = FakeRuntimeManager()
+        events = [(i, json.dumps({"value": i})) for i in range(20)]
+        results = list(BatchInvoker(manager, "func", concurrency=4).run(events))
+        self.assertEqual(20, len(results))
+        self.assertEqual(sorted(range(20)), sorted(r.Event for r in results))
+
+
+class TestBatchStats(unittest.TestCase):
+    def test_summary(self):
+        stats = BatchStats()
+        for i in range(100):
+            stats.add(InvokeResult(Event=i, Success=i % 10 != 0, ReturnValue=None, Duration=float(i + 1),
+                                   MemUsage=64, ColdStart=i < 5, Error=None, Log=""))
+        summary = stats.summary()
+        self.assertEqual(100, summary["invocations"])
+        self.assertEqual(10, summary["failed"])
+        self.assertAlmostEqual(0.1, summary["error_rate"])
+        self.assertEqual(5, summary["cold"]["count"])
+        self.assertEqual(95, summary["warm"]["count"])
+        self.assertEqual(100, summary["latency"]["max"])
+        self.assertAlmostEqual(50, summary["latency"]["p50"], delta=1)
+        self.assertEqual(64, summary["memory"]["max"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,57 @@
+import io
+import os
+import json
+import shutil
+import tempfile
+import unittest
+
+from click.testing import CliRunner
+from tcfcli.common.user_exceptions import UserException
+from tcfcli.cmds.local.bench.cli import Bench
+from tcfcli.cmds.local.invoke.batch import BatchStats, InvokeResult
+
+
+def summary(duration, failed=0):
+    stats = BatchStats()
+    for i in range(10):
+        stats.add(InvokeResult(Event=i, Success=i >= failed, ReturnValue=None, Duration=duration, MemUsage=64,
+                               ColdStart=i == 0, Error=None, Log=""))
+    return stats.summary()
+
+
+class TestBench(unittest.TestCase):
+    def compare(self, baseline, current):
+        runner = CliRunner()
+        with runner.isolation() as out:
+            Bench._compare(baseline, current)
+            return out.getvalue().decode("utf-8")
+
+    def test_compare(self):
+        output = self.compare(summary(10.0), summary(20.0, failed=1))
+        lines = dict((line.split()[0] + " " + line.split()[1], line) for line in output.splitlines()[1:])
+        self.assertIn("+100.0%", lines["Latency p50"])
+        self.assertIn("(+10.00 %)", lines["Error rate"])
+
+    def test_compare_missing_figures(self):
+        baseline = summary(10.0)
+        del baseline["memory"]
+        output = self.compare(baseline, summary(10.0))
+        self.assertNotIn("Memory max", output)
+        self.assertIn("(+0.0%)", output)
+
+    def test_load(self):
+        path = tempfile.mkdtemp()
+        try:
+            name = os.path.join(path, "before.json")
+            with io.open(name, "w", encoding="utf-8") as f:
+                f.write(u"not json")
+            self.assertRaises(UserException, Bench._load, name)
+            with io.open(name, "w", encoding="utf-8") as f:
+                f.write(u"%s" % json.dumps(summary(10.0)))
+            self.assertEqual(10, Bench._load(name)["invocations"])
+        finally:
+            shutil.rmtree(path)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+import json
+import time
+import random
+import unittest
+
+from tcfcli.cmds.local.libs.apigw.local_service import LocalService, Route
+
+RouteCount = 3000
+
+
+class FakeRuntimeManager(object):
+    def __init__(self):
+        self.invoked = []
+
+    def invoke(self, func_name, event=None, stdout=None, stderr=None):
+        self.invoked.append((func_name, json.loads(event)))
+        ret = json.dumps({"statusCode": 200, "headers": {"Content-Type": "application/json"}, "body": func_name})
+        stdout.write(ret.encode("utf-8") + b"\n")
+        return True
+
+
+def create_service(route_count, manager):
+    routes = []
+    for i in range(route_count):
+        routes.append(Route(method=["GET"], path="/svc%d/user/{id}" % i, func_name="get%d" % i))
+        routes.append(Route(method=["POST"], path="/svc%d/user/{id}" % i, func_name="post%d" % i))
+        routes.append(Route(method=["GET"], path="/svc%d/files/{proxy+}" % i, func_name="files%d" % i))
+    service = LocalService(routes_list=routes, runtime_manager=manager, concurrency=1)
+    service.create()
+    return service
+
+
+class TestLocalRoute(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        # the routes are only built once, the tests do not change them
+        cls.manager = FakeRuntimeManager()
+        cls.service = create_service(RouteCount, cls.manager)
+        cls.client = cls.service._server.test_client()
+
+    def setUp(self):
+        super(TestLocalRoute, self).setUp()
+        self.manager.invoked = []
+
+    def test_parameterized_route(self):
+        response = self.client.get("/svc42/user/1001")
+        self.assertEqual(200, response.status_code)
+        self.assertEqual(b"get42", response.data)
+
+        func_name, event = self.manager.invoked[-1]
+        self.assertEqual("get42", func_name)
+        self.assertEqual("/svc42/user/{id}", event["requestContext"]["path"])
+        self.assertEqual({"id": "1001"}, event["pathParameters"])
+
+    def test_method_and_proxy_route(self):
+        self.assertEqual(b"post7", self.client.post("/svc7/user/1").data)
+        self.assertEqual(b"files7", self.client.get("/svc7/files/a/b.txt").data)
+        self.assertEqual({"proxy": "a/b.txt"}, self.manager.invoked[-1][1]["pathParameters"])
+        self.assertEqual(405, self.client.delete("/svc7/user/1").status_code)
+        self.assertEqual(404, self.client.get("/svc7/unknown").status_code)
+
+    def match_time(self, service, route_count, lookups):
+        paths = ["/svc%d/user/%d" % (random.randrange(route_count), i) for i in range(lookups)]
+        start = time.time()
+        for path in paths:
+            self.assertIsNotNone(service._routes.match(path))
+        return time.time() - start
+
+    def test_dispatch_does_not_grow_with_routes(self):
+        lookups = 2000
+        small_service = create_service(1, FakeRuntimeManager())
+        small = self.match_time(small_service, 1, lookups)
+        large = self.match_time(self.service, RouteCount, lookups)
+        # a scan of every route would be thousands of times slower with RouteCount * 3 routes
+        self.assertLess(large, small * 5 + 0.05)
+
+
+if __name__ == "__main__":
+    unittest.main()
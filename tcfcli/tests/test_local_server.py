@@ -0,0 +1,206 @@
+import json
+import time
+import socket
+import threading
+import unittest
+from six.moves import http_client
+
+from tcfcli.cmds.local.libs.apigw.local_service import LocalService, Route
+from tcfcli.cmds.local.libs.apigw.server import PooledWSGIServer, ConcurrencyLimit
+
+
+class Server(object):
+    def __init__(self, app, workers=1, backlog=1):
+        self.server = PooledWSGIServer('127.0.0.1', 0, app, workers, backlog)
+        self.thread = threading.Thread(target=self.server.serve_forever)
+        self.thread.daemon = True
+        self.thread.start()
+
+    def connect(self):
+        return http_client.HTTPConnection('127.0.0.1', self.server.port, timeout=10)
+
+    def get(self, path):
+        connection = self.connect()
+        try:
+            connection.request('GET', path)
+            response = connection.getresponse()
+            return response.status, response.read()
+        finally:
+            connection.close()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class BlockingApp(object):
+    '''
+        WSGI app answering /slow only once `release` is set, every other path at once.
+    '''
+
+    def __init__(self, limit=None):
+        self.limit = limit
+        self.entered = threading.Event()
+        self.release = threading.Event()
+
+    def __call__(self, environ, start_response):
+        if environ['PATH_INFO'] == '/slow':
+            if self.limit and not self.limit.acquire():
+                start_response('429 Too Many Requests', [('Content-Length', '0')])
+                return [b'']
+            self.entered.set()
+            self.release.wait(10)
+            if self.limit:
+                self.limit.release()
+        start_response('200 OK', [('Content-Length', '2')])
+        return [b'ok']
+
+
+def wait_for(condition, timeout=5):
+    deadline = time.time() + timeout
+    while not condition() and time.time() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+class TestPooledWSGIServer(unittest.TestCase):
+    def setUp(self):
+        super(TestPooledWSGIServer, self).setUp()
+        self.servers = []
+
+    def tearDown(self):
+        for server in self.servers:
+            server.close()
+        super(TestPooledWSGIServer, self).tearDown()
+
+    def serve(self, app, workers=1, backlog=1):
+        server = Server(app, workers, backlog)
+        self.servers.append(server)
+        return server
+
+    def test_idle_keep_alive_does_not_hold_worker(self):
+        server = self.serve(BlockingApp())
+        idle = server.connect()
+        idle.request('GET', '/')
+        self.assertEqual(b'ok', idle.getresponse().read())
+
+        start = time.time()
+        self.assertEqual((200, b'ok'), server.get('/'))
+        self.assertLess(time.time() - start, 1)
+
+        # the idle connection is still usable
+        idle.request('GET', '/')
+        self.assertEqual(b'ok', idle.getresponse().read())
+        idle.close()
+
+    def test_pipelined_requests(self):
+        server = self.serve(BlockingApp())
+        connection = socket.create_connection(('127.0.0.1', server.server.port), timeout=5)
+        connection.sendall(b'GET / HTTP/1.1\r\nHost: x\r\n\r\nGET / HTTP/1.1\r\nHost: x\r\n\r\n')
+        data = b''
+        while data.count(b'200 OK') < 2:
+            data += connection.recv(4096)
+        connection.close()
+
+    def test_busy_server_answers_503(self):
+        app = BlockingApp()
+        server = self.serve(app, workers=1, backlog=1)
+        results = []
+        first = threading.Thread(target=lambda: results.append(server.get('/slow')))
+        first.start()
+        self.assertTrue(app.entered.wait(5))
+        second = threading.Thread(target=lambda: results.append(server.get('/')))
+        second.start()
+        self.assertTrue(wait_for(lambda: server.server._connections.qsize() == 1))
+
+        status, body = server.get('/')
+        self.assertEqual(503, status)
+        self.assertIn('errorMessage', json.loads(body.decode('utf-8')))
+
+        app.release.set()
+        first.join(5)
+        second.join(5)
+        self.assertEqual([200, 200], sorted(status for status, _ in results))
+
+    def test_waiting_request_does_not_hold_worker(self):
+        app = BlockingApp(ConcurrencyLimit(1, queue_size=1, timeout=10))
+        server = self.serve(app, workers=2, backlog=4)
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(server.get('/slow'))) for _ in range(2)]
+        threads[0].start()
+        self.assertTrue(app.entered.wait(5))
+        threads[1].start()
+        self.assertTrue(wait_for(lambda: app.limit._waiting == 1))
+
+        # one worker runs the first request, the waiting one was replaced by a new worker
+        start = time.time()
+        self.assertEqual((200, b'ok'), server.get('/'))
+        self.assertLess(time.time() - start, 1)
+        # the queue of the limit is full
+        self.assertEqual(429, server.get('/slow')[0])
+
+        app.release.set()
+        for thread in threads:
+            thread.join(5)
+        self.assertEqual([200, 200], [status for status, _ in results])
+
+
+class TestConcurrencyLimit(unittest.TestCase):
+    def test_limit(self):
+        limit = ConcurrencyLimit(1, queue_size=1, timeout=0.2)
+        self.assertTrue(limit.acquire())
+
+        results = []
+        waiter = threading.Thread(target=lambda: results.append(limit.acquire()))
+        waiter.start()
+        self.assertTrue(wait_for(lambda: limit._waiting == 1))
+        self.assertFalse(limit.acquire())
+        waiter.join(5)
+        self.assertEqual([False], results)
+
+        waiter = threading.Thread(target=lambda: results.append(limit.acquire()))
+        waiter.start()
+        self.assertTrue(wait_for(lambda: limit._waiting == 1))
+        limit.release()
+        waiter.join(5)
+        self.assertEqual([False, True], results)
+
+
+class SlowRuntimeManager(object):
+    def __init__(self):
+        self.entered = threading.Event()
+        self.release = threading.Event()
+
+    def invoke(self, func_name, event=None, stdout=None, stderr=None):
+        self.entered.set()
+        self.release.wait(10)
+        ret = json.dumps({"statusCode": 200, "headers": {"Content-Type": "text/plain"}, "body": "ok"})
+        stdout.write(ret.encode("utf-8") + b"\n")
+        return True
+
+
+class TestLocalServiceLimit(unittest.TestCase):
+    def test_too_many_requests(self):
+        manager = SlowRuntimeManager()
+        service = LocalService([Route(method=["GET"], path="/hello", func_name="hello")], manager,
+                               concurrency=1, queue_size=0)
+        service.create()
+        server = Server(service._server, workers=2, backlog=4)
+        try:
+            results = []
+            first = threading.Thread(target=lambda: results.append(server.get('/hello')))
+            first.start()
+            self.assertTrue(manager.entered.wait(5))
+
+            self.assertEqual(429, server.get('/hello')[0])
+
+            manager.release.set()
+            first.join(5)
+            self.assertEqual([(200, b'ok')], results)
+        finally:
+            manager.release.set()
+            server.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
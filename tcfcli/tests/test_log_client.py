@@ -0,0 +1,114 @@
+import unittest
+from datetime import datetime, timedelta
+
+from tcfcli.common.scf_client.scf_log_client import ScfLogClient
+from tcfcli.libs.utils.log_cache import LogCache, CachedLog
+
+TM_FORMAT = '%Y-%m-%d %H:%M:%S'
+START = datetime(2020, 1, 1)
+
+
+class FakeResponse(object):
+    def __init__(self, data, total_count):
+        self.Data = data
+        self.TotalCount = total_count
+
+
+class FakeApi(object):
+    # GetFunctionLogs returns at most MAX_COUNT logs of a time range, like the cloud API
+    MAX_COUNT = 50
+
+    def __init__(self, logs):
+        self.logs = logs
+        self.calls = 0
+
+    def GetFunctionLogs(self, req):
+        self.calls += 1
+        if req.Offset + req.Limit > self.MAX_COUNT:
+            raise ValueError("Offset + Limit exceeds %d" % self.MAX_COUNT)
+        logs = [log for log in self.logs if req.StartTime <= log.StartTime <= req.EndTime]
+        if req.Order == "desc":
+            logs.reverse()
+        return FakeResponse(logs[req.Offset:req.Offset + req.Limit], len(logs))
+
+
+class FakeLogClient(ScfLogClient):
+    PAGE_SIZE = 10
+    MAX_COUNT = FakeApi.MAX_COUNT
+    RATE = 1000
+
+    def __init__(self, api, cache=None):
+        # no credentials, every cloud API client is the fake
+        self.api = self._client = api
+        self._region = "ap-guangzhou"
+        self._func = "func"
+        self._ns = "default"
+        self._err_only = None
+        self._log_filter = None
+        self._cache = cache
+        self._offline = False
+
+    def _create_client(self):
+        return self.api
+
+
+def make_logs(count, per_second=1):
+    return [CachedLog("req%05d" % i, (START + timedelta(seconds=i // per_second)).strftime(TM_FORMAT), 0,
+                      1.0, 1.0, 128.0, "log %d" % i) for i in range(count)]
+
+
+class TestLogClient(unittest.TestCase):
+    def setUp(self):
+        super(TestLogClient, self).setUp()
+        self.cache = LogCache(":memory:")
+
+    def tearDown(self):
+        self.cache.close()
+        super(TestLogClient, self).tearDown()
+
+    def range(self, seconds):
+        return START.strftime(TM_FORMAT), (START + timedelta(seconds=seconds)).strftime(TM_FORMAT)
+
+    def test_cached_logs_stream(self):
+        api = FakeApi(make_logs(40))
+        client = FakeLogClient(api, self.cache)
+        logs = client.iter_logs(*(self.range(40) + (100,)))
+        self.assertEqual("log 0", next(logs).Log)
+        logs.close()
+        # the output stopped early, the gap is not covered
+        self.assertEqual(1, len(self.cache.gaps(("ap-guangzhou", "default", "func"), START,
+                                                START + timedelta(seconds=40))))
+
+        logs = list(client.iter_logs(*(self.range(40) + (100,))))
+        self.assertEqual(["log %d" % i for i in range(40)], [log.Log for log in logs])
+        calls = api.calls
+        self.assertEqual(logs, list(client.iter_logs(*(self.range(40) + (100,)))))
+        self.assertEqual(calls, api.calls)
+
+    def test_stats_range_over_max_count(self):
+        api = FakeApi(make_logs(175, per_second=5))
+        client = FakeLogClient(api)
+        logs = list(client.iter_logs(*self.range(40)))
+        self.assertEqual(["log %d" % i for i in range(175)], [log.Log for log in logs])
+        self.assertEqual(30, len(list(client.iter_logs(*(self.range(40) + (30,))))))
+
+        client = FakeLogClient(api, self.cache)
+        self.assertEqual(175, len(list(client.iter_logs(*self.range(40)))))
+        self.assertEqual([], self.cache.gaps(("ap-guangzhou", "default", "func"), START,
+                                             START + timedelta(seconds=40)))
+
+    def test_prune_cuts_coverage(self):
+        key = ("ap-guangzhou", "default", "func")
+        now = datetime.now().replace(microsecond=0)
+        old = now - timedelta(days=LogCache.RETENTION_DAYS + 1)
+        self.cache.add(key, [CachedLog("req", old.strftime(TM_FORMAT), 0, 1.0, 1.0, 128.0, "old")])
+        self.cache.cover(key, old, now - timedelta(days=1))
+        self.cache._prune()
+
+        self.assertEqual([], list(self.cache.query(key, old.strftime(TM_FORMAT), now.strftime(TM_FORMAT))))
+        gaps = self.cache.gaps(key, old, now - timedelta(days=2))
+        self.assertEqual(old, gaps[0][0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,46 @@
+import io
+import gzip
+import os
+import json
+import shutil
+import tempfile
+import unittest
+
+from tcfcli.libs.utils.log_cache import CachedLog
+from tcfcli.libs.utils.log_export import LogExporter
+
+
+class TestLogExport(unittest.TestCase):
+    def setUp(self):
+        super(TestLogExport, self).setUp()
+        self.dir = tempfile.mkdtemp()
+        self.log = CachedLog("req", "2020-01-01 00:00:00", 0, 1.0, 1.0, 128.0, "hello")
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+        super(TestLogExport, self).tearDown()
+
+    def test_jsonl_rows_name_their_function(self):
+        path = os.path.join(self.dir, "logs.jsonl")
+        with LogExporter(path) as exporter:
+            exporter.sink("default", "orders")(self.log)
+            exporter.sink("prod", "payment")(self.log)
+        with io.open(path, encoding="utf-8") as f:
+            rows = [json.loads(line) for line in f]
+        self.assertEqual([("default", "orders"), ("prod", "payment")],
+                         [(row["Namespace"], row["Function"]) for row in rows])
+        self.assertEqual("hello", rows[0]["Log"])
+
+    def test_csv_header(self):
+        path = os.path.join(self.dir, "logs.csv.gz")
+        with LogExporter(path) as exporter:
+            exporter.sink("default", "orders")(self.log)
+        self.assertEqual(1, exporter.count)
+        with gzip.open(path, "rb") as f:
+            lines = f.read().decode("utf-8").splitlines()
+        self.assertTrue(lines[0].startswith("Namespace,Function,RequestId"))
+        self.assertTrue(lines[1].startswith("default,orders,req"))
+
+
+if __name__ == "__main__":
+    unittest.main()
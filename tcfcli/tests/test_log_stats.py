@@ -0,0 +1,95 @@
+import unittest
+
+from click.testing import CliRunner
+from tcfcli.libs.utils.log_cache import CachedLog
+from tcfcli.libs.utils.log_stats import parse_report, InvocationStats
+
+_MB = 1024 * 1024
+
+REPORT = "REPORT RequestId: abc Duration: 12.5 ms Billed Duration: 100 ms Memory Size: 128 MB " \
+         "Max Memory Used: 30 MB"
+
+
+def make_log(text, ret_code=0, duration=1.0, bill_duration=100.0, mem_usage=None):
+    return CachedLog("abc", "2020-01-01 00:00:00", ret_code, duration, bill_duration, mem_usage, text)
+
+
+class TestParseReport(unittest.TestCase):
+    def test_report_line(self):
+        report = parse_report(make_log("START RequestId: abc\nhello\n" + REPORT + "\n"))
+        self.assertEqual({"duration": 12.5, "billed_duration": 100.0, "memory_size": 128.0,
+                          "max_memory_used": 30.0, "cold_start": False}, report)
+
+    def test_init_duration(self):
+        report = parse_report(make_log(REPORT + " Init Duration: 210.3 ms"))
+        self.assertEqual(12.5, report["duration"])
+        self.assertTrue(report["cold_start"])
+
+    def test_tab_separated(self):
+        # the nodejs runtimes separate the fields with tabs
+        report = parse_report(make_log("REPORT RequestId: abc\tDuration: 1.08 ms\tBilled Duration: 100 ms\t"
+                                       "Memory Size: 256 MB\tMax Memory Used: 42 MB\t"))
+        self.assertEqual((1.08, 100.0, 256.0, 42.0), (report["duration"], report["billed_duration"],
+                                                      report["memory_size"], report["max_memory_used"]))
+
+    def test_missing_memory_fields(self):
+        report = parse_report(make_log("REPORT RequestId: abc Duration: 3 ms Billed Duration: 100 ms",
+                                       mem_usage=64 * _MB))
+        self.assertIsNone(report["memory_size"])
+        # the MemUsage of the log record is in bytes
+        self.assertEqual(64.0, report["max_memory_used"])
+
+    def test_no_report_line(self):
+        report = parse_report(make_log("hello", duration=7.0, bill_duration=100.0))
+        self.assertEqual(7.0, report["duration"])
+        self.assertEqual(100.0, report["billed_duration"])
+        self.assertIsNone(report["memory_size"])
+        self.assertIsNone(report["max_memory_used"])
+        self.assertFalse(report["cold_start"])
+
+
+class TestInvocationStats(unittest.TestCase):
+    def show(self, stats):
+        with CliRunner().isolation() as output:
+            stats.show()
+            return output.getvalue().decode("utf-8")
+
+    def test_summary(self):
+        stats = InvocationStats("hello")
+        stats.add(make_log(REPORT + " Init Duration: 200 ms"))
+        stats.add(make_log(REPORT.replace("30 MB", "32 MB")))
+        stats.add(make_log(REPORT, ret_code=1))
+        stats.add(make_log(REPORT))
+
+        self.assertEqual(4, stats.invocations)
+        self.assertEqual(1, stats.errors)
+        self.assertEqual(1, stats.cold_starts)
+        # 4 invocations of 100 ms billed at 128 MB
+        self.assertAlmostEqual(4 * 0.1 * 0.125, stats.gb_seconds)
+
+        output = self.show(stats)
+        self.assertIn("Invocations:       4", output)
+        self.assertIn("Errors:            1 (25.00%)", output)
+        self.assertIn("Cold starts:       1", output)
+        self.assertIn("max 32.00 MB  of 128 MB, headroom 75.0%", output)
+        self.assertIn("Billed GB-seconds: 0.0500", output)
+
+    def test_billed_duration_fallback(self):
+        stats = InvocationStats("hello")
+        stats.add(make_log("REPORT RequestId: abc Duration: 500 ms Memory Size: 1024 MB", bill_duration=None))
+        self.assertAlmostEqual(0.5, stats.gb_seconds)
+
+    def test_no_memory_size(self):
+        stats = InvocationStats("hello")
+        stats.add(make_log("hello", mem_usage=10 * _MB))
+        self.assertEqual(0.0, stats.gb_seconds)
+        output = self.show(stats)
+        self.assertNotIn("headroom", output)
+        self.assertIn("Billed GB-seconds: -", output)
+
+    def test_no_invocation(self):
+        self.assertIn("There is no invocation", self.show(InvocationStats("hello")))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,128 @@
+import io
+import os
+import json
+import sys
+import shutil
+import tempfile
+import unittest
+import subprocess
+
+from click.testing import CliRunner
+from tcfcli.cmds.native.common.invoke_context import InvokeContext
+from tcfcli.cmds.native.invoke import cli as invoke_cli
+
+TEMPLATE = u'''Resources:
+  default:
+    Type: TencentCloud::Serverless::Namespace
+    hello:
+      Type: TencentCloud::Serverless::Function
+      Properties:
+        CodeUri: ./
+        Type: Event
+        Handler: index.%s
+        MemorySize: 128
+        Runtime: %s
+        Timeout: 10
+'''
+
+HANDLER = u'''
+def main_handler(event, context):
+    print("a log line")
+    return {"ok": event["value"]}
+
+
+def fail_handler(event, context):
+    raise ValueError("broken")
+'''
+
+
+class HostInvokeContext(InvokeContext):
+    @property
+    def cmd(self):
+        # the bootstrap of the runtime checks the version of the interpreter running it
+        return sys.executable
+
+
+class TestNativeResult(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        with io.open(os.path.join(self.dir, 'index.py'), 'w', encoding='utf-8') as f:
+            f.write(HANDLER)
+
+    def tearDown(self):
+        shutil.rmtree(self.dir, ignore_errors=True)
+
+    def write_template(self, handler):
+        runtime = 'Python3.6' if sys.version_info[0] == 3 else 'Python2.7'
+        template = os.path.join(self.dir, 'template.yaml')
+        with io.open(template, 'w', encoding='utf-8') as f:
+            f.write(TEMPLATE % (handler, runtime))
+        return template
+
+    def invoke(self, handler, event):
+        template = self.write_template(handler)
+        with HostInvokeContext(template_file=template, event=event, is_quiet=True) as context:
+            context.invoke()
+            result_dir = context._result_channel.host_dir
+            self.assertEqual([], os.listdir(result_dir))
+        self.assertFalse(os.path.exists(result_dir))
+        return context.get_result()
+
+    def test_result(self):
+        result = self.invoke('main_handler', '{"value": 3}')
+        self.assertEqual('{"ok": 3}', result['result'])
+        self.assertIsNone(result['error'])
+        self.assertEqual('128', str(result['memorySize']))
+        for key in ('requestId', 'duration', 'billedDuration', 'maxMemoryUsed'):
+            self.assertIn(key, result)
+        self.assertGreaterEqual(result['billedDuration'], result['duration'])
+
+    def test_error(self):
+        result = self.invoke('fail_handler', '{}')
+        self.assertIsNone(result['result'])
+        self.assertEqual('user code exception caught', result['error']['errorMessage'])
+        self.assertIn('ValueError: broken', result['error']['stackTrace'])
+
+    def test_runtime_leaves_result_to_host(self):
+        template = self.write_template('main_handler')
+        with HostInvokeContext(template_file=template, event='{"value": 3}') as context:
+            env = context.env
+            env.update(context._result_channel.env('result.json'))
+            out = subprocess.check_output([context.cmd] + context.argv, env=env).decode('utf-8')
+            self.assertIsNotNone(context._result_channel.read('result.json'))
+        # only the logs of the function are printed, the host prints the rest from the record
+        self.assertIn('a log line', out)
+        self.assertNotIn('REPORT RequestId', out)
+        self.assertNotIn('"ok"', out)
+
+    def cli_invoke(self, handler, event):
+        template = self.write_template(handler)
+        event_file = os.path.join(self.dir, 'event.json')
+        with io.open(event_file, 'w', encoding='utf-8') as f:
+            f.write(event)
+
+        invoke_context = invoke_cli.InvokeContext
+        invoke_cli.InvokeContext = HostInvokeContext
+        try:
+            result = CliRunner().invoke(invoke_cli.invoke, ['-t', template, '-e', event_file])
+        finally:
+            invoke_cli.InvokeContext = invoke_context
+        self.assertEqual(0, result.exit_code)
+        # the function process writes to the real stdout, the runner only sees what the cli printed
+        return result.output.strip().split('\n')
+
+    def test_cli_prints_record(self):
+        output = self.cli_invoke('main_handler', u'{"value": 5}')
+        self.assertTrue([line for line in output if line.startswith('END RequestId:')])
+        self.assertTrue([line for line in output if line.startswith('REPORT RequestId:')])
+        self.assertNotIn('a log line', output)
+        self.assertEqual('{"ok": 5}', output[-1])
+
+    def test_cli_prints_error(self):
+        output = self.cli_invoke('fail_handler', u'{}')
+        self.assertFalse([line for line in output if line.startswith('END RequestId:')])
+        self.assertTrue([line for line in output if line.startswith('REPORT RequestId:')])
+        self.assertEqual('user code exception caught', json.loads(output[-1])['errorMessage'])
+
+if __name__ == '__main__':
+    unittest.main()
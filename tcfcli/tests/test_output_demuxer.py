@@ -0,0 +1,51 @@
+import io
+import unittest
+
+from tcfcli.cmds.local.libs.apigw.output_demuxer import OutputDemuxer
+
+
+class TestOutputDemuxer(unittest.TestCase):
+    def setUp(self):
+        super(TestOutputDemuxer, self).setUp()
+        self.log = io.BytesIO()
+
+    def demux(self, chunks, max_line=OutputDemuxer.MAX_LINE):
+        demuxer = OutputDemuxer(self.log, max_line)
+        for chunk in chunks:
+            demuxer.write(chunk)
+        return demuxer.result()
+
+    def test_last_line_is_result(self):
+        self.assertEqual(u'{"ok": 1}', self.demux([b'start\nworking\n{"ok": 1}\n']))
+        self.assertEqual(b'start\nworking\n', self.log.getvalue())
+
+    def test_split_frames(self):
+        self.assertEqual(u'{"ok": 1}', self.demux([b'sta', b'rt\n{"o', b'k": ', b'1}']))
+        self.assertEqual(b'start\n', self.log.getvalue())
+
+    def test_blank_lines(self):
+        self.assertEqual(u'result', self.demux([b'log\n\n\nresult\n\n']))
+        self.assertEqual(b'log\n\n\n', self.log.getvalue())
+
+    def test_no_output(self):
+        self.assertEqual(u'', self.demux([]))
+        self.assertEqual(u'', self.demux([b'\n\n']))
+
+    def test_oversized_last_line(self):
+        self.assertEqual(u'', self.demux([b'{"ok":1}\nxxxxxx', b'xxxxxx', b'TAIL'], max_line=8))
+        self.assertEqual(b'{"ok":1}\nxxxxxxxxxxxxTAIL\n', self.log.getvalue())
+
+    def test_oversized_line_then_result(self):
+        self.assertEqual(u'{"ok":1}', self.demux([b'xxxxxxxxxxxx', b'TAIL\n{"ok":1}\n'], max_line=8))
+        self.assertEqual(b'xxxxxxxxxxxxTAIL\n', self.log.getvalue())
+
+    def test_reused_after_result(self):
+        demuxer = OutputDemuxer(self.log, 8)
+        demuxer.write(b'xxxxxxxxxxxx')
+        self.assertEqual(u'', demuxer.result())
+        demuxer.write(b'log\nnext\n')
+        self.assertEqual(u'next', demuxer.result())
+
+
+if __name__ == "__main__":
+    unittest.main()
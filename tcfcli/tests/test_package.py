@@ -0,0 +1,57 @@
+import unittest
+import os
+import shutil
+
+from test_common import *
+from click.testing import CliRunner
+from tcfcli.cmds.configure import cli as configure_cli
+from tcfcli.cmds.init import cli as init_cli
+from tcfcli.cmds.package import cli as package_cli
+from tcfcli.cmds.deploy import cli as deploy_cli
+
+
+class TestPackage(unittest.TestCase):
+    def setUp(self):
+        super(TestPackage, self).setUp()
+        runner = CliRunner()
+        result = runner.invoke(configure_cli.set, ['--appid', AppID])
+        self.assertEqual(0, result.exit_code)
+        result = runner.invoke(configure_cli.set, ['--region', Region])
+        self.assertEqual(0, result.exit_code)
+        result = runner.invoke(configure_cli.set, ['--secret-id', SecretId])
+        self.assertEqual(0, result.exit_code)
+        result = runner.invoke(configure_cli.set, ['--secret-key', SecretKey])
+        self.assertEqual(0, result.exit_code)
+
+    def tearDown(self):
+        super(TestPackage, self).tearDown()
+
+    def test_package_deploy_from_manifest(self):
+        name = "hello_world_package"
+        path = "./" + name
+        output_dir = path + "/.tcf_package"
+        if os.path.exists(path):
+            shutil.rmtree(path)
+
+        runner = CliRunner()
+        result = runner.invoke(init_cli.init, ['-N', '-r', 'python3.6', '-n', name, '-ns', 'default'])
+        self.assertIn('[*] Project initialization is complete\n', result.output)
+        self.assertEqual(0, result.exit_code)
+
+        result = runner.invoke(package_cli.package, ["-t", "./%s/template.yaml" % name, "--without-cos",
+                                                     "-o", output_dir])
+        self.assertIn('Generate manifest', result.output)
+        self.assertEqual(0, result.exit_code)
+        self.assertTrue(os.path.exists(os.path.join(output_dir, "manifest.json")))
+
+        result = runner.invoke(deploy_cli.deploy, ["--from-manifest", os.path.join(output_dir, "manifest.json"),
+                                                   "-f"])
+        self.assertIn('Deploy function \'%s\' success' % name, result.output)
+        self.assertEqual(0, result.exit_code)
+
+        if os.path.exists(path):
+            shutil.rmtree(path)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)